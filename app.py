@@ -3,13 +3,20 @@ Career Guidance Flask API + Web Showcase
 Main entry point
 """
 
-from flask import Flask
+from flask import Flask, abort, request
 from flask_cors import CORS
 import os
 from routes.guidance import guidance_bp
 from routes.web import web_bp
+from routes.admin import admin_bp
+from routes.metrics import metrics_bp
+from services import guidance_engine
+
+# Largest request body accepted, in bytes (0 = no limit)
+MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH or None
 CORS(app)  # Allow requests from mobile/web app
 
 # API routes — keep untouched for future app integration
@@ -18,12 +25,58 @@ app.register_blueprint(guidance_bp, url_prefix="/api")
 # Web showcase
 app.register_blueprint(web_bp)
 
+# Operational endpoints (require ADMIN_TOKEN)
+app.register_blueprint(admin_bp, url_prefix="/admin")
+
+# Prometheus scrape endpoint (GET /metrics)
+app.register_blueprint(metrics_bp)
+
+
+@app.before_request
+def reject_large_bodies():
+    """
+    Answer 413 up front for a declared Content-Length over the limit. The
+    views catch every exception, so the error Flask raises on reading such
+    a body would otherwise come back as a 500. Chunked bodies are cut off
+    by Flask as they are read.
+    """
+    limit = app.config["MAX_CONTENT_LENGTH"]
+    if limit is not None and (request.content_length or 0) > limit:
+        abort(413)
+
+
+@app.errorhandler(413)
+def body_too_large(e):
+    return {"error": f"Request body is larger than {app.config['MAX_CONTENT_LENGTH']} bytes"}, 413
+
 
 @app.route("/health", methods=["GET"])
 def health():
-    return {"status": "ok", "service": "Career Guidance API"}, 200
+    """Liveness: the process is up and serving, whether or not the model is loaded"""
+    status = guidance_engine.engine_status()
+    return {
+        "status": "ok",
+        "service": "Career Guidance API",
+        "ready": status["ready"],
+        "model_version": status["model_version"],
+    }, 200
+
+
+@app.route("/health/ready", methods=["GET"])
+def ready():
+    """
+    Readiness: 200 only once the model is loaded and warmed up.
+    A cold worker starts warming in the background and answers 503 until done.
+    """
+    status = guidance_engine.engine_status()
+    if status["ready"]:
+        return {"status": "ready", **status}, 200
+    guidance_engine.warmup_async()
+    return {"status": "warming_up", **status}, 503
 
 
 if __name__ == "__main__":
+    guidance_engine.warmup()
+    guidance_engine.watch_artifacts()
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Career Guidance ASGI entry point (async serving mode)
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+- Every route is the Flask app from app.py, run on a bounded thread pool
+  (ASYNC_APP_THREADS), so responses are identical to the WSGI server
+- POST /api/generate-guidance with a resume_url: the download is awaited
+  on the event loop and the PDF extracted on its own pool
+  (ASYNC_PDF_THREADS). The request then reaches the Flask view with the
+  text filled in, so a slow storage server holds a socket, not a thread
+- Request bodies are streamed to the app and response bodies (e.g. the
+  batch NDJSON stream) streamed back as they are produced. A body read
+  here is held to the app's MAX_CONTENT_LENGTH like any other (413)
+- WebSocket connections are closed at once (the app has no WebSocket routes)
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app as flask_app
+from routes.guidance import extract_resume_text
+from services import guidance_engine
+from services.guidance_engine import DEFAULT_TOP_K, validate_top_k
+from services.metrics import stage
+from services.resume_downloader import DownloadError, async_downloader, download_resume_async
+
+ASYNC_APP_THREADS = int(os.environ.get("ASYNC_APP_THREADS", 4 * (os.cpu_count() or 1)))
+ASYNC_PDF_THREADS = int(os.environ.get("ASYNC_PDF_THREADS", 4))
+
+# Chunks a streamed response may run ahead of the client
+_RESPONSE_BUFFER = 16
+
+_pools = {}
+
+
+def _pool(name: str, size: int) -> ThreadPoolExecutor:
+    """Executors are created on first use, inside each worker process"""
+    if name not in _pools:
+        _pools[name] = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"asgi-{name}")
+    return _pools[name]
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif scope["type"] == "websocket":
+        await _refuse_websocket(receive, send)
+    elif scope["type"] != "http":
+        # The ASGI spec's answer to a protocol the app doesn't know
+        raise NotImplementedError(f"Unsupported ASGI scope type: {scope['type']}")
+    elif scope["method"] == "POST" and scope["path"] == "/api/generate-guidance":
+        await _generate_guidance(scope, receive, send)
+    else:
+        await _call_flask(scope, receive, send)
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(_pool("app", ASYNC_APP_THREADS), guidance_engine.warmup)
+            except guidance_engine.ModelUnavailableError as e:
+                # Still serve; /health/ready reports 503 until a model is available
+                print(f"[WARN] Model warmup failed: {e}", file=sys.stderr)
+            guidance_engine.watch_artifacts()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await async_downloader.aclose()
+            for executor in _pools.values():
+                executor.shutdown(wait=False)
+            _pools.clear()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _refuse_websocket(receive, send) -> None:
+    """Close before accepting: the server answers the handshake with 403"""
+    message = await receive()
+    if message["type"] == "websocket.connect":
+        await send({"type": "websocket.close", "code": 1000})
+
+
+async def _generate_guidance(scope, receive, send) -> None:
+    """Await a resume_url download here; everything else is the Flask view"""
+    limit = flask_app.config["MAX_CONTENT_LENGTH"]
+    body = await _read_body(receive, limit)
+    if body is None:
+        await _send_json(send, 413, {"error": f"Request body is larger than {limit} bytes"})
+        return
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    qa = data.get("qa_responses") if isinstance(data, dict) else None
+    if not (qa and isinstance(qa, dict) and data.get("resume_url") and not data.get("resume_text")
+            and _valid_top_k(data)):
+        # Nothing to download (or a request the view rejects as is)
+        await _call_flask(scope, receive, send, body)
+        return
+
+    # Same 422s the WSGI view returns for a failed download / unreadable PDF
+    try:
+        with stage("download_resume"):
+            pdf_bytes = await download_resume_async(data["resume_url"])
+    except DownloadError as e:
+        await _send_json(send, 422, {"error": f"Failed to fetch/parse resume PDF: {e}"})
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        resume_text = await loop.run_in_executor(_pool("pdf", ASYNC_PDF_THREADS), extract_resume_text, pdf_bytes)
+    except ValueError as e:
+        await _send_json(send, 422, {"error": str(e)})
+        return
+
+    # An empty text falls through to the view's "Provide either ..." 400
+    data.pop("resume_url")
+    data["resume_text"] = resume_text
+    await _call_flask(scope, receive, send, json.dumps(data).encode("utf-8"))
+
+
+def _valid_top_k(data: dict) -> bool:
+    try:
+        validate_top_k(data.get("top_k", DEFAULT_TOP_K))
+        return True
+    except ValueError:
+        return False
+
+
+# ─────────────────────────────────────────────
+# WSGI bridge
+# ─────────────────────────────────────────────
+
+async def _call_flask(scope, receive, send, body: bytes = None) -> None:
+    """
+    Run the Flask app for this request on the app pool. body, when given,
+    has already been read from receive (and replaces any Content-Length
+    the client sent); otherwise the app reads the request body from the
+    event loop as it needs it.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue(maxsize=_RESPONSE_BUFFER)
+    environ = _environ(scope, _ReceiveStream(receive, loop, body))
+    if body is not None:
+        environ["CONTENT_LENGTH"] = str(len(body))
+
+    def put(item) -> None:
+        asyncio.run_coroutine_threadsafe(chunks.put(item), loop).result()
+
+    def run() -> None:
+        status_headers, headers_sent = [], []
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and headers_sent:
+                raise exc_info[1].with_traceback(exc_info[2])
+            status_headers[:] = [status, headers]
+
+        def send_start() -> None:
+            # Once, before the first body chunk: WSGI apps may call start_response lazily
+            if not headers_sent:
+                status, headers = status_headers
+                put(("start", int(status.split(" ", 1)[0]), headers))
+                headers_sent.append(True)
+
+        try:
+            result = flask_app(environ, start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        send_start()
+                        put(("body", chunk))
+                send_start()
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+        except Exception as e:
+            put(("error", e))
+        put(None)
+
+    worker = loop.run_in_executor(_pool("app", ASYNC_APP_THREADS), run)
+    item, started = None, False
+    try:
+        while (item := await chunks.get()) is not None:
+            kind = item[0]
+            if kind == "start":
+                started = True
+                await send({
+                    "type": "http.response.start",
+                    "status": item[1],
+                    "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in item[2]],
+                })
+            elif kind == "body":
+                await send({"type": "http.response.body", "body": item[1], "more_body": True})
+            elif not started:
+                await _send_json(send, 500, {"error": "Internal server error", "detail": str(item[1])})
+                return
+            else:
+                # Headers are out: raising makes the server drop the connection, so the
+                # client sees a truncated response rather than a complete 200
+                raise RuntimeError("Response failed after it started streaming") from item[1]
+        if started:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        # Client gone mid-stream: let the app thread run to the end instead of blocking on put()
+        while item is not None:
+            item = await chunks.get()
+        await worker
+
+
+class _ReceiveStream(io.RawIOBase):
+    """wsgi.input that pulls ASGI body messages from the event loop on demand"""
+
+    def __init__(self, receive, loop, body: bytes = None):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = bytearray(body or b"")
+        self._more = body is None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message["type"] == "http.disconnect":
+                self._more = False
+                break
+            self._buffer += message.get("body", b"")
+            self._more = message.get("more_body", False)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
+def _environ(scope, stream: _ReceiveStream) -> dict:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BufferedReader(stream),
+        # The stream ends with the body, so chunked uploads (no Content-Length) are read too
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[key] = value
+            continue
+        key = "HTTP_" + key
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _read_body(receive, limit: int = None) -> bytes:
+    """The whole request body, or None once it grows past limit bytes"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        if limit is not None and len(body) > limit:
+            return None
+        if not message.get("more_body", False):
+            break
+    return bytes(body)
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
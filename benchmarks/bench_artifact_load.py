@@ -0,0 +1,95 @@
+"""
+Model Artifact Benchmark
+Size on disk, load time and per-process memory of the pickled sklearn
+pipeline vs the memory-mapped scorer artifact. Each format is loaded in
+a fresh interpreter, as a newly started worker would.
+
+RSS is split into private (anonymous) memory, which every worker pays
+for itself, and file-backed pages, which workers share via the page cache.
+
+Needs a trained model (python ml/train.py). Run from the project root:
+    python benchmarks/bench_artifact_load.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = ["python machine learning pandas numpy statistics sql data science"]
+
+
+def memory_mb() -> dict:
+    """Private / file-backed resident memory of this process, in MB"""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+def measure(kind: str, path: str) -> dict:
+    """Runs in the child interpreter: load one artifact and report"""
+    import numpy, scipy.sparse, sklearn.pipeline  # noqa: F401  (import cost is not load cost)
+    before = memory_mb()
+    start = time.perf_counter()
+    if kind == "pickle":
+        import pickle
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    else:
+        from services.native_scorer import NativeScorer
+        model = NativeScorer.load(path, mmap=kind == "mmap")
+    load_ms = (time.perf_counter() - start) * 1000
+    model.predict_proba(PROBE)
+    after = memory_mb()
+    return {
+        "load_ms": load_ms,
+        "private_mb": after["RssAnon"] - before["RssAnon"],
+        "shared_mb": after["RssFile"] - before["RssFile"],
+    }
+
+
+def size_mb(path: str) -> float:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 2**20
+    return os.path.getsize(path) / 2**20
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        sys.exit(0)
+
+    pickle_path = os.path.join(BASE_DIR, "ml/career_classifier.pkl")
+    artifact = os.path.join(BASE_DIR, "ml/career_scorer")
+    if not os.path.exists(os.path.join(artifact, "config.json")):
+        import pickle
+        from services.native_scorer import export_pipeline
+        artifact = os.path.join(tempfile.mkdtemp(), "career_scorer")
+        with open(pickle_path, "rb") as f:
+            export_pipeline(pickle.load(f), artifact)
+
+    print(f"{'format':>14s} | {'size MB':>7s} | {'load ms':>7s} | {'private MB':>10s} | {'shared MB':>9s}")
+    print("-" * 61)
+    for label, kind, path in (
+        ("pickle", "pickle", pickle_path),
+        ("npy, no mmap", "npy", artifact),
+        ("npy, mmap", "mmap", artifact),
+    ):
+        runs = []
+        for _ in range(3):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", kind, path],
+                capture_output=True, text=True, check=True, cwd=BASE_DIR,
+            )
+            runs.append(json.loads(out.stdout))
+        best = min(runs, key=lambda r: r["load_ms"])
+        print(f"{label:>14s} | {size_mb(path):>7.2f} | {best['load_ms']:>7.1f} | "
+              f"{best['private_mb']:>10.1f} | {best['shared_mb']:>9.1f}")
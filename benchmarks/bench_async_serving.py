@@ -0,0 +1,125 @@
+"""
+Async Serving Load Test
+Sync gunicorn (app:app) vs uvicorn (asgi:app), one worker process each,
+under many concurrent /api/generate-guidance requests whose resume_url
+points at a storage server that takes DELAY seconds to answer.
+
+Sync gunicorn holds a thread per waiting download, so at most
+GUNICORN_THREADS downloads overlap. Admission control is switched off
+here so requests queue instead of being shed. The ASGI worker awaits the
+downloads and overlaps all of them.
+
+Needs gunicorn, uvicorn, httpx and a trained model. Run from the project root:
+    python benchmarks/bench_async_serving.py [concurrency] [delay]
+"""
+
+import sys
+import os
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from test_job_queue import make_pdf
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+DELAY = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+PDF_BYTES = make_pdf(["Skills: Python, Pandas, SQL, Machine Learning", "Projects", "Recommendation system"])
+
+
+class SlowStorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PDF_BYTES)))
+        self.end_headers()
+        self.wfile.write(PDF_BYTES)
+
+
+class StorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the default backlog of 5 would stall concurrent connects
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url + "/health/ready", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become ready")
+
+
+def load(url: str, storage: str, n: int = CONCURRENCY) -> dict:
+    def one(i: int) -> tuple:
+        body = {"resume_url": f"{storage}/resume.pdf?{i}", "qa_responses": {"interests": "data science"}}
+        start = time.perf_counter()
+        response = requests.post(url + "/api/generate-guidance", json=body, timeout=300)
+        return response.status_code, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        results = list(pool.map(one, range(n)))
+    wall = time.perf_counter() - start
+    latencies = sorted(seconds for _, seconds in results)
+    return {
+        "ok": sum(code == 200 for code, _ in results),
+        "wall": wall,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "rps": len(results) / wall,
+    }
+
+
+if __name__ == "__main__":
+    storage_server = StorageServer(("127.0.0.1", 0), SlowStorageHandler)
+    threading.Thread(target=storage_server.serve_forever, daemon=True).start()
+    storage = f"http://127.0.0.1:{storage_server.server_address[1]}"
+
+    env = dict(os.environ, WEB_CONCURRENCY="1", GUNICORN_THREADS=os.environ.get("GUNICORN_THREADS", "4"),
+               ADMISSION_MAX_REQUESTS="0", PREDICTION_CACHE_SIZE="0")
+    servers = {
+        "gunicorn (sync)": lambda port: ["gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}", "app:app"],
+        "uvicorn (asgi)": lambda port: [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port),
+                                        "--workers", "1", "--log-level", "warning"],
+    }
+
+    print(f"{CONCURRENCY} concurrent requests, storage delay {DELAY:g}s, 1 worker process each\n")
+    print(f"{'server':>16s} | {'ok':>4s} | {'wall s':>6s} | {'p50 s':>6s} | {'p95 s':>6s} | {'req/s':>6s}")
+    print("-" * 62)
+    for label, command in servers.items():
+        port = free_port()
+        process = subprocess.Popen(command(port), cwd=BASE_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            wait_until_up(url)
+            load(url, storage, n=8)  # start the PDF page pool before timing
+            result = load(url, storage)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        print(f"{label:>16s} | {result['ok']:>4d} | {result['wall']:>6.2f} | {result['p50']:>6.2f} | "
+              f"{result['p95']:>6.2f} | {result['rps']:>6.1f}")
+    storage_server.shutdown()
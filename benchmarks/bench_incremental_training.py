@@ -0,0 +1,108 @@
+"""
+Incremental Training Benchmark
+Cost of folding a day of new labeled profiles into the model with
+ml/train_incremental.py, against retraining from scratch, and how far
+the incrementally updated model drifts from the retrained ones.
+
+The ml/train.py training split is divided into a bootstrap set and DAYS
+feeds of DAILY rows each. Every simulated day:
+- incremental: read that day's JSONL feed (with per-batch checkpoints)
+  and export the scorer artifact
+- hashed retrain: the same hashing + SGD model refitted on every row seen
+- deployed retrain: the pipeline in ml/career_classifier.pkl refitted on
+  every row seen (one fit; ml/train.py adds CV and two more candidates)
+
+Accuracy is measured on the ml/train.py test split, and on the same
+profiles reduced to their skills field as a harder, sparser input.
+Agreement is the share of test profiles whose top career matches; TV
+is the mean total-variation distance between the incremental and hashed
+retrain probabilities (0 = identical, 1 = disjoint).
+
+Needs a trained model (python ml/train.py). Run from the project root:
+    python benchmarks/bench_incremental_training.py [days] [daily rows]
+"""
+
+import sys
+import os
+import json
+import pickle
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from ml import train_incremental as inc
+from services.native_scorer import export_pipeline
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAYS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+DAILY = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+
+def accuracy(model, texts, labels) -> float:
+    return float((model.predict(texts) == labels).mean())
+
+
+if __name__ == "__main__":
+    with open(os.path.join(BASE_DIR, "ml/career_classifier.pkl"), "rb") as f:
+        deployed = pickle.load(f)
+
+    df = pd.read_csv(inc.DATASET_PATH)
+    X_train, X_test, y_train, y_test = inc.training_split()
+    test_texts, test_labels = list(X_test), np.asarray(y_test)
+    skills_texts = list(df.loc[X_test.index, "skills"].str.replace(",", " "))
+
+    n_feed = DAYS * DAILY
+    base_X, base_y = X_train.iloc[:-n_feed], y_train.iloc[:-n_feed]
+    feed_X, feed_y = X_train.iloc[-n_feed:], y_train.iloc[-n_feed:]
+
+    tmp = tempfile.mkdtemp()
+    checkpoint = os.path.join(tmp, "checkpoint.pkl")
+    state = inc.new_state(inc.career_labels())
+    started = time.perf_counter()
+    inc.fit_batches(state, base_X, base_y)
+    inc.save_checkpoint(state, checkpoint)
+    print(f"Bootstrap: {len(base_X)} rows in {time.perf_counter() - started:.2f}s | "
+          f"deployed model: {type(deployed.named_steps['clf']).__name__}")
+    print(f"{DAYS} days x {DAILY} new rows | test split: {len(test_texts)} profiles\n")
+
+    print(f"{'day':>3s} | {'rows':>5s} | {'update s':>8s} | {'hashed retrain s':>16s} | "
+          f"{'deployed retrain s':>18s} | {'acc inc / hash / depl':>21s} | "
+          f"{'skills-only acc':>17s} | {'agree hash':>10s} | {'agree depl':>10s} | {'TV hash':>7s}")
+    print("-" * 150)
+    for day in range(DAYS):
+        rows = slice(day * DAILY, (day + 1) * DAILY)
+        feed = os.path.join(tmp, f"day{day + 1}.jsonl")
+        with open(feed, "w", encoding="utf-8") as f:
+            for text, label in zip(feed_X.iloc[rows], feed_y.iloc[rows]):
+                f.write(json.dumps({"combined_text": text, "career_label": label}) + "\n")
+
+        started = time.perf_counter()
+        inc.update_from_feed(state, feed, checkpoint)
+        export_pipeline(state["model"], os.path.join(tmp, "career_scorer"))
+        update_s = time.perf_counter() - started
+
+        seen_X = pd.concat([base_X, feed_X.iloc[:rows.stop]])
+        seen_y = pd.concat([base_y, feed_y.iloc[:rows.stop]])
+        started = time.perf_counter()
+        hashed = inc.new_state(state["classes"])
+        inc.fit_batches(hashed, seen_X, seen_y)
+        hashed_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        retrained = clone(deployed).fit(seen_X, seen_y)
+        deployed_s = time.perf_counter() - started
+
+        models = (state["model"], hashed["model"], retrained)
+        acc = [accuracy(model, test_texts, test_labels) for model in models]
+        skills_acc = [accuracy(model, skills_texts, test_labels) for model in models]
+        predicted = [model.predict(test_texts) for model in models]
+        agree_hashed = float((predicted[0] == predicted[1]).mean())
+        agree_deployed = float((predicted[0] == predicted[2]).mean())
+        tv = np.abs(models[0].predict_proba(test_texts) - models[1].predict_proba(test_texts)).sum(axis=1).mean() / 2
+        print(f"{day + 1:>3d} | {len(seen_X):>5d} | {update_s:>8.2f} | {hashed_s:>16.2f} | {deployed_s:>18.2f} | "
+              f"{' / '.join(f'{a:.3f}' for a in acc):>21s} | "
+              f"{' / '.join(f'{a:.2f}' for a in skills_acc):>17s} | {agree_hashed:>10.3f} | {agree_deployed:>10.3f} | {tv:>7.4f}")
@@ -0,0 +1,53 @@
+"""
+Native Scorer Benchmark
+Single-request and batch latency of the sklearn pipeline vs the
+exported NumPy scorer, on real profile texts.
+
+Needs a trained model (python ml/train.py). Run from the project root:
+    python benchmarks/bench_native_scorer.py
+"""
+
+import sys
+import os
+import pickle
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from services.native_scorer import NativeScorer, export_pipeline
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def per_call_ms(fn, batches: list) -> float:
+    start = time.perf_counter()
+    for batch in batches:
+        fn(batch)
+    return (time.perf_counter() - start) / len(batches) * 1000
+
+
+if __name__ == "__main__":
+    with open(os.path.join(BASE_DIR, "ml/career_classifier.pkl"), "rb") as f:
+        pipeline = pickle.load(f)
+
+    artifact = os.path.join(BASE_DIR, "ml/career_scorer")
+    if not os.path.exists(os.path.join(artifact, "config.json")):
+        artifact = os.path.join(tempfile.mkdtemp(), "career_scorer")
+        export_pipeline(pipeline, artifact)
+    scorer = NativeScorer.load(artifact)
+
+    texts = list(pd.read_csv(os.path.join(BASE_DIR, "data/student_profiles.csv"))
+                 .sample(1000, random_state=7)["combined_text"])
+    drift = np.abs(pipeline.predict_proba(texts) - scorer.predict_proba(texts)).max()
+    print(f"Model: {type(pipeline.named_steps['clf']).__name__} | max |Δproba| = {drift:.2e}\n")
+
+    print(f"{'batch':>6s} | {'sklearn ms':>10s} | {'native ms':>9s} | {'speedup':>7s}")
+    print("-" * 42)
+    for batch_size in (1, 10, 100, 1000):
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)][:100]
+        sk_ms = per_call_ms(pipeline.predict_proba, batches)
+        native_ms = per_call_ms(scorer.predict_proba, batches)
+        print(f"{batch_size:>6d} | {sk_ms:>10.2f} | {native_ms:>9.2f} | {sk_ms / native_ms:>6.1f}x")
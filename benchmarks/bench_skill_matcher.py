@@ -0,0 +1,75 @@
+"""
+Skill Matcher Benchmark
+Compares the old one-regex-per-skill scan against the compiled
+single-pass matcher in services.resume_parser.extract_skills,
+over synthetic resumes from 1 KB to 200 KB.
+
+Run from the project root:
+    python benchmarks/bench_skill_matcher.py
+"""
+
+import sys
+import os
+import re
+import random
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.skill_keywords import MASTER_SKILLS
+from services.resume_parser import extract_skills
+
+
+def legacy_extract_skills(text: str) -> list:
+    """The pre-compiled-matcher implementation, kept for comparison"""
+    text_lower = text.lower()
+    found = []
+    for skill in MASTER_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.append(skill)
+    return list(set(found))
+
+
+FILLER = [
+    "developed", "team", "project", "using", "built", "the", "and", "worked",
+    "university", "b.tech", "cgpa", "responsible", "for", "implemented", "with",
+    "C++,", "C#.", "c++x", "C", "(c)", "tailwind css", "React Native", "node.js",
+    "ci/cd", "GitHub Actions", "android studio", "r", "go-lang", "kali linux",
+]
+
+
+def make_resume(size_bytes: int, rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(MASTER_SKILLS) if rng.random() < 0.03 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+        if rng.random() < 0.08:
+            words.append("\n")
+    return " ".join(words)[:size_bytes]
+
+
+def time_call(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+
+    # Parity first — the compiled matcher must agree with the old scan
+    for _ in range(300):
+        sample = make_resume(rng.randint(10, 4000), rng)
+        assert sorted(extract_skills(sample)) == sorted(legacy_extract_skills(sample)), sample
+
+    print(f"{'size':>8s} | {'legacy ms':>10s} | {'compiled ms':>11s} | {'speedup':>7s}")
+    print("-" * 46)
+    for size_kb in (1, 5, 20, 50, 100, 200):
+        text = make_resume(size_kb * 1024, rng)
+        repeat = max(3, 200 // size_kb)
+        legacy_ms = time_call(legacy_extract_skills, text, repeat)
+        compiled_ms = time_call(extract_skills, text, repeat)
+        print(f"{size_kb:>6d}KB | {legacy_ms:>10.2f} | {compiled_ms:>11.2f} | {legacy_ms / compiled_ms:>6.1f}x")
@@ -0,0 +1,77 @@
+"""
+Gunicorn Config
+Picked up automatically by `gunicorn app:app` from the project root:
+- Workers and threads are sized from the CPU count
+- With preload (the default) the master imports the app and loads + warms
+  the model once before forking, so every worker shares those pages
+  copy-on-write instead of holding its own copy
+- gc.freeze() after preloading keeps the garbage collector from writing
+  to (and so un-sharing) the inherited objects
+- Each worker starts its own model file watcher after fork
+- Per-worker metrics files from the previous run are cleared at startup;
+  an exiting worker flushes its metrics, and the master folds them into
+  the retired totals and deletes its file once it has been reaped
+- Heavy requests are capped below the thread count so /health always
+  has a free thread
+
+All settings can be overridden with the environment variables below.
+"""
+
+import gc
+import multiprocessing
+import os
+
+CORES = multiprocessing.cpu_count()
+PRELOAD = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+preload_app = PRELOAD
+
+# Shared model pages make a worker cheap, so preloading runs twice as many
+workers = int(os.environ.get("WEB_CONCURRENCY", (2 if PRELOAD else 1) * CORES + 1))
+# Threads overlap resume downloads and PDF extraction inside a worker
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+# Admit at most threads - 1 heavy requests per worker, so one thread is
+# always left to answer /health during a spike (see services/admission.py)
+os.environ.setdefault("ADMISSION_MAX_REQUESTS", str(max(1, threads - 1)))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+
+
+def on_starting(server):
+    from services import guidance_engine, metrics
+    if PRELOAD:
+        try:
+            guidance_engine.preload()
+            server.log.info("Model preloaded in master: %s", guidance_engine.engine_status()["model_version"])
+        except guidance_engine.ModelUnavailableError as e:
+            # Workers still start; /health/ready reports 503 until a model is available
+            server.log.warning("Model preload failed: %s", e)
+    # Drop the warmup timings (every worker would inherit them) and the
+    # metrics files left behind by the previous server run
+    metrics.reset()
+    if PRELOAD:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    from services import guidance_engine
+    guidance_engine.after_fork()
+    guidance_engine.watch_artifacts()
+
+
+def worker_exit(server, worker):
+    from services import metrics
+    if metrics.METRICS_ENABLED:
+        try:
+            metrics.flush()
+        except OSError as e:
+            server.log.warning("Final metrics flush failed: %s", e)
+
+
+def child_exit(server, worker):
+    from services import metrics
+    try:
+        metrics.mark_process_dead(worker.pid)
+    except OSError as e:
+        # Runs in the master's reap loop; never let it take the master down
+        server.log.warning("Retiring metrics of worker %s failed: %s", worker.pid, e)
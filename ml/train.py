@@ -3,6 +3,14 @@ Career Guidance ML Model - Training Script
 Model: TF-IDF + Random Forest (with comparison against other classifiers)
 Input: combined student text (skills + interests + goals + projects + education)
 Output: Career path prediction with confidence probabilities
+
+All candidates share one TF-IDF configuration, so the text is vectorized
+once per CV fold (and once for the train/test split) and the sparse
+matrices are reused by every classifier. Fits run as one flat set of
+parallel (classifier, fold) tasks with single-threaded estimators, so
+nothing is nested; TRAIN_JOBS sets the task parallelism (default: cores).
+CV tasks send back only their fold score, and only the selected model is
+kept once the candidates are compared.
 """
 
 import pandas as pd
@@ -10,21 +18,37 @@ import numpy as np
 import pickle
 import os
 import json
+import time
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import LinearSVC
 from sklearn.calibration import CalibratedClassifierCV
-from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.metrics import (
     classification_report, confusion_matrix,
     accuracy_score, f1_score
 )
 from sklearn.preprocessing import LabelEncoder
+import sys
 import warnings
 warnings.filterwarnings("ignore")
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.native_scorer import export_pipeline
+from services.guidance_engine import write_release
+
+TRAIN_JOBS = int(os.environ.get("TRAIN_JOBS", os.cpu_count() or 1))
+stage_times = {}
+
+
+def timed(stage: str, started: float) -> None:
+    stage_times[stage] = time.perf_counter() - started
+    print(f"[TIME] {stage}: {stage_times[stage]:.1f}s")
+
 
 # ─────────────────────────────────────────────
 # 1. LOAD DATA
@@ -33,6 +57,7 @@ print("=" * 60)
 print("CAREER GUIDANCE ML MODEL — TRAINING")
 print("=" * 60)
 
+started = time.perf_counter()
 df = pd.read_csv("data/student_profiles.csv")
 print(f"\n[DATA] Loaded {len(df)} records | {df['career_label'].nunique()} career labels")
 
@@ -51,11 +76,12 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.2, random_state=42, stratify=y
 )
 print(f"\n[SPLIT] Train: {len(X_train)} | Test: {len(X_test)}")
+timed("load + split", started)
 
 # ─────────────────────────────────────────────
-# 3. DEFINE PIPELINES TO COMPARE
+# 3. DEFINE CLASSIFIERS TO COMPARE
 # ─────────────────────────────────────────────
-tfidf = TfidfVectorizer(
+TFIDF_PARAMS = dict(
     ngram_range=(1, 2),
     max_features=8000,
     sublinear_tf=True,       # apply log normalization
@@ -63,33 +89,77 @@ tfidf = TfidfVectorizer(
     analyzer='word'
 )
 
-pipelines = {
-    "Random Forest": Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), max_features=8000, sublinear_tf=True, min_df=2)),
-        ("clf", RandomForestClassifier(n_estimators=300, max_depth=None, min_samples_split=2, random_state=42, n_jobs=-1))
-    ]),
-    "Logistic Regression": Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), max_features=8000, sublinear_tf=True, min_df=2)),
-        ("clf", LogisticRegression(max_iter=1000, C=5.0, solver='lbfgs', random_state=42))
-    ]),
-    "Linear SVC (Calibrated)": Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), max_features=8000, sublinear_tf=True, min_df=2)),
-        ("clf", CalibratedClassifierCV(LinearSVC(max_iter=2000, C=1.0, random_state=42)))
-    ]),
+classifiers = {
+    "Random Forest": RandomForestClassifier(n_estimators=300, max_depth=None, min_samples_split=2, random_state=42, n_jobs=-1),
+    "Logistic Regression": LogisticRegression(max_iter=1000, C=5.0, solver='lbfgs', random_state=42),
+    "Linear SVC (Calibrated)": CalibratedClassifierCV(LinearSVC(max_iter=2000, C=1.0, random_state=42)),
 }
 
+
+def vectorize(train_text, other_text) -> tuple:
+    """Fit TF-IDF on one training split; returns (vectorizer, X_fit, X_other)"""
+    vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+    return vectorizer, vectorizer.fit_transform(train_text), vectorizer.transform(other_text)
+
+
+def fit_classifier(clf, X_fit, y_fit):
+    """One (classifier, fold) task, fitted single-threaded: the parallelism is across tasks"""
+    clf = clone(clf)
+    if "n_jobs" in clf.get_params(deep=False):
+        clf.set_params(n_jobs=1)
+    return clf.fit(X_fit, y_fit)
+
+
+def fold_score(clf, X_fit, y_fit, X_val, y_val) -> float:
+    """
+    CV task: weighted F1 on the held-out fold, as cross_val_score(scoring='f1_weighted')
+    computes it. The fitted model stays in the worker; only the score comes back.
+    """
+    return f1_score(y_val, fit_classifier(clf, X_fit, y_fit).predict(X_val), average='weighted')
+
+
 # ─────────────────────────────────────────────
 # 4. TRAIN & COMPARE ALL MODELS
 # ─────────────────────────────────────────────
-print("\n[TRAINING] Comparing classifiers...\n")
-results = {}
+print(f"\n[TRAINING] Comparing classifiers ({TRAIN_JOBS} parallel jobs)...\n")
 skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+folds = list(skf.split(X_train, y_train))
+
+# One TF-IDF fit per CV fold, plus the full training split for the final models
+started = time.perf_counter()
+splits = [(X_train.iloc[fit_idx], X_train.iloc[val_idx]) for fit_idx, val_idx in folds] + [(X_train, X_test)]
+vectorized = Parallel(n_jobs=TRAIN_JOBS)(delayed(vectorize)(fit_text, other_text) for fit_text, other_text in splits)
+timed(f"vectorize ({len(splits)} TF-IDF fits, shared by {len(classifiers)} classifiers)", started)
+
+# Every (classifier, fold) fit, and the final fits, as one flat batch of tasks:
+# CV tasks return a score, the final fits (one per classifier) their model
+started = time.perf_counter()
+fold_targets = [(y_train.iloc[fit_idx], y_train.iloc[val_idx]) for fit_idx, val_idx in folds] + [(y_train, y_test)]
+final_split = len(splits) - 1
+tasks = [(name, split) for name in classifiers for split in range(len(splits))]
+outputs = Parallel(n_jobs=TRAIN_JOBS)(
+    delayed(fit_classifier)(classifiers[name], vectorized[split][1], fold_targets[split][0])
+    if split == final_split else
+    delayed(fold_score)(classifiers[name], vectorized[split][1], fold_targets[split][0],
+                        vectorized[split][2], fold_targets[split][1])
+    for name, split in tasks
+)
+outputs = dict(zip(tasks, outputs))
+timed(f"fit ({len(tasks)} classifier fits)", started)
 
-for name, pipe in pipelines.items():
-    print(f"  Training: {name}...")
-    cv_scores = cross_val_score(pipe, X_train, y_train, cv=skf, scoring='f1_weighted', n_jobs=-1)
-    pipe.fit(X_train, y_train)
-    y_pred = pipe.predict(X_test)
+started = time.perf_counter()
+results = {}
+for name, template in classifiers.items():
+    cv_scores = np.array([outputs.pop((name, split)) for split in range(final_split)])
+
+    # Final model: the shared full-split vectorizer + this classifier, with its
+    # own n_jobs setting restored for serving
+    clf = outputs.pop((name, final_split))
+    if "n_jobs" in template.get_params(deep=False):
+        clf.set_params(n_jobs=template.get_params()["n_jobs"])
+    pipe = Pipeline([("tfidf", vectorized[final_split][0]), ("clf", clf)])
+
+    y_pred = clf.predict(vectorized[final_split][2])
     test_acc = accuracy_score(y_test, y_pred)
     test_f1 = f1_score(y_test, y_pred, average='weighted')
 
@@ -100,15 +170,21 @@ for name, pipe in pipelines.items():
         "test_f1": test_f1,
         "pipeline": pipe
     }
+    print(f"  {name}")
     print(f"    CV F1 (5-fold): {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
     print(f"    Test Accuracy : {test_acc:.4f}")
     print(f"    Test F1       : {test_f1:.4f}\n")
+timed("evaluate", started)
 
 # ─────────────────────────────────────────────
 # 5. SELECT BEST MODEL
 # ─────────────────────────────────────────────
 best_model_name = max(results, key=lambda k: results[k]["test_f1"])
 best_pipeline = results[best_model_name]["pipeline"]
+# Only the selected model is saved; let the others go (a 300-tree forest is large)
+for r in results.values():
+    del r["pipeline"]
+del vectorized
 
 print(f"\n[BEST MODEL] {best_model_name}")
 print(f"  Test Accuracy : {results[best_model_name]['test_accuracy']:.4f}")
@@ -124,6 +200,7 @@ print(classification_report(y_test, y_pred_best))
 # ─────────────────────────────────────────────
 # 7. SAVE MODEL + METADATA
 # ─────────────────────────────────────────────
+started = time.perf_counter()
 os.makedirs("ml", exist_ok=True)
 
 # Save best pipeline (includes vectorizer + classifier)
@@ -156,6 +233,15 @@ with open("ml/model_metadata.json", "w") as f:
     json.dump(model_metadata, f, indent=2)
 print(f"[SAVED] ml/model_metadata.json")
 
+# Export the same model for the NumPy scorer used in serving
+export_pipeline(best_pipeline, "ml/career_scorer")
+print(f"[SAVED] ml/career_scorer/")
+
+# Last: servers only load the pickle / scorer pair this marker names
+release = write_release(".", source="ml/train.py", test_accuracy=model_metadata["test_accuracy"])
+print(f"[SAVED] ml/release.json: release {release['release']}")
+timed("save + export", started)
+
 # ─────────────────────────────────────────────
 # 8. QUICK INFERENCE TEST
 # ─────────────────────────────────────────────
@@ -190,4 +276,5 @@ for profile in test_profiles:
         print(f"    {rank}. {label:30s} {conf:.1f}%")
     print()
 
+print(f"[TIME] total: {sum(stage_times.values()):.1f}s")
 print("[DONE] Training complete. Model ready to use.")
@@ -0,0 +1,293 @@
+"""
+Career Guidance ML Model - Incremental Training
+Folds newly labeled profiles into the served model without a full
+retrain of ml/train.py:
+- Features: HashingVectorizer, stateless, so there is no vocabulary to
+  refit when new words show up
+- Classifier: SGDClassifier (logistic loss) updated with partial_fit
+- Input: JSONL feeds with one labeled profile per line, in the same
+  layout as data/student_profiles.csv:
+      {"id": "...", "combined_text": "...", "career_label": "..."}
+  Lines that are malformed or carry a career missing from
+  ml/skill_data.json are skipped (a new career needs its taxonomy entry
+  and a full retrain). A trailing line without a newline is left for
+  the next run, so a feed can be appended to while this reads it
+- The model and each feed's read offset are checkpointed after every
+  mini-batch: an interrupted run resumes where it stopped and no row is
+  learned twice. Run one update at a time per checkpoint
+- The first run bootstraps the model from the ml/train.py training split
+  of data/student_profiles.csv
+- --publish writes ml/career_classifier.pkl, ml/career_scorer/ and
+  ml/model_metadata.json, then ml/release.json naming them; running
+  servers pick the release up
+  through the model hot reload. It refuses a model whose accuracy on the
+  ml/train.py test split is below the deployed model's, unless --force
+
+Usage:
+    python ml/train_incremental.py feedback/2026-10-16.jsonl [more.jsonl ...] --publish
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, f1_score
+warnings.filterwarnings("ignore")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from services.native_scorer import export_pipeline
+from services.guidance_engine import load_artifacts, write_release
+
+DATASET_PATH    = os.path.join(BASE_DIR, "data/student_profiles.csv")
+SKILL_DATA_PATH = os.path.join(BASE_DIR, "ml/skill_data.json")
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "ml/incremental/checkpoint.pkl")
+BATCH_SIZE      = 256
+
+# Hashed feature space; only the buckets the model has weights for are exported
+HASH_FEATURES = 2 ** 18
+
+
+def new_state(classes: list) -> dict:
+    """Untrained checkpoint state for a fixed set of career labels"""
+    model = Pipeline([
+        ("hashing", HashingVectorizer(n_features=HASH_FEATURES, ngram_range=(1, 2), alternate_sign=False)),
+        ("clf", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)),
+    ])
+    return {"model": model, "classes": sorted(classes), "offsets": {}, "rows": 0, "batches": 0}
+
+
+def career_labels(path: str = SKILL_DATA_PATH) -> list:
+    """Careers the guidance engine has a taxonomy for, and so can serve"""
+    with open(path, "r", encoding="utf-8") as f:
+        return sorted(json.load(f))
+
+
+def training_split(path: str = DATASET_PATH) -> tuple:
+    """(X_train, X_test, y_train, y_test): the same split ml/train.py uses"""
+    df = pd.read_csv(path)
+    return train_test_split(
+        df["combined_text"], df["career_label"], test_size=0.2, random_state=42, stratify=df["career_label"]
+    )
+
+
+# ─────────────────────────────────────────────
+# Updates
+# ─────────────────────────────────────────────
+
+def partial_fit(state: dict, texts: list, labels: list) -> None:
+    """One SGD pass over one mini-batch"""
+    model = state["model"]
+    X = model.named_steps["hashing"].transform(texts)
+    model.named_steps["clf"].partial_fit(X, labels, classes=state["classes"])
+    state["rows"] += len(texts)
+    state["batches"] += 1
+
+
+def fit_batches(state: dict, texts: list, labels: list, batch_size: int = BATCH_SIZE) -> None:
+    """partial_fit over in-memory rows, batch_size at a time"""
+    texts, labels = list(texts), list(labels)
+    for start in range(0, len(texts), batch_size):
+        partial_fit(state, texts[start:start + batch_size], labels[start:start + batch_size])
+
+
+def read_feed(path: str, offset: int, classes: list, batch_size: int = BATCH_SIZE):
+    """
+    Yield (texts, labels, end offset, skipped lines) per batch of complete
+    lines after byte offset
+    """
+    known = set(classes)
+    texts, labels, skipped = [], [], 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                text, label = record["combined_text"], record["career_label"]
+            except (ValueError, KeyError, TypeError):
+                skipped += 1
+                continue
+            if label not in known or not isinstance(text, str) or not text.strip():
+                skipped += 1
+                continue
+            texts.append(text)
+            labels.append(label)
+            if len(texts) == batch_size:
+                yield texts, labels, offset, skipped
+                texts, labels, skipped = [], [], 0
+    if texts or skipped:
+        yield texts, labels, offset, skipped
+
+
+def update_from_feed(state: dict, path: str, checkpoint_path: str = CHECKPOINT_PATH,
+                     batch_size: int = BATCH_SIZE) -> dict:
+    """Learn the feed's unread rows, checkpointing after every batch"""
+    key = os.path.abspath(path)
+    offset = state["offsets"].get(key, 0)
+    if os.path.getsize(path) < offset:
+        print(f"[WARN] {path} is shorter than its checkpointed offset; reading it from the start")
+        offset = 0
+    learned = skipped = 0
+    for texts, labels, offset, bad in read_feed(path, offset, state["classes"], batch_size):
+        if texts:
+            partial_fit(state, texts, labels)
+        state["offsets"][key] = offset
+        save_checkpoint(state, checkpoint_path)
+        learned += len(texts)
+        skipped += bad
+    return {"learned": learned, "skipped": skipped}
+
+
+# ─────────────────────────────────────────────
+# Checkpoints and publishing
+# ─────────────────────────────────────────────
+
+def _replace_file(path: str, write) -> None:
+    """Write via a temp file + rename, so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def save_checkpoint(state: dict, path: str = CHECKPOINT_PATH) -> None:
+    _replace_file(path, lambda f: pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_checkpoint(path: str = CHECKPOINT_PATH):
+    """The saved state, or None if there is no checkpoint yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def publish(state: dict, base_dir: str = BASE_DIR, texts=None, labels=None, force: bool = False) -> dict:
+    """
+    Write the serving artifacts the guidance engine loads (and hot-reloads)
+    and the model metadata, then the release marker that lets servers load
+    them.
+
+    The model is scored on texts / labels (default: the ml/train.py test
+    split) against the model deployed in base_dir. A lower accuracy raises
+    ValueError unless force is set. Returns the release marker.
+    """
+    if not state["rows"]:
+        raise ValueError("Refusing to publish a model that has not learned any rows")
+    if texts is None:
+        _, texts, _, labels = training_split()
+    scores = evaluate(state, texts, labels)
+    accuracy = scores["accuracy"]
+    deployed = deployed_accuracy(texts, labels, base_dir)
+    if deployed is not None and accuracy < deployed and not force:
+        raise ValueError(
+            f"Refusing to publish: test accuracy {accuracy:.4f} is below the deployed model's {deployed:.4f} "
+            "(use --force to publish anyway)"
+        )
+
+    ml_dir = os.path.join(base_dir, "ml")
+    _replace_file(os.path.join(ml_dir, "career_classifier.pkl"), lambda f: pickle.dump(state["model"], f))
+    export_pipeline(state["model"], os.path.join(ml_dir, "career_scorer"))
+    metadata = {
+        "best_model": "SGD Classifier (incremental)",
+        "test_accuracy": round(accuracy, 4),
+        "test_f1": round(scores["f1"], 4),
+        "career_labels": [str(label) for label in state["model"].classes_],
+        "total_training_samples": state["rows"],
+        "total_test_samples": len(labels),
+    }
+    _replace_file(os.path.join(ml_dir, "model_metadata.json"),
+                  lambda f: f.write(json.dumps(metadata, indent=2).encode("utf-8")))
+    return write_release(base_dir, source="ml/train_incremental.py", test_accuracy=round(accuracy, 4),
+                         previous_test_accuracy=None if deployed is None else round(deployed, 4))
+
+
+def deployed_accuracy(texts, labels, base_dir: str = BASE_DIR):
+    """Accuracy of the model base_dir serves now, or None if there is none to load"""
+    try:
+        model = load_artifacts(base_dir).career_model
+    except Exception:
+        return None
+    predicted = model.classes_[np.argmax(model.predict_proba(list(texts)), axis=1)]
+    return accuracy_score(labels, predicted)
+
+
+def evaluate(state: dict, texts, labels) -> dict:
+    y_pred = state["model"].predict(list(texts))
+    return {
+        "accuracy": accuracy_score(labels, y_pred),
+        "f1": f1_score(labels, y_pred, average="weighted"),
+    }
+
+
+# ─────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Fold labeled JSONL feeds into the career model")
+    parser.add_argument("feeds", nargs="*", help="JSONL files with combined_text + career_label per line")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--publish", action="store_true",
+                        help="write ml/career_classifier.pkl, ml/career_scorer/ and ml/model_metadata.json afterwards")
+    parser.add_argument("--reset", action="store_true", help="discard the checkpoint and bootstrap again")
+    parser.add_argument("--force", action="store_true",
+                        help="publish even if the deployed model scores higher on the test split")
+    args = parser.parse_args(argv)
+
+    X_train, X_test, y_train, y_test = training_split()
+    state = None if args.reset else load_checkpoint(args.checkpoint)
+    if state is None:
+        started = time.perf_counter()
+        state = new_state(career_labels())
+        fit_batches(state, X_train, y_train, args.batch_size)
+        save_checkpoint(state, args.checkpoint)
+        print(f"[BOOTSTRAP] {state['rows']} rows from {os.path.relpath(DATASET_PATH, BASE_DIR)} "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        print(f"[CHECKPOINT] {args.checkpoint}: {state['rows']} rows in {state['batches']} batches")
+
+    for feed in args.feeds:
+        started = time.perf_counter()
+        result = update_from_feed(state, feed, args.checkpoint, args.batch_size)
+        print(f"[FEED] {feed}: learned {result['learned']} rows, skipped {result['skipped']} "
+              f"({time.perf_counter() - started:.2f}s)")
+
+    scores = evaluate(state, X_test, y_test)
+    print(f"[EVAL] ml/train.py test split: accuracy {scores['accuracy']:.4f} | F1 {scores['f1']:.4f}")
+
+    if args.publish:
+        try:
+            release = publish(state, texts=X_test, labels=y_test, force=args.force)
+        except ValueError as e:
+            print(f"[SKIPPED] {e}")
+            sys.exit(1)
+        print("[SAVED] ml/career_classifier.pkl")
+        print("[SAVED] ml/career_scorer/")
+        print("[SAVED] ml/model_metadata.json")
+        print(f"[SAVED] ml/release.json: release {release['release']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Admin Routes
+Operational endpoints for the API (cache stats / flush, model reload,
+request profiles, ...). Disabled unless ADMIN_TOKEN is set; callers must
+send it in the X-Admin-Token header.
+"""
+
+from flask import Blueprint, request, jsonify, send_file
+from functools import wraps
+import hmac
+import os
+
+from services.resume_cache import cache_stats, parse_cache, pdf_cache
+from services.resume_downloader import downloader_stats
+from services.guidance_engine import prediction_cache_stats, flush_prediction_cache, reload_artifacts
+from services.profiler import profiler
+
+admin_bp = Blueprint("admin", __name__)
+
+
+def _admin_token_valid() -> bool:
+    token = os.environ.get("ADMIN_TOKEN", "")
+    return bool(token) and hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token)
+
+
+def require_admin(view):
+    """Reject the request unless it carries the configured admin token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = os.environ.get("ADMIN_TOKEN", "")
+        if not token:
+            return jsonify({"error": "Admin endpoints are disabled"}), 403
+        if not _admin_token_valid():
+            return jsonify({"error": "Invalid admin token"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@admin_bp.route("/cache", methods=["GET"])
+@require_admin
+def cache_status():
+    """Hit / miss / eviction counters for the resume and prediction caches"""
+    return jsonify({
+        "resume_cache": cache_stats(),
+        "prediction_cache": prediction_cache_stats(),
+    }), 200
+
+
+@admin_bp.route("/cache/flush", methods=["POST"])
+@require_admin
+def cache_flush():
+    """
+    Empty caches. ?cache=prediction|parse|pdf|all (default: prediction)
+    Returns how many entries each one dropped.
+
+    In-memory tiers are per process: this only empties the worker that
+    receives the request (named by worker_pid in the response), so under
+    gunicorn repeat it per worker or restart them. parse and pdf also
+    empty their disk tier, which every worker shares.
+    """
+    flushers = {
+        "prediction": flush_prediction_cache,
+        "parse": parse_cache.clear,
+        "pdf": pdf_cache.clear,
+    }
+    name = request.args.get("cache", "prediction")
+    if name != "all" and name not in flushers:
+        return jsonify({"error": f"Unknown cache '{name}'"}), 400
+    targets = flushers if name == "all" else {name: flushers[name]}
+    return jsonify({
+        "flushed": {key: flush() for key, flush in targets.items()},
+        "scope": "worker",
+        "worker_pid": os.getpid(),
+    }), 200
+
+
+@admin_bp.route("/downloads", methods=["GET"])
+@require_admin
+def download_status():
+    """Attempt / retry / abort counters for resume_url downloads"""
+    return jsonify(downloader_stats()), 200
+
+
+@admin_bp.route("/model/reload", methods=["POST"])
+@require_admin
+def model_reload():
+    """
+    Reload the model + taxonomy from ml/ in the worker that receives this
+    (named by worker_pid in the response). The new version only replaces
+    the old one after a smoke prediction passes. Other workers are not
+    reached by this call; they pick the change up through their file
+    watcher within two MODEL_WATCH_INTERVALs.
+    """
+    result = reload_artifacts()
+    body = {**result, "scope": "worker", "worker_pid": os.getpid()}
+    return jsonify(body), 500 if result["status"] == "failed" else 200
+
+
+# ─────────────────────────────────────────────
+# Request profiling
+# ─────────────────────────────────────────────
+
+def profile_requested(*args, **kwargs) -> bool:
+    """
+    True when an admin asks for this request to be profiled: X-Profile: 1
+    or ?profile=1 together with a valid token (see metrics.profile_request)
+    """
+    asked = request.headers.get("X-Profile") == "1" or request.args.get("profile") == "1"
+    return asked and _admin_token_valid()
+
+
+@admin_bp.route("/profiles", methods=["GET"])
+@require_admin
+def profile_list():
+    """Saved request profiles on this host, newest first"""
+    return jsonify({"profiles": profiler.profiles()}), 200
+
+
+@admin_bp.route("/profiles/<name>", methods=["GET"])
+@require_admin
+def profile_download(name):
+    """One pstats dump; open it with `python -m pstats <file>` or snakeviz"""
+    path = profiler.path(name)
+    if path is None:
+        return jsonify({"error": "Unknown profile"}), 404
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True, download_name=name)
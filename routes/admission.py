@@ -0,0 +1,54 @@
+"""
+Admission Route Helpers
+admission_control wraps the CPU-heavy endpoints in services/admission
+budgets; a request that can't be admitted in time gets a fast 503 with
+Retry-After instead of holding a server thread.
+"""
+
+from contextlib import ExitStack
+from flask import jsonify, make_response
+from functools import wraps
+
+from services.admission import Overloaded, admitted, request_slot
+
+
+def overloaded_response(error: Overloaded):
+    return jsonify({
+        "error": "Server is busy, try again shortly",
+        "detail": str(error),
+    }), 503, {"Retry-After": str(error.retry_after)}
+
+
+def admission_control(view):
+    """Run the view as one admitted request (see services.admission.admitted)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            with admitted():
+                return view(*args, **kwargs)
+        except Overloaded as oe:
+            return overloaded_response(oe)
+    return wrapper
+
+
+def streaming_admission_control(view):
+    """
+    admission_control for a view that streams its body: the requests slot
+    is held until the response is closed, not just until the view returns.
+    The view sets its own queue_deadline around each slot it waits for.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        admission = ExitStack()
+        try:
+            admission.enter_context(request_slot())
+        except Overloaded as oe:
+            return overloaded_response(oe)
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            admission.close()
+            raise
+        response.call_on_close(admission.close)
+        return response
+    return wrapper
@@ -1,13 +1,25 @@
 """
 Guidance API Route
 POST /api/generate-guidance
+POST /api/generate-guidance/batch  (NDJSON streaming)
 """
 
-from flask import Blueprint, request, jsonify
-from services.resume_parser import parse_resume
+from flask import Blueprint, request, jsonify, make_response, Response, stream_with_context
+from concurrent.futures import ThreadPoolExecutor
 from services.feature_builder import build_feature_text, merge_skills
-from services.guidance_engine import get_guidance
-import requests
+from services.guidance_engine import (
+    get_guidance, get_guidance_many, validate_top_k, warmup, ModelUnavailableError, DEFAULT_TOP_K
+)
+from services.resume_cache import parse_resume_cached, extract_pdf_text_cached
+from services.resume_downloader import download_resume
+from services.json_stream import MalformedItem, iter_json_array, iter_ndjson
+from services.metrics import stage, profile_request
+from routes.metrics import track_request
+from routes.admin import profile_requested
+from routes.admission import admission_control, streaming_admission_control, overloaded_response
+from services.admission import Overloaded, inference_slot, pdf_slot, queue_deadline
+import json
+import os
 import traceback
 
 guidance_bp = Blueprint("guidance", __name__)
@@ -16,14 +28,20 @@ guidance_bp = Blueprint("guidance", __name__)
 def fetch_resume_text(pdf_url: str) -> str:
     """Download PDF from Supabase URL and extract text"""
     try:
-        import pdfplumber, io
-        response = requests.get(pdf_url, timeout=30)
-        response.raise_for_status()
-        with pdfplumber.open(io.BytesIO(response.content)) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text.strip()
+        with stage("download_resume"):
+            pdf_bytes = download_resume(pdf_url)
+    except Exception as e:
+        raise ValueError(f"Failed to fetch/parse resume PDF: {str(e)}")
+    return extract_resume_text(pdf_bytes)
+
+
+def extract_resume_text(pdf_bytes: bytes) -> str:
+    """Text of a downloaded resume PDF (ValueError if it can't be read)"""
+    try:
+        with pdf_slot(), stage("pdf_extract"):
+            return extract_pdf_text_cached(pdf_bytes)["text"].strip()
+    except Overloaded:
+        raise
     except ImportError:
         # pdfplumber not available in this env — return empty string
         return ""
@@ -31,7 +49,73 @@ def fetch_resume_text(pdf_url: str) -> str:
         raise ValueError(f"Failed to fetch/parse resume PDF: {str(e)}")
 
 
+class InvalidRequest(ValueError):
+    """A malformed request object (400, rather than 422 for unusable content)"""
+
+
+def prepare_student(data: dict) -> tuple:
+    """
+    Resume download / parse and feature building for one request object.
+    Returns (parsed resume, feature_text, student_skills).
+    The cheap checks (body shape, top_k) run before the resume is touched.
+    """
+    if not isinstance(data, dict) or not data:
+        raise InvalidRequest("Request body must be JSON")
+
+    qa = data.get("qa_responses", {})
+    if not qa or not isinstance(qa, dict):
+        raise InvalidRequest("qa_responses is required")
+    try:
+        validate_top_k(data.get("top_k", DEFAULT_TOP_K))
+    except ValueError as ve:
+        raise InvalidRequest(str(ve)) from ve
+
+    # ── Get resume text ──────────────────────────────────
+    resume_text = data.get("resume_text", "")
+    resume_url  = data.get("resume_url", "")
+
+    if not resume_text and resume_url:
+        resume_text = fetch_resume_text(resume_url)
+
+    if not resume_text:
+        raise InvalidRequest("Provide either resume_url or resume_text")
+
+    # ── Parse resume ─────────────────────────────────────
+    with stage("parse_resume"):
+        parsed = parse_resume_cached(resume_text)
+
+    # Override with Q&A values if more specific
+    if qa.get("education_branch"):
+        parsed["education_branch"] = qa["education_branch"]
+    if qa.get("has_internship") is not None:
+        parsed["has_internship"] = bool(qa["has_internship"])
+
+    # ── Build features ───────────────────────────────────
+    with stage("build_features"):
+        feature_text   = build_feature_text(parsed, qa)
+        student_skills = merge_skills(parsed["skills"], qa.get("known_skills", ""))
+    return parsed, feature_text, student_skills
+
+
+def guidance_response(parsed: dict, student_skills: list, guidance: dict) -> dict:
+    return {
+        "status": "success",
+        "student_profile": {
+            "skills_detected": student_skills,
+            "education_branch": parsed["education_branch"],
+            "education_degree": parsed["education_degree"],
+            "cgpa": parsed["cgpa"],
+            "has_internship": parsed["has_internship"],
+            "projects_found": parsed["projects"]
+        },
+        "guidance": guidance
+    }
+
+
 @guidance_bp.route("/generate-guidance", methods=["POST"])
+@track_request("generate_guidance")
+@admission_control
+@profile_request("generate_guidance", requested=profile_requested, respond=make_response)
 def generate_career_guidance():
     """
     Expected JSON body:
@@ -47,59 +131,152 @@ def generate_career_guidance():
             "year_of_study": "3rd year",
             "has_internship": false,
             "self_weakness": "..."
-        }
+        },
+        "top_k": 3                                         ← optional, 1..15 or "all" (default 3)
     }
     """
     try:
         data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
+        parsed, feature_text, student_skills = prepare_student(data)
+
+        # ── Run guidance engine ──────────────────────────────
+        with inference_slot():
+            guidance = get_guidance(feature_text, student_skills, data.get("top_k", DEFAULT_TOP_K))
+
+        return jsonify(guidance_response(parsed, student_skills, guidance)), 200
 
-        qa = data.get("qa_responses", {})
-        if not qa:
-            return jsonify({"error": "qa_responses is required"}), 400
+    except InvalidRequest as ie:
+        return jsonify({"error": str(ie)}), 400
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except ModelUnavailableError as me:
+        return jsonify({"error": "Model not available", "detail": str(me)}), 503
+    except Overloaded as oe:
+        return overloaded_response(oe)
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": "Internal server error", "detail": str(e)}), 500
 
-        # ── Get resume text ──────────────────────────────────
-        resume_text = data.get("resume_text", "")
-        resume_url  = data.get("resume_url", "")
 
-        if not resume_text and resume_url:
-            resume_text = fetch_resume_text(resume_url)
+# ─────────────────────────────────────────────
+# Batch endpoint
+# ─────────────────────────────────────────────
+BATCH_CHUNK_SIZE      = int(os.environ.get("BATCH_CHUNK_SIZE", 64))
+BATCH_PREPARE_WORKERS = int(os.environ.get("BATCH_PREPARE_WORKERS", 8))
 
-        if not resume_text:
-            return jsonify({"error": "Provide either resume_url or resume_text"}), 400
 
-        # ── Parse resume ─────────────────────────────────────
-        parsed = parse_resume(resume_text)
+@guidance_bp.route("/generate-guidance/batch", methods=["POST"])
+@track_request("generate_guidance_batch")
+@streaming_admission_control
+def generate_career_guidance_batch():
+    """
+    Body: a JSON array of /generate-guidance request objects, or the same
+    objects one per line with Content-Type: application/x-ndjson.
 
-        # Override with Q&A values if more specific
-        if qa.get("education_branch"):
-            parsed["education_branch"] = qa["education_branch"]
-        if qa.get("has_internship") is not None:
-            parsed["has_internship"] = bool(qa["has_internship"])
+    Streams back one NDJSON line per item, in input order, as each chunk
+    of BATCH_CHUNK_SIZE items completes:
+        {"index": 0, "status": "success", "student_profile": {...}, "guidance": {...}}
+        {"index": 1, "status": "error", "code": 422, "error": "..."}
+        {"index": 2, "status": "error", "code": 503, "error": "...", "retry_after": 3}
 
-        # ── Build features ───────────────────────────────────
-        feature_text   = build_feature_text(parsed, qa)
-        student_skills = merge_skills(parsed["skills"], qa.get("known_skills", ""))
+    The batch counts as one admitted request until the stream ends. Each
+    chunk's predictions queue for an inference slot for at most
+    ADMISSION_MAX_WAIT seconds; items shed past that come back as 503
+    entries to resubmit after retry_after seconds.
 
-        # ── Run guidance engine ──────────────────────────────
-        guidance = get_guidance(feature_text, student_skills)
-
-        return jsonify({
-            "status": "success",
-            "student_profile": {
-                "skills_detected": student_skills,
-                "education_branch": parsed["education_branch"],
-                "education_degree": parsed["education_degree"],
-                "cgpa": parsed["cgpa"],
-                "has_internship": parsed["has_internship"],
-                "projects_found": parsed["projects"]
-            },
-            "guidance": guidance
-        }), 200
+    The body is read incrementally and only one chunk is held in memory,
+    so memory use does not grow with the batch size.
+    """
+    try:
+        warmup()
+    except ModelUnavailableError as me:
+        return jsonify({"error": "Model not available", "detail": str(me)}), 503
+
+    ndjson = request.mimetype in ("application/x-ndjson", "application/jsonl")
+    items = iter_ndjson(request.stream) if ndjson else iter_json_array(request.stream)
+
+    def generate():
+        with ThreadPoolExecutor(max_workers=BATCH_PREPARE_WORKERS) as pool:
+            for chunk in _chunks(enumerate(items), BATCH_CHUNK_SIZE):
+                for line in _run_batch_chunk(chunk, pool):
+                    yield json.dumps(line) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
+
+def _run_batch_chunk(chunk: list, pool) -> list:
+    """Prepare a chunk's items concurrently, then predict them in batched calls"""
+    results = {}
+    prepared = list(pool.map(_prepare_batch_item, [item for _, item in chunk]))
+
+    # One get_guidance_many call per distinct top_k in the chunk
+    groups = {}
+    for (index, item), entry in zip(chunk, prepared):
+        if "error" in entry:
+            results[index] = entry
+        else:
+            top_k = item.get("top_k", DEFAULT_TOP_K)
+            groups.setdefault(json.dumps(top_k), (top_k, []))[1].append((index, entry))
+
+    for top_k, members in groups.values():
+        try:
+            with queue_deadline(), inference_slot():
+                guidance = get_guidance_many(
+                    [entry["feature_text"] for _, entry in members],
+                    [entry["skills"] for _, entry in members],
+                    top_k,
+                )
+        except ValueError as ve:
+            for index, _ in members:
+                results[index] = {"status": "error", "code": 422, "error": str(ve)}
+            continue
+        except Overloaded as oe:
+            for index, _ in members:
+                results[index] = _overloaded_entry(oe)
+            continue
+        except Exception as e:
+            traceback.print_exc()
+            for index, _ in members:
+                results[index] = {"status": "error", "code": 500, "error": "Internal server error", "detail": str(e)}
+            continue
+        for (index, entry), item_guidance in zip(members, guidance):
+            results[index] = guidance_response(entry["parsed"], entry["skills"], item_guidance)
+
+    return [{"index": index, **results[index]} for index, _ in chunk]
+
+
+def _prepare_batch_item(item) -> dict:
+    """prepare_student for one batch item, with failures turned into entries"""
+    if isinstance(item, MalformedItem):
+        return {"status": "error", "code": 400, "error": item.message}
+    try:
+        parsed, feature_text, skills = prepare_student(item)
+        return {"parsed": parsed, "feature_text": feature_text, "skills": skills}
+    except InvalidRequest as ie:
+        return {"status": "error", "code": 400, "error": str(ie)}
     except ValueError as ve:
-        return jsonify({"error": str(ve)}), 422
+        return {"status": "error", "code": 422, "error": str(ve)}
+    except Overloaded as oe:
+        return _overloaded_entry(oe)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({"error": "Internal server error", "detail": str(e)}), 500
+        return {"status": "error", "code": 500, "error": "Internal server error", "detail": str(e)}
+
+
+def _overloaded_entry(error: Overloaded) -> dict:
+    """The batch form of overloaded_response"""
+    return {
+        "status": "error", "code": 503, "error": "Server is busy, try again shortly",
+        "detail": str(error), "retry_after": error.retry_after,
+    }
+
+
+def _chunks(iterable, size: int):
+    chunk = []
+    for element in iterable:
+        chunk.append(element)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
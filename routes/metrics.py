@@ -0,0 +1,53 @@
+"""
+Metrics Route
+GET /metrics — Prometheus text format, summed over every gunicorn worker
+on the host. track_request(endpoint) instruments a view with in-flight,
+latency, status code and payload size metrics.
+
+When METRICS_TOKEN is set, /metrics answers only requests that send it as
+"Authorization: Bearer <token>". Without it the endpoint is open and must
+only be reachable from the scraper's network, never the public internet.
+"""
+
+from flask import Blueprint, Response, request, make_response, jsonify
+from functools import wraps
+import hmac
+import os
+
+from services import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def track_request(endpoint: str):
+    """
+    Record a view's metrics under endpoint. The request is finished when
+    the response is closed, so streamed bodies are timed to their end.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not metrics.METRICS_ENABLED:
+                return view(*args, **kwargs)
+            started = metrics.request_started(endpoint, request.content_length)
+            try:
+                response = make_response(view(*args, **kwargs))
+            except Exception:
+                metrics.request_finished(endpoint, started, 500)
+                raise
+            size = None if response.is_streamed else response.calculate_content_length()
+            response.call_on_close(
+                lambda: metrics.request_finished(endpoint, started, response.status_code, size)
+            )
+            return response
+        return wrapper
+    return decorator
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    token = os.environ.get("METRICS_TOKEN", "")
+    sent = request.headers.get("Authorization", "").encode("utf-8", "surrogateescape")
+    if token and not hmac.compare_digest(sent, f"Bearer {token}".encode("utf-8")):
+        return jsonify({"error": "Invalid metrics token"}), 401
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -1,32 +1,80 @@
 """
 Web Route — Showcase Website
-Serves the demo UI and handles PDF + form submission
+Serves the demo UI and handles PDF + form submission, either inline
+(/api/analyze) or as a background job the page polls (/api/analyze/jobs)
+
+The page is rendered and compressed once when the blueprint is
+registered; GET / only picks a variant and answers 304 to revalidations.
 """
 
-from flask import Blueprint, request, jsonify, render_template_string
-import pdfplumber
-import io
+from flask import Blueprint, request, jsonify, make_response, render_template_string, Response
+import gzip
+import hashlib
 import traceback
 import os
 
-from services.resume_parser import parse_resume
+try:
+    import brotli
+except ImportError:
+    # Optional: without it the page is served gzip / uncompressed only
+    brotli = None
+
 from services.feature_builder import build_feature_text, merge_skills
-from services.guidance_engine import get_guidance
+from services.guidance_engine import get_guidance, ModelUnavailableError
+from services.resume_cache import parse_resume_cached, extract_pdf_text_cached
+from services.job_queue import JobRunner, QueueFullError
+from services.metrics import stage, profile_request
+from routes.metrics import track_request
+from routes.admin import profile_requested
+from routes.admission import admission_control, overloaded_response
+from services.admission import Overloaded, inference_slot, pdf_slot
 
 web_bp = Blueprint("web", __name__)
 
-# Load the HTML template once
 TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "index.html")
+INDEX_MAX_AGE = int(os.environ.get("INDEX_MAX_AGE", 300))
 
+# content-coding → (body, strong ETag), filled in by _compile_index
+_index_variants = {}
 
-@web_bp.route("/", methods=["GET"])
-def index():
+
+@web_bp.record_once
+def _compile_index(state) -> None:
+    """Render the template once and precompute its compressed variants"""
     with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
         html = f.read()
-    return render_template_string(html)
+    with state.app.app_context():
+        body = render_template_string(html).encode("utf-8")
+
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    _index_variants["identity"] = (body, f'"{digest}"')
+    _index_variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+    if brotli is not None:
+        _index_variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+
+@web_bp.route("/", methods=["GET"])
+def index():
+    offered = [coding for coding in ("br", "gzip", "identity") if coding in _index_variants]
+    coding = request.accept_encodings.best_match(offered) or "identity"
+    body, etag = _index_variants[coding]
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={INDEX_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(body, mimetype="text/html", headers=headers)
 
 
 @web_bp.route("/api/analyze", methods=["POST"])
+@track_request("analyze")
+@admission_control
+@profile_request("analyze", requested=profile_requested, respond=make_response)
 def analyze():
     """
     Accepts multipart/form-data:
@@ -36,61 +84,124 @@ def analyze():
         self_weakness, preferred_work
     """
     try:
-        # ── Get uploaded PDF ─────────────────────────────
         resume_file = request.files.get("resume")
         if not resume_file:
             return jsonify({"error": "No resume file uploaded"}), 400
+        code, body = run_analysis(resume_file.read(), request.form.to_dict())
+        return jsonify(body), code
+
+    except ModelUnavailableError as me:
+        return jsonify({"error": "Model not available", "detail": str(me)}), 503
+    except Overloaded as oe:
+        return overloaded_response(oe)
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": "Internal server error", "detail": str(e)}), 500
+
+
+@web_bp.route("/api/analyze/jobs", methods=["POST"])
+@track_request("analyze_job_submit")
+def submit_analysis_job():
+    """
+    Same form as /api/analyze, but returns 202 with a job id at once;
+    poll GET /api/analyze/jobs/<job_id> for the result. The job is
+    profiled like /api/analyze (sampled, or asked for by an admin).
+    """
+    resume_file = request.files.get("resume")
+    if not resume_file:
+        return jsonify({"error": "No resume file uploaded"}), 400
+    try:
+        job = analysis_jobs.submit({
+            "pdf_bytes": resume_file.read(),
+            "form": request.form.to_dict(),
+            "profile": profile_requested(),
+        })
+    except QueueFullError as qe:
+        return jsonify({"error": "Server is busy, try again shortly", "detail": str(qe)}), 503, {"Retry-After": "5"}
+    return jsonify({
+        "job_id": job["id"],
+        "status": job["status"],
+        "poll_url": f"/api/analyze/jobs/{job['id']}",
+    }), 202
+
+
+@web_bp.route("/api/analyze/jobs/<job_id>", methods=["GET"])
+def analysis_job_status(job_id):
+    """
+    status: queued | running | done | failed. Finished jobs carry
+    queue_wait_ms and processing_ms; done jobs the /api/analyze body
+    under "result", failed ones "error" and its HTTP-style "code" (503
+    ones also "retry_after", seconds before resubmitting).
+    """
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job id"}), 404
+    return jsonify(job), 200
 
-        pdf_bytes = resume_file.read()
-        resume_text = ""
-        try:
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                for page in pdf.pages:
-                    resume_text += page.extract_text() or ""
-        except Exception:
-            return jsonify({"error": "Could not read PDF. Make sure it's a valid PDF file."}), 422
-
-        if not resume_text.strip():
-            return jsonify({"error": "PDF appears to be empty or image-based. Please use a text-based PDF."}), 422
-
-        # ── Get Q&A fields ────────────────────────────────
-        qa = {
-            "interests":        request.form.get("interests", ""),
-            "known_skills":     request.form.get("known_skills", ""),
-            "career_goal":      request.form.get("career_goal", ""),
-            "projects_done":    request.form.get("projects_done", ""),
-            "education_branch": request.form.get("education_branch", ""),
-            "year_of_study":    request.form.get("year_of_study", ""),
-            "has_internship":   request.form.get("has_internship", "false") == "true",
-            "self_weakness":    request.form.get("self_weakness", ""),
-            "preferred_work":   request.form.get("preferred_work", ""),
-        }
-
-        # ── Parse resume ──────────────────────────────────
-        parsed = parse_resume(resume_text)
-
-        if qa.get("education_branch"):
-            parsed["education_branch"] = qa["education_branch"]
-        parsed["has_internship"] = qa["has_internship"]
-
-        # ── Build features & run model ────────────────────
+
+def run_analysis(pdf_bytes: bytes, form: dict) -> tuple:
+    """PDF extraction, parsing and inference; returns (status_code, body)"""
+    try:
+        with pdf_slot(), stage("pdf_extract"):
+            resume_text = extract_pdf_text_cached(pdf_bytes)["text"]
+    except Overloaded:
+        raise
+    except Exception:
+        return 422, {"error": "Could not read PDF. Make sure it's a valid PDF file."}
+
+    if not resume_text.strip():
+        return 422, {"error": "PDF appears to be empty or image-based. Please use a text-based PDF."}
+
+    # ── Get Q&A fields ────────────────────────────────
+    qa = {
+        "interests":        form.get("interests", ""),
+        "known_skills":     form.get("known_skills", ""),
+        "career_goal":      form.get("career_goal", ""),
+        "projects_done":    form.get("projects_done", ""),
+        "education_branch": form.get("education_branch", ""),
+        "year_of_study":    form.get("year_of_study", ""),
+        "has_internship":   form.get("has_internship", "false") == "true",
+        "self_weakness":    form.get("self_weakness", ""),
+        "preferred_work":   form.get("preferred_work", ""),
+    }
+
+    # ── Parse resume ──────────────────────────────────
+    with stage("parse_resume"):
+        parsed = parse_resume_cached(resume_text)
+
+    if qa.get("education_branch"):
+        parsed["education_branch"] = qa["education_branch"]
+    parsed["has_internship"] = qa["has_internship"]
+
+    # ── Build features & run model ────────────────────
+    with stage("build_features"):
         feature_text   = build_feature_text(parsed, qa)
         student_skills = merge_skills(parsed["skills"], qa.get("known_skills", ""))
-        guidance       = get_guidance(feature_text, student_skills)
-
-        return jsonify({
-            "status": "success",
-            "student_profile": {
-                "skills_detected":  student_skills,
-                "education_branch": parsed["education_branch"],
-                "education_degree": parsed["education_degree"],
-                "cgpa":             parsed["cgpa"],
-                "has_internship":   parsed["has_internship"],
-                "projects_found":   parsed["projects"]
-            },
-            "guidance": guidance
-        })
+    with inference_slot():
+        guidance = get_guidance(feature_text, student_skills)
+
+    return 200, {
+        "status": "success",
+        "student_profile": {
+            "skills_detected":  student_skills,
+            "education_branch": parsed["education_branch"],
+            "education_degree": parsed["education_degree"],
+            "cgpa":             parsed["cgpa"],
+            "has_internship":   parsed["has_internship"],
+            "projects_found":   parsed["projects"]
+        },
+        "guidance": guidance
+    }
+
+
+@profile_request("analyze_job", requested=lambda payload: payload.get("profile"))
+def _analysis_job(payload: dict) -> tuple:
+    try:
+        return run_analysis(payload["pdf_bytes"], payload["form"])
+    except ModelUnavailableError as me:
+        return 503, {"error": "Model not available", "detail": str(me)}
+    except Overloaded as oe:
+        return 503, {"error": "Server is busy, try again shortly", "detail": str(oe), "retry_after": oe.retry_after}
 
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({"error": "Internal server error", "detail": str(e)}), 500
\ No newline at end of file
+
+analysis_jobs = JobRunner(_analysis_job)
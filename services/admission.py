@@ -0,0 +1,177 @@
+"""
+Admission Control
+Concurrency budgets for the CPU-heavy parts of a request, so a spike
+queues briefly and is then shed with fast 503s instead of tying up every
+server thread (and starving /health):
+- requests: heavy requests a process takes on at once; past it they are
+  rejected immediately (gunicorn.conf.py keeps one thread free for /health)
+- pdf / inference: slots for PDF extraction and model prediction, each
+  with a bounded wait queue
+- Deadline-aware shedding: a request whose expected wait (queue length ×
+  average slot hold time) would run past its deadline is rejected up
+  front rather than after waiting
+- Callers without a deadline (background jobs, batch item preparation
+  threads) wait for a slot and are never shed
+- The slots are taken by the routes around the work they cover; the
+  services they call don't know about admission
+- Slots in use, queue depth and rejections are exported through
+  services/metrics
+"""
+
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from services import metrics
+
+ADMISSION_MAX_REQUESTS    = int(os.environ.get("ADMISSION_MAX_REQUESTS", 0))
+ADMISSION_PDF_SLOTS       = int(os.environ.get("ADMISSION_PDF_SLOTS", 2))
+ADMISSION_INFERENCE_SLOTS = int(os.environ.get("ADMISSION_INFERENCE_SLOTS", 2))
+ADMISSION_QUEUE_SIZE      = int(os.environ.get("ADMISSION_QUEUE_SIZE", 8))
+ADMISSION_MAX_WAIT        = float(os.environ.get("ADMISSION_MAX_WAIT", 5))
+
+# Weight of the newest hold time in the running average
+_HOLD_SMOOTHING = 0.2
+
+# Monotonic deadline of the request being handled in this thread, if any
+_deadline = contextvars.ContextVar("admission_deadline", default=None)
+
+
+class Overloaded(RuntimeError):
+    """A budget is exhausted; answer 503 with Retry-After: retry_after seconds"""
+
+    def __init__(self, budget: str, reason: str, retry_after: int):
+        super().__init__(f"Server is busy ({budget}: {reason})")
+        self.budget = budget
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Counting semaphore with a bounded wait queue and deadline-aware shedding"""
+
+    def __init__(self, name: str, slots: int, queue_size: int = ADMISSION_QUEUE_SIZE):
+        self.name = name
+        self.slots = slots
+        self.queue_size = queue_size
+        self.in_use = 0
+        self.waiting = 0
+        self.avg_hold = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, deadline: float = None):
+        """
+        Hold one slot for the enclosed block (no-op when slots is 0).
+        Waits until deadline, by default the current request's.
+        """
+        if self.slots <= 0:
+            yield
+            return
+        self.acquire(_deadline.get() if deadline is None else deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def acquire(self, deadline: float = None) -> None:
+        """Take a slot, waiting until deadline (None = as long as it takes)"""
+        with self._cond:
+            if self.in_use < self.slots and not self.waiting:
+                self._take()
+                return
+            if deadline is not None:
+                if self.waiting >= self.queue_size:
+                    self._reject("queue_full")
+                if time.monotonic() + self.expected_wait() > deadline:
+                    self._reject("deadline")
+
+            self.waiting += 1
+            metrics.admission_queued.inc(self.name)
+            try:
+                while self.in_use >= self.slots:
+                    timeout = None if deadline is None else deadline - time.monotonic()
+                    if timeout is not None and timeout <= 0:
+                        self._reject("timeout")
+                    self._cond.wait(timeout)
+            finally:
+                self.waiting -= 1
+                metrics.admission_queued.dec(self.name)
+            self._take()
+
+    def release(self, held: float) -> None:
+        with self._cond:
+            self.in_use -= 1
+            self.avg_hold += _HOLD_SMOOTHING * (held - self.avg_hold)
+            metrics.admission_in_use.dec(self.name)
+            self._cond.notify()
+
+    def expected_wait(self) -> float:
+        """Seconds a new arrival would wait behind the current queue"""
+        return (self.waiting + 1) / self.slots * self.avg_hold
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "queue_size": self.queue_size,
+                "avg_hold_ms": round(self.avg_hold * 1000, 1),
+            }
+
+    def _take(self) -> None:
+        self.in_use += 1
+        metrics.admission_in_use.inc(self.name)
+
+    def _reject(self, reason: str):
+        metrics.admission_rejected.inc(self.name, reason)
+        raise Overloaded(self.name, reason, max(1, math.ceil(self.expected_wait())))
+
+
+requests_limiter  = Limiter("requests", ADMISSION_MAX_REQUESTS, queue_size=0)
+pdf_limiter       = Limiter("pdf", ADMISSION_PDF_SLOTS)
+inference_limiter = Limiter("inference", ADMISSION_INFERENCE_SLOTS)
+
+
+@contextmanager
+def admitted(max_wait: float = ADMISSION_MAX_WAIT):
+    """
+    Admit one heavy request: take a requests slot (or raise Overloaded at
+    once) and give the pdf / inference slots it asks for a shared deadline
+    of max_wait seconds of queueing.
+    """
+    # No queue for whole requests: over the limit means rejected now
+    with requests_limiter.slot(deadline=time.monotonic()), queue_deadline(max_wait):
+        yield
+
+
+def request_slot():
+    """Just the requests slot of admitted(), for a response held open past the view"""
+    return requests_limiter.slot(deadline=time.monotonic())
+
+
+@contextmanager
+def queue_deadline(max_wait: float = ADMISSION_MAX_WAIT):
+    """Give the pdf / inference slots taken in the enclosed block max_wait seconds of queueing"""
+    token = _deadline.set(time.monotonic() + max_wait)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def pdf_slot():
+    return pdf_limiter.slot()
+
+
+def inference_slot():
+    return inference_limiter.slot()
+
+
+def admission_stats() -> dict:
+    return {limiter.name: limiter.stats() for limiter in (requests_limiter, pdf_limiter, inference_limiter)}
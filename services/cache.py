@@ -0,0 +1,191 @@
+"""
+Cache Service
+Small bounded LRU cache used by the resume / PDF / prediction layers:
+- In-memory LRU with a fixed number of entries
+- Optional time-to-live per entry
+- Optional on-disk tier (one JSON file per key) shared by all workers,
+  pruned to disk_maxsize files (oldest written first) and the TTL at
+  most once a minute
+- Hit / miss / eviction / expiry counters
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds between disk tier prunes; also how old an orphaned temp file must be to go
+DISK_PRUNE_INTERVAL = 60
+
+
+class LRUCache:
+    """Thread-safe LRU keyed by hex digests, with optional TTL and disk tier"""
+
+    def __init__(self, name: str, maxsize: int = 256, disk_dir: str = None, ttl: float = None,
+                 disk_maxsize: int = 10000):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self.disk_maxsize = disk_maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_evictions = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key: str):
+        """Return the cached value or None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._disk_set(key, value)
+
+    def clear(self) -> int:
+        """Drop every entry, in memory and on disk; returns how many were dropped"""
+        with self._lock:
+            dropped = len(self._data)
+            self._data.clear()
+        for name in self._disk_files():
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                dropped += 1
+            except OSError:
+                pass
+        return dropped
+
+    def prune_disk(self) -> int:
+        """
+        Delete expired disk entries, then the oldest written ones beyond
+        disk_maxsize, plus temp files orphaned by a crashed write.
+        Returns how many entries were deleted.
+        """
+        now = time.time()
+        entries = []
+        for name in self._disk_files(suffix=""):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+                if name.endswith(".tmp"):
+                    if mtime + DISK_PRUNE_INTERVAL < now:
+                        os.remove(path)
+                    continue
+            except OSError:
+                continue
+            entries.append((mtime, path))
+
+        entries.sort()
+        expired = sum(1 for mtime, _ in entries if self.ttl and mtime + self.ttl < now)
+        excess = max(expired, len(entries) - self.disk_maxsize)
+        removed = 0
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self.disk_evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_dir": self.disk_dir,
+                "disk_maxsize": self.disk_maxsize if self.disk_dir else None,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    # ── internals ────────────────────────────────────────────
+    def _store(self, key: str, value) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".json")
+
+    def _disk_files(self, suffix: str = ".json") -> list:
+        if not self.disk_dir:
+            return []
+        try:
+            return [name for name in os.listdir(self.disk_dir) if name.endswith(suffix)]
+        except OSError:
+            return []
+
+    def _disk_get(self, key: str):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_set(self, key: str, value) -> None:
+        if not self.disk_dir:
+            return
+        try:
+            # Write then rename so other workers never read a half-written file
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self._disk_path(key))
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            pass
+
+        now = time.monotonic()
+        if now - self._last_prune >= DISK_PRUNE_INTERVAL:
+            self._last_prune = now
+            self.prune_disk()
@@ -1,7 +1,7 @@
 """
 Guidance Engine
 Loads trained model + skill taxonomy and produces full career guidance:
-- Top 3 career path predictions with confidence %
+- Top-k career path predictions with confidence % (3 by default, or all)
 - Skills the student already has (good skills)
 - Skill gaps (required skills they're missing)
 - Good-to-have skills for their top career
@@ -9,105 +9,623 @@ Loads trained model + skill taxonomy and produces full career guidance:
 - Recommended courses per gap
 """
 
+import copy
+import hashlib
 import pickle
 import json
 import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+from services.skill_taxonomy import SkillTaxonomy
+from services.native_scorer import NativeScorer
+from services.cache import LRUCache
+from services.metrics import model_reloads, stage
 
 # ─────────────────────────────────────────────
-# Load model and data files once at startup
+# Model and data files are loaded lazily (first use or warmup()),
+# so importing this module — for tests, CLIs, the health check — is cheap
+# and a missing model file doesn't break the import.
 # ─────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-career_model = pickle.load(open(os.path.join(BASE_DIR, "ml/career_classifier.pkl"), "rb"))
-skill_data   = json.load(open(os.path.join(BASE_DIR, "ml/skill_data.json")))
-course_map   = json.load(open(os.path.join(BASE_DIR, "ml/course_map.json")))
+# auto = native scorer artifact if present, else the sklearn pickle
+CAREER_SCORER = os.environ.get("CAREER_SCORER", "auto")
+
+WARMUP_FEATURE_TEXT = "python sql git data structures internship"
+
+# Seconds between checks of ml/ for replaced artifacts (0 disables hot reload)
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", 30))
+# Written last by every publisher; names the model files that belong together
+RELEASE_FILE = "release.json"
+ARTIFACT_FILES = (
+    RELEASE_FILE, "career_scorer/config.json", "career_classifier.pkl", "skill_data.json", "course_map.json"
+)
+
+# Careers ranked per response unless the caller asks for a different top_k
+DEFAULT_TOP_K = 3
+
+# Prediction cache: 0 entries disables it
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 2048))
+PREDICTION_CACHE_TTL  = float(os.environ.get("PREDICTION_CACHE_TTL", 3600))
+
+
+class ModelUnavailableError(RuntimeError):
+    """The model / taxonomy files could not be loaded"""
+
+
+class ModelArtifacts:
+    """Everything a prediction needs, loaded together and never mutated"""
+
+    __slots__ = ("career_model", "skill_data", "course_map", "taxonomy", "version")
+
+    def __init__(self, career_model, skill_data: dict, course_map: dict, version: str):
+        self.version = version
+        self.career_model = career_model
+        self.skill_data = skill_data
+        self.course_map = course_map
+        self.taxonomy = SkillTaxonomy(skill_data, course_map)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_artifacts(base_dir: str = BASE_DIR) -> ModelArtifacts:
+    """
+    Read the classifier and taxonomy files from disk.
+
+    The classifier is the memory-mapped NumPy scorer exported by
+    ml/train.py when it exists (CAREER_SCORER=auto), otherwise the pickled
+    sklearn pipeline; both expose predict_proba / classes_. The version is
+    a content hash of the model and taxonomy, so it changes whenever either
+    does (the scorer artifact records its own digest at export time).
+
+    When ml/release.json exists, the model file served must be the one it
+    names: a publish caught halfway (new pickle, old scorer, or the
+    reverse) is rejected instead of served, and a reload retries once the
+    publisher has written the marker.
+    """
+    native_path = os.path.join(base_dir, "ml/career_scorer")
+    use_native = CAREER_SCORER == "native" or (
+        CAREER_SCORER == "auto" and os.path.exists(os.path.join(native_path, "config.json"))
+    )
+    release = _read_release(base_dir)
+    skill_bytes = _read_bytes(os.path.join(base_dir, "ml/skill_data.json"))
+    course_bytes = _read_bytes(os.path.join(base_dir, "ml/course_map.json"))
+
+    if use_native:
+        career_model = NativeScorer.load(native_path)
+        model_digest = bytes.fromhex(career_model.digest)
+        _check_release(release, "career_scorer", career_model.digest)
+    else:
+        model_bytes = _read_bytes(os.path.join(base_dir, "ml/career_classifier.pkl"))
+        model_digest = hashlib.sha256(model_bytes).digest()
+        _check_release(release, "career_classifier.pkl", model_digest.hex())
+        career_model = pickle.loads(model_bytes)
+
+    digest = hashlib.sha256(model_digest)
+    for blob in (skill_bytes, course_bytes):
+        digest.update(hashlib.sha256(blob).digest())
+
+    return ModelArtifacts(
+        career_model, json.loads(skill_bytes), json.loads(course_bytes), digest.hexdigest()[:12]
+    )
+
+
+def _read_release(base_dir: str):
+    """The release marker, or None when the model files are unmarked"""
+    try:
+        with open(os.path.join(base_dir, "ml", RELEASE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _check_release(release, name: str, digest: str) -> None:
+    if release is not None and release.get(name) != digest:
+        raise ValueError(
+            f"ml/{name} does not match ml/{RELEASE_FILE} (release {release.get('release')}); "
+            "a publish is in progress or was interrupted"
+        )
+
+
+def write_release(base_dir: str = BASE_DIR, **info) -> dict:
+    """
+    Mark the model files now in base_dir/ml as one release. Publishers
+    call this after writing both the pickle and the scorer artifact, so
+    servers only ever load the pair together. The digest of
+    model_metadata.json and extra info (source, test accuracy, ...) are
+    recorded alongside.
+    """
+    ml_dir = os.path.join(base_dir, "ml")
+    release = {}
+    pickle_path = os.path.join(ml_dir, "career_classifier.pkl")
+    if os.path.exists(pickle_path):
+        release["career_classifier.pkl"] = hashlib.sha256(_read_bytes(pickle_path)).hexdigest()
+    scorer_config = os.path.join(ml_dir, "career_scorer", "config.json")
+    if os.path.exists(scorer_config):
+        with open(scorer_config, "r", encoding="utf-8") as f:
+            release["career_scorer"] = json.load(f)["digest"]
+    if not release:
+        raise ValueError(f"No model files to release in {ml_dir}")
+    combined = "\0".join(release.get(name, "") for name in ("career_classifier.pkl", "career_scorer"))
+    metadata_path = os.path.join(ml_dir, "model_metadata.json")
+    if os.path.exists(metadata_path):
+        release["model_metadata.json"] = hashlib.sha256(_read_bytes(metadata_path)).hexdigest()
+    release = {
+        "release": hashlib.sha256(combined.encode("utf-8")).hexdigest()[:12],
+        "published_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        **info,
+        **release,
+    }
+
+    # Temp file + rename: the marker flips from one release to the next in one step
+    fd, tmp_path = tempfile.mkstemp(dir=ml_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(release, f, indent=2)
+        os.replace(tmp_path, os.path.join(ml_dir, RELEASE_FILE))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return release
+
+
+def _artifact_signature(base_dir: str = BASE_DIR) -> tuple:
+    """(name, mtime, size) of every artifact file; changes when any is replaced"""
+    signature = []
+    for name in ARTIFACT_FILES:
+        try:
+            stat = os.stat(os.path.join(base_dir, "ml", name))
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((name, None, None))
+    return tuple(signature)
+
+
+def _validate(artifacts: ModelArtifacts) -> None:
+    """Smoke-test freshly loaded artifacts before they may serve traffic"""
+    labels = [str(label) for label in artifacts.career_model.classes_]
+    missing = [label for label in labels if label not in artifacts.skill_data]
+    if missing:
+        raise ValueError(f"Model predicts careers missing from skill_data.json: {missing}")
+    guidance = _predict(artifacts, [WARMUP_FEATURE_TEXT], [["python"]])[0]
+    if not guidance["top_career_recommendations"]:
+        raise ValueError("Smoke prediction returned no recommendations")
+
+
+class ModelHolder:
+    """
+    Thread-safe, lazily initialized, versioned holder for the loaded artifacts.
+
+    Readers call get() once per request and keep that reference, so a
+    reload that swaps in a new version never changes the artifacts under
+    a request that is already running.
+
+    loader(base_dir) reads the artifacts from base_dir/ml. The first load,
+    warmup and reload all run under one lock, so a slow first load can
+    never overwrite a newer reload, and the dummy prediction runs once.
+    Nothing watches the files until a server entry point calls
+    start_watcher(), so tests and CLIs that import the engine never start
+    a polling thread.
+    """
+
+    def __init__(self, loader=load_artifacts, base_dir: str = BASE_DIR):
+        self._loader = loader
+        self.base_dir = base_dir
+        self._artifacts = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._warm = False
+        self._warming = False
+        self._signature = None
+        self._watcher_pid = None
+        self.last_error = None
+        self.last_reload = None
+
+    def get(self) -> ModelArtifacts:
+        """Current artifacts, loading them on first call"""
+        artifacts = self._artifacts
+        if artifacts is not None:
+            return artifacts
+        with self._load_lock:
+            if self._artifacts is None:
+                signature = _artifact_signature(self.base_dir)
+                try:
+                    self._artifacts = self._loader(self.base_dir)
+                    self._signature = signature
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise ModelUnavailableError(f"Career model is not available: {self.last_error}") from e
+            return self._artifacts
+
+    def warmup(self) -> None:
+        """Load everything via get() and run one dummy prediction to prime lazy caches"""
+        if self._warm:
+            return
+        self.get()
+        with self._load_lock:
+            if not self._warm:
+                _predict(self._artifacts, [WARMUP_FEATURE_TEXT], [["python"]])
+                self._warm = True
+
+    def preload(self) -> None:
+        """
+        Load and warm up in a pre-fork parent (the gunicorn master), so
+        workers inherit the artifacts instead of each loading a copy.
+        Starts no watcher thread: threads don't survive fork, so every
+        worker starts its own after forking.
+        """
+        self.warmup()
+
+    def after_fork(self) -> None:
+        """Reset per-process state in a freshly forked worker"""
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._warming = False
+        self._watcher_pid = None
+
+    def warmup_async(self) -> None:
+        """Start warmup() in the background unless it is done or running"""
+        with self._lock:
+            if self._warm or self._warming:
+                return
+            self._warming = True
+
+        def run():
+            try:
+                self.warmup()
+            except ModelUnavailableError:
+                pass
+            finally:
+                self._warming = False
+
+        threading.Thread(target=run, name="model-warmup", daemon=True).start()
+
+    def reload(self) -> dict:
+        """
+        Load the artifacts from disk again, validate them with a smoke
+        prediction and swap them in. On any failure the current version
+        keeps serving. Returns a summary of what happened, and counts it in
+        guidance_model_reloads_total.
+        """
+        with self._load_lock:
+            summary = self._reload()
+        model_reloads.inc(summary["status"])
+        return summary
+
+    def _reload(self) -> dict:
+        """reload() with _load_lock held"""
+        previous = self._artifacts
+        signature = _artifact_signature(self.base_dir)
+        try:
+            candidate = self._loader(self.base_dir)
+            _validate(candidate)
+        except Exception as e:
+            self.last_reload = {
+                "status": "failed",
+                "error": f"{type(e).__name__}: {e}",
+                "version": previous.version if previous else None,
+            }
+            return self.last_reload
+
+        self._signature = signature
+        if previous is not None and candidate.version == previous.version:
+            self.last_reload = {"status": "unchanged", "version": previous.version}
+            return self.last_reload
+
+        # A single attribute store: readers see the old or the new version, never a mix
+        self._artifacts = candidate
+        # Cache keys carry the version, so old entries could never be
+        # served again; dropping them just frees their slots
+        prediction_cache.clear()
+        self._warm = True
+        self.last_error = None
+        self.last_reload = {
+            "status": "reloaded",
+            "version": candidate.version,
+            "previous_version": previous.version if previous else None,
+        }
+        return self.last_reload
+
+    def start_watcher(self, interval: float = None) -> bool:
+        """
+        Poll ml/ every interval seconds (default MODEL_WATCH_INTERVAL) and
+        reload once replaced files have stopped changing. Starts at most
+        one thread per process; returns whether one is running.
+        """
+        interval = MODEL_WATCH_INTERVAL if interval is None else interval
+        if interval <= 0:
+            return False
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return True
+            self._watcher_pid = os.getpid()
+
+        def watch():
+            pending = None
+            while True:
+                time.sleep(interval)
+                signature = _artifact_signature(self.base_dir)
+                if signature == self._signature:
+                    pending = None
+                elif signature == pending:
+                    # Unchanged for a full interval: the files are done being written
+                    self.reload()
+                    pending = None
+                else:
+                    pending = signature
+
+        threading.Thread(target=watch, name="model-watcher", daemon=True).start()
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return self._warm
+
+    def status(self) -> dict:
+        artifacts = self._artifacts
+        return {
+            "ready": self._warm,
+            "loaded": artifacts is not None,
+            "warming": self._warming,
+            "model_version": artifacts.version if artifacts else None,
+            "error": self.last_error,
+            "last_reload": self.last_reload,
+        }
+
+
+_holder = ModelHolder()
+
+
+def warmup() -> None:
+    """Load the model + taxonomy and prime them with a dummy prediction"""
+    _holder.warmup()
+
+
+def warmup_async() -> None:
+    _holder.warmup_async()
+
+
+def preload() -> None:
+    """Load + warm up in a pre-fork parent (see ModelHolder.preload)"""
+    _holder.preload()
+
+
+def after_fork() -> None:
+    _holder.after_fork()
+
+
+def watch_artifacts() -> bool:
+    """Start hot-reloading ml/ in this process; called by the server entry points"""
+    return _holder.start_watcher()
+
+
+def reload_artifacts() -> dict:
+    """Hot-reload the model + taxonomy in this process (see ModelHolder.reload)"""
+    return _holder.reload()
+
+
+def engine_status() -> dict:
+    return _holder.status()
 
 
-def get_guidance(feature_text: str, student_skills: list) -> dict:
+def get_guidance(feature_text: str, student_skills: list, top_k=DEFAULT_TOP_K) -> dict:
     """
     Core function: predict career paths and generate full guidance.
 
     Args:
         feature_text   : combined text string from feature_builder
         student_skills : merged list of student's known skills (lowercased)
+        top_k          : careers to rank, 1 .. number of labels; None or "all"
+                         returns the full ranking with gaps for every career
 
     Returns:
         Full guidance dict ready to be returned as API response
     """
+    return get_guidance_many([feature_text], [student_skills], top_k)[0]
+
+
+def get_guidance_many(feature_texts: list, skills_lists: list, top_k=DEFAULT_TOP_K) -> list:
+    """
+    Batched get_guidance: one vectorized predict_proba call for all rows,
+    numpy top-k selection, then per-row skill gap / course assembly.
+
+    Args:
+        feature_texts : feature strings from feature_builder, one per student
+        skills_lists  : merged skill lists, aligned with feature_texts
+        top_k         : careers to rank per row (see get_guidance)
+
+    Returns:
+        List of guidance dicts, identical to calling get_guidance per row
+    """
+    if len(feature_texts) != len(skills_lists):
+        raise ValueError("feature_texts and skills_lists must be the same length")
+    if not feature_texts:
+        return []
+
+    artifacts = _holder.get()
+    top_k = resolve_top_k(top_k, len(artifacts.career_model.classes_))
+    if not PREDICTION_CACHE_SIZE:
+        return _predict(artifacts, feature_texts, skills_lists, top_k)
+
+    keys = [
+        _prediction_key(artifacts.version, text, skills, top_k)
+        for text, skills in zip(feature_texts, skills_lists)
+    ]
+    results = [prediction_cache.get(key) for key in keys]
+    misses = [row for row, cached in enumerate(results) if cached is None]
+    if misses:
+        fresh = _predict(
+            artifacts, [feature_texts[row] for row in misses], [skills_lists[row] for row in misses], top_k
+        )
+        for row, guidance in zip(misses, fresh):
+            prediction_cache.set(keys[row], guidance)
+            results[row] = guidance
+
+    # Cached dicts are shared; hand every caller its own copy
+    return [copy.deepcopy(guidance) for guidance in results]
+
+
+def validate_top_k(top_k):
+    """
+    Check a requested top_k without needing the model: returns it as an
+    int, or None for every label (None / "all"). Raises ValueError if it
+    is neither, so requests can be rejected before any expensive work.
+    """
+    if top_k is None or top_k == "all":
+        return None
+    if isinstance(top_k, str) and top_k.strip().isdigit():
+        top_k = int(top_k)
+    if isinstance(top_k, bool) or not isinstance(top_k, int):
+        raise ValueError("top_k must be a positive integer or 'all'")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    return top_k
 
-    # ── Step 1: Predict top 3 career paths ──────────────────
-    proba = career_model.predict_proba([feature_text])[0]
+
+def resolve_top_k(top_k, n_labels: int) -> int:
+    """validate_top_k, with every label for None / "all" and integers clamped to the label count"""
+    top_k = validate_top_k(top_k)
+    return n_labels if top_k is None else min(top_k, n_labels)
+
+
+# ─────────────────────────────────────────────
+# Prediction cache
+# ─────────────────────────────────────────────
+prediction_cache = LRUCache("prediction", maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+
+# Up to this many labels a full row sort beats np.partition at any batch size
+_SORT_MAX_LABELS = 64
+
+
+def _prediction_key(version: str, feature_text: str, student_skills: list, top_k: int) -> str:
+    """
+    Canonical key for one prediction. The vectorizer lowercases and only
+    sees word tokens, and skills are compared lowercased as a set, so case,
+    whitespace and skill order can't change the result and are folded away.
+    The artifacts version is part of the key: a request still holding the
+    previous version after a reload can neither read nor be read by the
+    new version's entries.
+    """
+    canonical_text = " ".join(feature_text.lower().split())
+    canonical_skills = "\n".join(sorted({s.lower() for s in student_skills}))
+    payload = "\0".join((version, str(top_k), canonical_text, canonical_skills))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def prediction_cache_stats() -> dict:
+    return {"model_version": _holder.status()["model_version"], **prediction_cache.stats()}
+
+
+def flush_prediction_cache() -> int:
+    """Empty this process's prediction cache; returns how many entries were dropped"""
+    return prediction_cache.clear()
+
+
+def _predict(artifacts: ModelArtifacts, feature_texts: list, skills_lists: list,
+             top_k: int = DEFAULT_TOP_K) -> list:
+    career_model = artifacts.career_model
+    with stage("predict_proba"):
+        proba = career_model.predict_proba(list(feature_texts))
     career_labels = career_model.classes_
 
-    top3_indices = proba.argsort()[-3:][::-1]
-    top3_careers = [
+    with stage("assemble_guidance"):
+        top_indices = _top_k_indices(proba, top_k)
+        guidance = [
+            _build_guidance(artifacts.taxonomy, proba[row], top_indices[row], career_labels, skills_lists[row])
+            for row in range(len(feature_texts))
+        ]
+    for entry in guidance:
+        entry["model_version"] = artifacts.version
+    return guidance
+
+
+def _top_k_indices(proba: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row-wise indices of the k largest probabilities, highest first.
+
+    Ties are broken explicitly stably, towards the higher label index: the
+    result is always np.argsort(proba, kind="stable")[:, ::-1][:, :k]. The
+    original proba.argsort() used NumPy's default kind, whose tie order
+    depends on the sort kernel it dispatches to; for untied rows both agree.
+
+    One row, or a label count up to _SORT_MAX_LABELS (ours is 15), is
+    sorted outright, which costs about as much as the original per-row
+    argsort. Partial selection (np.partition) only pays off for many rows
+    over many labels.
+    """
+    n_rows, n_labels = proba.shape
+    if n_rows == 1 or n_labels <= _SORT_MAX_LABELS or k >= n_labels:
+        # The slice stops at the first column, so k past n_labels needs no clamp
+        return proba.argsort(kind="stable")[:, :-k - 1:-1]
+
+    # k-th largest value per row, then everything strictly above it
+    kth = np.partition(proba, n_labels - k, axis=1)[:, n_labels - k][:, None]
+    above = proba > kth
+    # Fill the remaining slots with the highest-index ties at the k-th value
+    ties = proba == kth
+    slots_left = (k - above.sum(axis=1))[:, None]
+    ties_from_right = np.cumsum(ties[:, ::-1], axis=1)[:, ::-1]
+    selected = above | (ties & (ties_from_right <= slots_left))
+
+    # Exactly k per row; nonzero walks rows in order with ascending
+    # indices, reversed so a stable sort keeps equal values high index first
+    chosen = np.nonzero(selected)[1].reshape(n_rows, k)[:, ::-1]
+    order = np.argsort(-np.take_along_axis(proba, chosen, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(chosen, order, axis=1)
+
+
+def _build_guidance(taxonomy: SkillTaxonomy, proba, top_indices, career_labels,
+                    student_skills: list) -> dict:
+    """Skill gap, course and summary assembly for one student"""
+    top_careers = [
         {
             "career": career_labels[i],
             "confidence_percent": round(proba[i] * 100, 1)
         }
-        for i in top3_indices
+        for i in top_indices
     ]
 
-    primary_career = top3_careers[0]["career"]
+    primary_career = top_careers[0]["career"]
 
     # ── Step 2: Skill analysis for primary career ────────────
-    career_info = skill_data.get(primary_career, {})
-    required_skills  = set(career_info.get("required_skills", []))
-    good_to_have     = career_info.get("good_to_have", [])
-    improvement_areas = career_info.get("improvement_areas", [])
-
-    student_skill_set = set(s.lower() for s in student_skills)
-
-    # Skills the student already has that are relevant
-    skills_you_have = sorted(list(required_skills & student_skill_set))
-
-    # Required skills they are missing = gaps
-    skill_gaps = sorted(list(required_skills - student_skill_set))
-
-    # Good to have skills they don't have yet
-    missing_good_to_have = [s for s in good_to_have if s.lower() not in student_skill_set]
+    student_mask = taxonomy.student_mask(student_skills)
+    primary = taxonomy.analyze(primary_career, student_mask)
+    skills_you_have = primary["skills_you_have"]
+    skill_gaps = primary["skill_gaps"]
+    missing_good_to_have = primary["missing_good_to_have"]
+    improvement_areas = taxonomy.improvement_areas.get(primary_career, [])
 
     # ── Step 3: Map skill gaps to courses ───────────────────
-    recommended_courses = []
-    for gap in skill_gaps:
-        if gap in course_map:
-            recommended_courses.append({
-                "skill": gap,
-                "course": course_map[gap]["course"],
-                "platform": course_map[gap]["platform"],
-                "url": course_map[gap]["url"]
-            })
+    recommended_courses = taxonomy.courses_for(primary["gap_mask"])
 
     # Also suggest 1-2 good-to-have courses
-    bonus_courses = []
-    for skill in missing_good_to_have[:2]:
-        if skill in course_map:
-            bonus_courses.append({
-                "skill": skill,
-                "course": course_map[skill]["course"],
-                "platform": course_map[skill]["platform"],
-                "url": course_map[skill]["url"]
-            })
-
-    # ── Step 4: Skill breakdown for second and third careers ─
+    bonus_courses = taxonomy.bonus_courses(missing_good_to_have[:2])
+
+    # ── Step 4: Skill breakdown for the other ranked careers ─
     alternative_career_skills = []
-    for career_entry in top3_careers[1:]:
+    for career_entry in top_careers[1:]:
         c_name = career_entry["career"]
-        c_info = skill_data.get(c_name, {})
-        c_required = set(c_info.get("required_skills", []))
+        c_analysis = taxonomy.analyze(c_name, student_mask)
         alternative_career_skills.append({
             "career": c_name,
             "confidence_percent": career_entry["confidence_percent"],
-            "skills_you_have": sorted(list(c_required & student_skill_set)),
-            "skill_gaps": sorted(list(c_required - student_skill_set))
+            "skills_you_have": c_analysis["skills_you_have"],
+            "skill_gaps": c_analysis["skill_gaps"]
         })
 
     # ── Step 5: Assemble full guidance response ──────────────
     return {
-        "top_career_recommendations": top3_careers,
+        "top_career_recommendations": top_careers,
         "primary_career": {
             "name": primary_career,
-            "confidence_percent": top3_careers[0]["confidence_percent"],
+            "confidence_percent": top_careers[0]["confidence_percent"],
             "skills_you_have": skills_you_have,
             "skill_gaps": skill_gaps,
             "good_to_have_skills": missing_good_to_have,
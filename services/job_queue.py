@@ -0,0 +1,255 @@
+"""
+Job Queue Service
+Background jobs for slow, PDF-heavy requests: the request enqueues and
+returns a job id, a bounded worker pool does the work, and the client
+polls for the result:
+- JobRunner: worker threads (started on first submit, after gunicorn
+  has forked) that run a handler per job and time each phase
+- LocalQueueBackend: in-process stand-in backend. Pending jobs live in
+  a bounded in-memory queue; job records are JSON files in a directory
+  shared by every worker on the host, so a poll can land on any worker.
+  Jobs queued or running in a worker that has exited are lost with it;
+  their records are marked failed (503, resubmit) instead of staying
+  queued forever
+- Other backends (e.g. a Redis queue) plug in through JOB_QUEUE_BACKEND
+  as "module:Class", implementing the same five methods
+"""
+
+import importlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+
+from services.metrics import pid_alive
+
+JOB_QUEUE_BACKEND = os.environ.get("JOB_QUEUE_BACKEND", "local")
+JOB_QUEUE_MAX     = int(os.environ.get("JOB_QUEUE_MAX", 100))
+JOB_WORKERS       = int(os.environ.get("JOB_WORKERS", 2))
+JOB_RESULT_TTL    = float(os.environ.get("JOB_RESULT_TTL", 600))
+JOB_STATE_DIR     = os.environ.get("JOB_STATE_DIR") or os.path.join(
+    tempfile.gettempdir(), "career_guidance_jobs"
+)
+
+
+class QueueFullError(RuntimeError):
+    """The backend is holding JOB_QUEUE_MAX pending jobs already"""
+
+
+# ─────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────
+
+class LocalQueueBackend:
+    """
+    Backend interface, implemented in-process:
+      enqueue(job_id, payload)  add a pending job or raise QueueFullError
+      dequeue(timeout)          (job_id, payload) or None
+      save(record)              store a job record (dict with an "id")
+      load(job_id)              the record, or None if unknown / expired
+      pending()                 number of jobs waiting
+
+    Records carry the worker_pid that queued them. One whose worker has
+    exited (found at startup or on load) is marked failed with code 503.
+    """
+
+    def __init__(self, maxsize: int = JOB_QUEUE_MAX, state_dir: str = JOB_STATE_DIR,
+                 ttl: float = JOB_RESULT_TTL):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.state_dir = state_dir
+        self.ttl = ttl
+        self._last_sweep = 0.0
+        os.makedirs(state_dir, exist_ok=True)
+        self._fail_orphans()
+
+    def enqueue(self, job_id: str, payload) -> None:
+        try:
+            self._queue.put_nowait((job_id, payload))
+        except queue.Full:
+            raise QueueFullError(f"Job queue is full ({self._queue.maxsize} pending)")
+
+    def dequeue(self, timeout: float):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def save(self, record: dict) -> None:
+        # The queue is in this process's memory: the record names its owner
+        self._write(dict(record, worker_pid=os.getpid()))
+        self._sweep()
+
+    def load(self, job_id: str):
+        path = self._path(job_id)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return self._fail_if_orphaned(record)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _write(self, record: dict) -> None:
+        # Write then rename so a concurrent poll never reads a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self._path(record["id"]))
+
+    def _fail_if_orphaned(self, record: dict) -> dict:
+        """Mark a queued / running job failed if the worker holding it has exited"""
+        if record.get("status") not in ("queued", "running") or pid_alive(record.get("worker_pid")):
+            return record
+        now = time.time()
+        record.update(
+            status="failed", code=503, finished_at=now, retry_after=0,
+            error="Job was lost when its server worker stopped, resubmit it",
+            detail=f"worker {record.get('worker_pid')} exited before the job finished",
+        )
+        self._write(record)
+        return record
+
+    def _fail_orphans(self) -> None:
+        """At startup: fail the unfinished jobs of workers that are gone"""
+        for name in os.listdir(self.state_dir):
+            job_id, ext = os.path.splitext(name)
+            if ext == ".json" and job_id.isalnum():
+                try:
+                    self.load(job_id)
+                except OSError:
+                    pass
+
+    def _path(self, job_id: str) -> str:
+        if not job_id.isalnum():
+            raise ValueError("Invalid job id")
+        return os.path.join(self.state_dir, job_id + ".json")
+
+    def _sweep(self) -> None:
+        """Delete expired records, at most once a minute"""
+        now = time.time()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        for name in os.listdir(self.state_dir):
+            path = os.path.join(self.state_dir, name)
+            try:
+                if os.path.getmtime(path) + self.ttl < now:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def make_backend(spec: str = JOB_QUEUE_BACKEND):
+    """Backend instance for "local" or a "module:Class" path"""
+    if spec == "local":
+        return LocalQueueBackend()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# ─────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────
+
+class JobRunner:
+    """
+    Runs handler(payload) for submitted jobs on a fixed number of threads.
+    The handler returns (status_code, body): 200 marks the job done, any
+    other code marks it failed with body["error"] (and body["retry_after"],
+    if the handler gave one).
+    """
+
+    def __init__(self, handler, backend=None, workers: int = JOB_WORKERS):
+        self.handler = handler
+        self.workers = workers
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._started_pid = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = make_backend()
+        return self._backend
+
+    def submit(self, payload) -> dict:
+        """Queue a job; returns its record. Raises QueueFullError when saturated."""
+        self._ensure_workers()
+        record = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "submitted_at": time.time(),
+        }
+        self.backend.save(record)
+        try:
+            self.backend.enqueue(record["id"], payload)
+        except QueueFullError:
+            self.backend.save(dict(record, status="rejected"))
+            raise
+        return record
+
+    def get(self, job_id: str):
+        """The job record, or None"""
+        try:
+            return self.backend.load(job_id)
+        except ValueError:
+            return None
+
+    def stats(self) -> dict:
+        return {"pending": self.backend.pending(), "workers": self.workers}
+
+    def _ensure_workers(self) -> None:
+        """Start the worker threads once per process (threads don't survive fork)"""
+        if self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            for n in range(self.workers):
+                threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True).start()
+
+    def _work(self) -> None:
+        while True:
+            item = self.backend.dequeue(timeout=1.0)
+            if item is None:
+                continue
+            try:
+                self._run(*item)
+            except Exception:
+                # e.g. the state directory is gone; keep the worker alive
+                traceback.print_exc()
+
+    def _run(self, job_id: str, payload) -> None:
+        backend = self.backend
+        record = backend.load(job_id) or {"id": job_id, "submitted_at": time.time()}
+        started = time.time()
+        record.update(status="running", started_at=started,
+                      queue_wait_ms=round((started - record["submitted_at"]) * 1000, 1))
+        backend.save(record)
+
+        try:
+            code, body = self.handler(payload)
+        except Exception as e:
+            traceback.print_exc()
+            code, body = 500, {"error": "Internal server error", "detail": str(e)}
+
+        finished = time.time()
+        record.update(finished_at=finished, processing_ms=round((finished - started) * 1000, 1), code=code)
+        if code == 200:
+            record.update(status="done", result=body)
+        else:
+            record.update(status="failed", error=body.get("error"), detail=body.get("detail"))
+            if "retry_after" in body:
+                record["retry_after"] = body["retry_after"]
+        backend.save(record)
@@ -0,0 +1,194 @@
+"""
+JSON Stream Service
+Decodes batch request bodies as they arrive, so a large upload is never
+held in memory whole:
+- iter_ndjson(stream): one object per non-blank line
+- iter_json_array(stream): the elements of one top-level JSON array,
+  each decoded with json's raw_decode once its text has arrived
+- Undecodable input becomes a MalformedItem in the output, so callers
+  can report it in place instead of failing the whole batch
+"""
+
+import codecs
+import json
+import re
+
+READ_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_JSON_NON_SPACE = re.compile(r"[^ \t\n\r]")
+_SCALAR_END     = re.compile(r"[ \t\n\r,\]]")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURE      = re.compile(r'[\[\]{}"]')
+
+
+class MalformedItem:
+    """Stands in for an input item that could not be decoded"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def iter_ndjson(stream):
+    """One decoded object per non-blank line; bad lines become MalformedItem"""
+    for raw_line in stream:
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield MalformedItem(f"Invalid JSON line: {e}")
+
+
+def iter_json_array(stream, read_size: int = READ_SIZE):
+    """
+    Elements of a top-level JSON array, decoded as the body arrives
+    instead of after loading it whole. The body must be exactly one
+    array: a missing, leading, doubled or trailing comma, a body that
+    ends before the closing "]" or data after it ends the batch with one
+    MalformedItem, since nothing after a syntax error can be located
+    reliably.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, eof = "", 0, False
+
+    def read() -> str:
+        nonlocal eof
+        if eof:
+            return ""
+        data = stream.read(read_size)
+        eof = not data
+        return utf8.decode(data, final=eof)
+
+    def next_char() -> str:
+        """Skip whitespace to the next character (pos points at it); '' at the end of the body"""
+        nonlocal buffer, pos
+        while True:
+            match = _JSON_NON_SPACE.search(buffer, pos)
+            if match:
+                pos = match.start()
+                return buffer[pos]
+            buffer, pos = read(), 0
+            if eof and not buffer:
+                return ""
+
+    def decode_element() -> tuple:
+        """(value, None) for the element at pos, consumed; (None, message) if it is invalid"""
+        nonlocal buffer, pos
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+            # A number at the buffer edge may continue in the next read
+            if end < len(buffer) or eof:
+                pos = end
+                return item, None
+        except ValueError:
+            pass
+        # Cut off by the read boundary (or invalid): find where it ends as
+        # the body arrives, then decode it once
+        scanner = _ValueScanner(buffer[pos])
+        end = scanner.feed(buffer, pos)
+        if end >= 0:
+            text, pos = buffer[pos:end], end
+        else:
+            pieces = [buffer[pos:]]
+            while True:
+                buffer, pos = read(), 0
+                if eof and not buffer:
+                    break
+                end = scanner.feed(buffer)
+                if end >= 0:
+                    pieces.append(buffer[:end])
+                    pos = end
+                    break
+                pieces.append(buffer)
+            text = "".join(pieces)
+        try:
+            item, used = _decoder.raw_decode(text)
+        except ValueError as e:
+            return None, f"Invalid JSON array: {e}"
+        if used != len(text):
+            return None, f"Invalid JSON array: unexpected {text[used:used + 20]!r} after an element"
+        return item, None
+
+    if next_char() != "[":
+        yield MalformedItem("Body must be a JSON array or NDJSON")
+        return
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            char = next_char()
+            if char == "":
+                yield MalformedItem("Invalid JSON array: body ended before the closing ']'")
+                return
+            if char in ",]":
+                yield MalformedItem(f"Invalid JSON array: expected a value, found {char!r}")
+                return
+            item, error = decode_element()
+            if error:
+                yield MalformedItem(error)
+                return
+            yield item
+            char = next_char()
+            pos += 1
+            if char == "]":
+                break
+            if char != ",":
+                yield MalformedItem("Invalid JSON array: body ended before the closing ']'" if char == ""
+                                     else f"Invalid JSON array: expected ',' or ']', found {char!r}")
+                return
+    if next_char() != "":
+        yield MalformedItem("Invalid JSON array: unexpected data after the closing ']'")
+
+
+class _ValueScanner:
+    """
+    Finds where one JSON value ends when its text arrives in pieces: each
+    piece is scanned once, carrying bracket depth and string state over,
+    so a large element is not re-parsed on every read.
+    """
+
+    def __init__(self, first_char: str):
+        self.scalar = first_char not in '[{"'
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str, i: int = 0) -> int:
+        """Index in text just past the value's end, or -1 if it continues past text"""
+        if self.scalar:
+            match = _SCALAR_END.search(text, i)
+            return match.start() if match else -1
+        while True:
+            if self.escaped:
+                if i >= len(text):
+                    return -1
+                i += 1
+                self.escaped = False
+            if self.in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if not match:
+                    return -1
+                i = match.end()
+                if match.group() == "\\":
+                    self.escaped = True
+                    continue
+                self.in_string = False
+                if self.depth == 0:
+                    return i
+                continue
+            match = _STRUCTURE.search(text, i)
+            if not match:
+                return -1
+            i = match.end()
+            char = match.group()
+            if char == '"':
+                self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i
@@ -0,0 +1,445 @@
+"""
+Metrics Service
+Lightweight latency / throughput instrumentation for the guidance pipeline:
+- Counter, Gauge and Histogram with fixed label names; recording is a
+  lock plus a bisect into precomputed buckets, cheap enough to leave on
+- stage(name): times one pipeline stage (pdf_extract, parse_resume,
+  build_features, predict_proba, assemble_guidance, ...)
+- profile_request(endpoint): runs a view or job handler under the
+  request profiler when it is sampled or asked for
+- request_started / request_finished: in-flight gauge, latency, status
+  codes and payload sizes per endpoint
+- Every process flushes a JSON snapshot of its values to METRICS_DIR
+  every METRICS_FLUSH_INTERVAL seconds, so whichever gunicorn worker
+  answers /metrics can add up all of them
+- render_prometheus(): Prometheus text exposition of the merged values.
+  Gauges only count live processes
+- mark_process_dead(pid): gunicorn's child_exit folds an exited worker's
+  counters and histograms into retired.json and deletes its file, so the
+  sums never go backwards and the directory doesn't grow with restarts
+- A process's first request clears METRICS_DIR when no other live process
+  has a file there, so a restarted python app.py / uvicorn doesn't count
+  the previous run's workers
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from services.profiler import profiler
+
+METRICS_ENABLED        = os.environ.get("METRICS_ENABLED", "1") != "0"
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+METRICS_DIR            = os.environ.get("METRICS_DIR") or os.path.join(
+    tempfile.gettempdir(), "career_guidance_metrics"
+)
+
+RETIRED_FILE = "retired.json"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS    = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+# ─────────────────────────────────────────────
+# Metric types
+# ─────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def snapshot(self) -> dict:
+        """label values joined by "\\0" → value, JSON-serialisable"""
+        with self._lock:
+            return {"\0".join(labels): self._copy(value) for labels, value in self._values.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Cumulative-on-render histogram: value is [count per bucket..., +Inf, sum]"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels) -> None:
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[slot] += 1
+            counts[-1] += value
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+
+_registry = []
+
+stage_seconds = Histogram(
+    "guidance_stage_seconds", "Time spent in one guidance pipeline stage", ("stage",)
+)
+request_seconds = Histogram(
+    "guidance_request_seconds", "Request latency until the response is fully sent", ("endpoint",)
+)
+requests_total = Counter(
+    "guidance_requests_total", "Requests answered, by status code", ("endpoint", "code")
+)
+requests_in_flight = Gauge(
+    "guidance_requests_in_flight", "Requests currently being processed", ("endpoint",)
+)
+payload_bytes = Histogram(
+    "guidance_payload_bytes", "Request and response body sizes", ("endpoint", "direction"), SIZE_BUCKETS
+)
+admission_in_use = Gauge(
+    "guidance_admission_in_use", "Admission slots held, by budget", ("budget",)
+)
+admission_queued = Gauge(
+    "guidance_admission_queued", "Requests waiting for an admission slot, by budget", ("budget",)
+)
+admission_rejected = Counter(
+    "guidance_admission_rejected_total", "Requests shed with 503, by budget and reason", ("budget", "reason")
+)
+model_reloads = Counter(
+    "guidance_model_reloads_total", "Artifact reloads, by outcome", ("status",)
+)
+
+
+@contextmanager
+def stage(name: str):
+    """Record the wall time of the enclosed block under stage=name"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, name)
+
+
+def profile_request(endpoint: str, requested=None, respond=None):
+    """
+    Run the wrapped call under the profiler when it is sampled
+    (PROFILE_SAMPLE_RATE) or requested(*args, **kwargs) is true. respond
+    turns the result into a response inside the profile (Flask's
+    make_response for views); a result with headers then names its dump
+    in X-Profile-Id. Calls that aren't profiled run exactly as before.
+    """
+    def decorator(func):
+        call = func if respond is None else lambda *args, **kwargs: respond(func(*args, **kwargs))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.sampled() and not (requested is not None and requested(*args, **kwargs)):
+                return func(*args, **kwargs)
+            result, name = profiler.run(endpoint, call, *args, **kwargs)
+            if name and hasattr(result, "headers"):
+                result.headers["X-Profile-Id"] = name
+            return result
+        return wrapper
+    return decorator
+
+
+def request_started(endpoint: str, body_bytes: int = None) -> float:
+    """Count a request in flight; returns the start time for request_finished"""
+    _ensure_flusher()
+    requests_in_flight.inc(endpoint)
+    if body_bytes is not None:
+        payload_bytes.observe(body_bytes, endpoint, "request")
+    return time.perf_counter()
+
+
+def request_finished(endpoint: str, started: float, code: int, body_bytes: int = None) -> None:
+    request_seconds.observe(time.perf_counter() - started, endpoint)
+    requests_total.inc(endpoint, str(code))
+    requests_in_flight.dec(endpoint)
+    if body_bytes is not None:
+        payload_bytes.observe(body_bytes, endpoint, "response")
+
+
+# ─────────────────────────────────────────────
+# Cross-worker aggregation
+# ─────────────────────────────────────────────
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def _ensure_flusher() -> None:
+    """
+    Start the snapshot thread once per serving process (threads don't
+    survive fork). Started from request_started, so the gunicorn master
+    never reports as a worker.
+    """
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        try:
+            _join_run(METRICS_DIR)
+        except OSError:
+            pass  # the flusher creates the directory and retries
+        threading.Thread(target=_flush_loop, name="metrics-flusher", daemon=True).start()
+
+
+def _snapshot_pids(state_dir: str) -> list:
+    if not os.path.isdir(state_dir):
+        return []
+    pids = []
+    for name in os.listdir(state_dir):
+        pid_text, ext = os.path.splitext(name)
+        if ext == ".json" and pid_text.isdigit():
+            pids.append(int(pid_text))
+    return pids
+
+
+def _join_run(state_dir: str) -> None:
+    """
+    First request in this process. If no other live process has a snapshot
+    in state_dir, the server that wrote it has stopped (python app.py and
+    uvicorn have no master to reset it), so start from an empty directory
+    instead of adding its dead workers' totals. Then flush straight away so
+    processes starting after this one see a live sibling and keep the files.
+    """
+    if not any(pid != os.getpid() and pid_alive(pid) for pid in _snapshot_pids(state_dir)):
+        _clear_dir(state_dir)
+    flush(state_dir)
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            pass  # e.g. the directory was removed; try again next round
+
+
+def snapshot() -> dict:
+    """This process's values for every metric"""
+    return {metric.name: metric.snapshot() for metric in _registry}
+
+
+def flush(state_dir: str = None) -> None:
+    """Write this process's snapshot to <state_dir>/<pid>.json"""
+    state_dir = state_dir or METRICS_DIR
+    os.makedirs(state_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f)
+    os.replace(tmp_path, os.path.join(state_dir, f"{os.getpid()}.json"))
+
+
+def reset(state_dir: str = None) -> None:
+    """Forget every recorded value, here and on disk (gunicorn master start)"""
+    state_dir = state_dir or METRICS_DIR
+    for metric in _registry:
+        metric.reset()
+    _clear_dir(state_dir)
+
+
+def _clear_dir(state_dir: str) -> None:
+    if os.path.isdir(state_dir):
+        for name in os.listdir(state_dir):
+            try:
+                os.remove(os.path.join(state_dir, name))
+            except OSError:
+                pass
+
+
+def mark_process_dead(pid: int, state_dir: str = None) -> None:
+    """
+    Fold an exited worker's counters and histograms into RETIRED_FILE and
+    remove its snapshot (gunicorn master, child_exit). Its gauges go.
+
+    The retired file names the pids it holds, and is replaced before the
+    pid file is removed, so a concurrent collect() counts each value once.
+    """
+    state_dir = state_dir or METRICS_DIR
+    path = os.path.join(state_dir, f"{pid}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            values_by_metric = json.load(f)
+    except (OSError, ValueError):
+        values_by_metric = None
+
+    if values_by_metric is not None:
+        retired = _read_retired(state_dir)
+        if pid not in retired["pids"]:
+            totals = retired["values"]
+            for metric in _registry:
+                if metric.kind != "gauge":
+                    _add_values(metric, totals.setdefault(metric.name, {}),
+                                values_by_metric.get(metric.name, {}))
+            # Only pids whose file is still there can be double counted
+            pids = [p for p in retired["pids"] if os.path.exists(os.path.join(state_dir, f"{p}.json"))]
+            fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"pids": pids + [pid], "values": totals}, f)
+            os.replace(tmp_path, os.path.join(state_dir, RETIRED_FILE))
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_retired(state_dir: str) -> dict:
+    try:
+        with open(os.path.join(state_dir, RETIRED_FILE), "r", encoding="utf-8") as f:
+            retired = json.load(f)
+        return {"pids": list(retired["pids"]), "values": dict(retired["values"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {"pids": [], "values": {}}
+
+
+def _add_values(metric, totals: dict, values: dict) -> None:
+    for labels, value in values.items():
+        if metric.kind == "histogram":
+            total = totals.setdefault(labels, [0] * len(value))
+            for slot, count in enumerate(value):
+                total[slot] += count
+        else:
+            totals[labels] = totals.get(labels, 0) + value
+
+
+def collect(state_dir: str = None) -> tuple:
+    """
+    Merged values across every process that has flushed, with this
+    process's current values in place of its last flush, plus the
+    retired totals of exited workers.
+    Returns (merged {metric name: {labels: value}}, live process count).
+    """
+    state_dir = state_dir or METRICS_DIR
+    snapshots = {os.getpid(): snapshot()}
+    retired = {"pids": [], "values": {}}
+    if os.path.isdir(state_dir):
+        for name in os.listdir(state_dir):
+            pid_text, ext = os.path.splitext(name)
+            if ext != ".json" or not pid_text.isdigit() or int(pid_text) in snapshots:
+                continue
+            try:
+                with open(os.path.join(state_dir, name), "r", encoding="utf-8") as f:
+                    snapshots[int(pid_text)] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        # Read after the pid files: a pid retired meanwhile is in here and
+        # its file is skipped, rather than counted twice or not at all
+        retired = _read_retired(state_dir)
+        for pid in retired["pids"]:
+            if pid != os.getpid():
+                snapshots.pop(pid, None)
+
+    live = {pid for pid in snapshots if pid_alive(pid)}
+    merged = {}
+    for metric in _registry:
+        values = merged[metric.name] = {}
+        if metric.kind != "gauge":
+            _add_values(metric, values, retired["values"].get(metric.name, {}))
+        for pid, values_by_metric in snapshots.items():
+            if metric.kind == "gauge" and pid not in live:
+                continue
+            _add_values(metric, values, values_by_metric.get(metric.name, {}))
+    return merged, len(live)
+
+
+def pid_alive(pid) -> bool:
+    """Whether pid names a running process (this one counts; junk doesn't)"""
+    if pid == os.getpid():
+        return True
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ─────────────────────────────────────────────
+# Prometheus text format
+# ─────────────────────────────────────────────
+
+def render_prometheus(state_dir: str = None) -> str:
+    merged, processes = collect(state_dir)
+    lines = [
+        "# HELP guidance_worker_processes Processes currently reporting metrics",
+        "# TYPE guidance_worker_processes gauge",
+        f"guidance_worker_processes {processes}",
+    ]
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for key in sorted(merged[metric.name]):
+            value = merged[metric.name][key]
+            labels = list(zip(metric.labelnames, key.split("\0"))) if metric.labelnames else []
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{metric.name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+            lines.append(f"{metric.name}_sum{_labels(labels)} {_number(value[-1])}")
+            lines.append(f"{metric.name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(pairs: list) -> str:
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
@@ -0,0 +1,470 @@
+"""
+Native Scorer
+Pure NumPy/SciPy reimplementation of the trained sklearn pipeline's
+predict_proba, loaded from a compact exported artifact:
+- TF-IDF: vocabulary, idf vector and n-gram / sublinear-tf config
+- Feature hashing (ml/train_incremental.py): n_features, n-gram config
+  and the hashed columns the classifier has weights for; n-grams are
+  hashed with the same MurmurHash3 as sklearn's HashingVectorizer
+- Classifier: linear weights (LogisticRegression), one-vs-rest logistic
+  weights (SGDClassifier), per-fold weights + sigmoid calibrators
+  (calibrated LinearSVC), or flattened tree arrays (RandomForest)
+
+The artifact is a directory holding config.json plus one .npy file per
+array. Arrays are memory-mapped on load, so loading takes milliseconds
+and every worker on a host shares the same page-cache copy. Linear
+weights are float32 (scores are summed in float32, then intercepts and
+probabilities are computed in float64); tree nodes use int32 ids and
+float32 thresholds; leaves that predict a single class are stored as a
+class id instead of a probability row.
+
+Serving a short text through this skips the Pipeline / estimator
+validation overhead sklearn pays on every call.
+
+Export from an existing pickle:
+    python -m services.native_scorer ml/career_classifier.pkl ml/career_scorer
+"""
+
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import struct
+import tempfile
+import numpy as np
+import scipy.sparse as sp
+
+ARTIFACT_VERSION = 2
+CONFIG_FILE = "config.json"
+
+# Rows scored per tree-traversal step; bounds the (rows x trees) work arrays
+_TREE_BATCH = 256
+
+# Distinct n-grams whose hash is remembered by the hashing transform
+_HASH_CACHE_SIZE = 65536
+
+
+# ─────────────────────────────────────────────
+# Export (training side)
+# ─────────────────────────────────────────────
+
+def export_pipeline(pipeline, path: str) -> None:
+    """
+    Write the inference artifact directory for a fitted Pipeline of a
+    TfidfVectorizer or HashingVectorizer followed by a "clf" step
+    """
+    vectorizer = pipeline.steps[0][1]
+    clf = pipeline.named_steps["clf"]
+
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Only the default word analyzer can be exported")
+
+    config = {
+        "version": ARTIFACT_VERSION,
+        "token_pattern": vectorizer.token_pattern,
+        "lowercase": vectorizer.lowercase,
+        "ngram_range": list(vectorizer.ngram_range),
+        "norm": vectorizer.norm,
+        "classes": [str(label) for label in clf.classes_],
+    }
+    if type(vectorizer).__name__ == "HashingVectorizer":
+        if vectorizer.binary or vectorizer.norm not in ("l2", None):
+            raise ValueError("Only count features with l2 or no norm can be exported")
+        config.update(vectorizer="hashing", n_features=vectorizer.n_features,
+                      alternate_sign=vectorizer.alternate_sign)
+        arrays = {}
+    else:
+        vocabulary = sorted(vectorizer.vocabulary_.items(), key=lambda item: item[1])
+        config.update(vectorizer="tfidf", sublinear_tf=vectorizer.sublinear_tf, use_idf=vectorizer.use_idf,
+                      vocabulary=[term for term, _ in vocabulary])
+        arrays = {
+            "idf": vectorizer.idf_ if vectorizer.use_idf else np.ones(len(vocabulary)),
+        }
+
+    kind = type(clf).__name__
+    if kind == "LogisticRegression":
+        if clf.coef_.shape[0] == 1:
+            raise ValueError("Binary LogisticRegression export is not supported")
+        config["model"] = "softmax"
+        arrays["coef"] = clf.coef_
+        arrays["intercept"] = clf.intercept_
+
+    elif kind == "SGDClassifier":
+        if clf.loss != "log_loss" or clf.coef_.shape[0] == 1:
+            raise ValueError("Only multiclass log_loss SGDClassifier export is supported")
+        config["model"] = "ovr_logistic"
+        arrays["coef"] = clf.coef_
+        arrays["intercept"] = clf.intercept_
+
+    elif kind == "CalibratedClassifierCV":
+        config["model"] = "calibrated_linear"
+        coefs, intercepts, slopes, offsets = [], [], [], []
+        for calibrated in clf.calibrated_classifiers_:
+            if calibrated.method != "sigmoid":
+                raise ValueError("Only sigmoid calibration can be exported")
+            if list(calibrated.estimator.classes_) != list(clf.classes_):
+                raise ValueError("Every calibration fold must have seen every class")
+            coefs.append(calibrated.estimator.coef_)
+            intercepts.append(calibrated.estimator.intercept_)
+            slopes.append([c.a_ for c in calibrated.calibrators])
+            offsets.append([c.b_ for c in calibrated.calibrators])
+        arrays["coef"] = np.stack(coefs)               # (folds, classes, features)
+        arrays["intercept"] = np.stack(intercepts)     # (folds, classes)
+        arrays["calib_a"] = np.array(slopes)           # (folds, classes)
+        arrays["calib_b"] = np.array(offsets)
+
+    elif kind == "RandomForestClassifier":
+        config["model"] = "forest"
+        arrays.update(_flatten_forest(clf))
+
+    else:
+        raise ValueError(f"Cannot export classifier type {kind}")
+
+    if config["vectorizer"] == "hashing":
+        if "coef" not in arrays:
+            raise ValueError("Hashed features can only be exported with a linear classifier")
+        # Keep the columns some class has a weight for; the others add nothing to any score
+        coef = arrays["coef"]
+        columns = np.flatnonzero((coef != 0).any(axis=tuple(range(coef.ndim - 1))))
+        arrays["coef"] = coef[..., columns]
+        arrays["hash_columns"] = columns
+
+    if "coef" in arrays:
+        # Half the size of float64 (the bulk of a linear artifact); probabilities
+        # move by about 1e-7, far below any difference between careers
+        arrays["coef"] = np.asarray(arrays["coef"], dtype=np.float32)
+
+    _write_artifact(path, config, arrays)
+
+
+def _flatten_forest(forest) -> dict:
+    """
+    Concatenate every tree's nodes into shared arrays:
+    - tree_children[2 * node + go_right] is the next node (global ids)
+    - tree_feature is the split feature, or -1 - leaf_id at a leaf
+    - tree_threshold is float32, rounded down so that for the float32
+      features sklearn compares, x > threshold decides exactly as before
+    - tree_leaf_class holds each leaf's class when every leaf is pure,
+      otherwise tree_leaf_values holds the normalized class distributions
+    """
+    roots, children, features, thresholds, leaf_values = [], [], [], [], []
+    node_offset = leaf_offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        n_leaves = int(is_leaf.sum())
+        roots.append(node_offset)
+
+        pairs = np.stack([tree.children_left, tree.children_right], axis=1) + node_offset
+        pairs[is_leaf] = -1
+        children.append(pairs.ravel())
+
+        leaf_ids = np.full(tree.node_count, 0)
+        leaf_ids[is_leaf] = np.arange(n_leaves) + leaf_offset
+        features.append(np.where(is_leaf, -1 - leaf_ids, tree.feature))
+        thresholds.append(tree.threshold)
+
+        # Same per-leaf normalization DecisionTreeClassifier.predict_proba applies
+        values = tree.value[is_leaf, 0, :]
+        totals = values.sum(axis=1, keepdims=True)
+        totals[totals == 0.0] = 1.0
+        leaf_values.append(values / totals)
+
+        node_offset += tree.node_count
+        leaf_offset += n_leaves
+
+    if node_offset * 2 >= np.iinfo(np.int32).max:
+        raise ValueError("Forest is too large for int32 node ids")
+
+    threshold = np.concatenate(thresholds)
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32.astype(np.float64) > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+    arrays = {
+        "tree_roots": np.array(roots, dtype=np.int32),
+        "tree_children": np.concatenate(children).astype(np.int32),
+        "tree_feature": np.concatenate(features).astype(np.int32),
+        "tree_threshold": threshold32,
+    }
+    leaf_values = np.concatenate(leaf_values)
+    if np.all(leaf_values.max(axis=1) == 1.0):
+        dtype = np.uint8 if leaf_values.shape[1] <= 256 else np.uint16
+        arrays["tree_leaf_class"] = leaf_values.argmax(axis=1).astype(dtype)
+    else:
+        arrays["tree_leaf_values"] = leaf_values
+    return arrays
+
+
+def _write_artifact(path: str, config: dict, arrays: dict) -> None:
+    """
+    Write each array as <name>.npy and config.json last, every file via a
+    temp file + rename. A process still serving the previous artifact keeps
+    its memory maps of the old files, and a reader never sees a torn file.
+    """
+    os.makedirs(path, exist_ok=True)
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8"))
+    config["arrays"] = {}
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"\0{name}\0{array.dtype.str}\0{array.shape}\0".encode("utf-8"))
+        digest.update(array.tobytes())
+        config["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+        _replace_file(os.path.join(path, name + ".npy"), lambda f: np.save(f, array))
+    config["digest"] = digest.hexdigest()
+    _replace_file(os.path.join(path, CONFIG_FILE), lambda f: f.write(json.dumps(config).encode("utf-8")))
+
+    # Arrays left over from a different model type
+    for filename in os.listdir(path):
+        if filename.endswith(".npy") and filename[:-4] not in arrays:
+            os.remove(os.path.join(path, filename))
+
+
+def _replace_file(path: str, write) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+# ─────────────────────────────────────────────
+# Scoring (serving side)
+# ─────────────────────────────────────────────
+
+class NativeScorer:
+    """Drop-in for the pipeline's predict_proba / classes_"""
+
+    def __init__(self, config: dict, arrays: dict):
+        if config["version"] != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported scorer artifact version {config['version']}")
+        self.config = config
+        self.digest = config.get("digest")
+        self.classes_ = np.array(config["classes"])
+        self.vectorizer = config.get("vectorizer", "tfidf")
+        if self.vectorizer == "hashing":
+            self.hash_columns = {int(bucket): i for i, bucket in enumerate(arrays["hash_columns"])}
+        else:
+            self.vocabulary = {term: i for i, term in enumerate(config["vocabulary"])}
+            self.idf = arrays["idf"]
+        self.model = config["model"]
+        self._token_pattern = re.compile(config["token_pattern"])
+        self._arrays = arrays
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NativeScorer":
+        """
+        Load an artifact directory. With mmap=True the arrays stay backed
+        by the files: nothing is copied up front and pages are shared
+        between processes.
+        """
+        with open(os.path.join(path, CONFIG_FILE), "r", encoding="utf-8") as f:
+            config = json.load(f)
+        arrays = {}
+        for name, spec in config.get("arrays", {}).items():
+            array = np.load(
+                os.path.join(path, name + ".npy"), mmap_mode="r" if mmap else None, allow_pickle=False
+            )
+            if array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+                raise ValueError(f"Scorer artifact array '{name}' does not match config.json")
+            # Plain ndarray view over the map: no per-operation memmap overhead
+            arrays[name] = np.asarray(array)
+        return cls(config, arrays)
+
+    # ── TF-IDF ───────────────────────────────────────────────
+    def _ngrams(self, text: str) -> list:
+        if self.config["lowercase"]:
+            text = text.lower()
+        tokens = self._token_pattern.findall(text)
+        min_n, max_n = self.config["ngram_range"]
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts: list) -> sp.csr_matrix:
+        """Feature matrix identical to the fitted vectorizer's output"""
+        if self.vectorizer == "hashing":
+            return self._hashed(texts)
+        indptr, indices, counts = [0], [], []
+        vocabulary = self.vocabulary
+        for text in texts:
+            row = {}
+            for gram in self._ngrams(text):
+                column = vocabulary.get(gram)
+                if column is not None:
+                    row[column] = row.get(column, 0) + 1
+            indices.extend(row.keys())
+            counts.extend(row.values())
+            indptr.append(len(indices))
+
+        X = sp.csr_matrix(
+            (np.array(counts, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(texts), len(vocabulary)),
+        )
+        if self.config["sublinear_tf"]:
+            np.log(X.data, X.data)
+            X.data += 1
+        X = X @ sp.diags(self.idf)
+        if self.config["norm"] == "l2":
+            norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+            norms[norms == 0.0] = 1.0
+            X = sp.diags(1.0 / norms) @ X
+        return sp.csr_matrix(X)
+
+    # ── Feature hashing ──────────────────────────────────────
+    def _hashed(self, texts: list) -> sp.csr_matrix:
+        """
+        HashingVectorizer output restricted to the exported columns. The
+        norm is taken over every bucket of the row, as sklearn does,
+        before the columns the model has no weights for are dropped.
+        """
+        n_features = self.config["n_features"]
+        alternate_sign = self.config["alternate_sign"]
+        columns = self.hash_columns
+        indptr, indices, values = [0], [], []
+        for text in texts:
+            row = {}
+            for gram in self._ngrams(text):
+                h = _murmurhash3_32(gram)
+                # abs(-2**31) overflows int32 in sklearn; this matches its special case
+                bucket = (2147483647 - (n_features - 1)) % n_features if h == -2147483648 else abs(h) % n_features
+                row[bucket] = row.get(bucket, 0) + (-1 if alternate_sign and h < 0 else 1)
+            scale = 1.0
+            if self.config["norm"] == "l2":
+                norm = math.sqrt(sum(value * value for value in row.values()))
+                scale = 1.0 / norm if norm else 1.0
+            for bucket, value in row.items():
+                column = columns.get(bucket)
+                if column is not None and value:
+                    indices.append(column)
+                    values.append(value * scale)
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.array(values, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(texts), len(columns)),
+        )
+
+    # ── Classifiers ──────────────────────────────────────────
+    def predict_proba(self, texts: list) -> np.ndarray:
+        X = self.transform(list(texts))
+        if self.model == "softmax":
+            return self._softmax(X)
+        if self.model == "ovr_logistic":
+            return self._ovr_logistic(X)
+        if self.model == "calibrated_linear":
+            return self._calibrated_linear(X)
+        return self._forest(X)
+
+    def _linear_input(self, X):
+        """X in the weights' dtype, so the product never upcasts the weight matrix"""
+        return X.astype(self._arrays["coef"].dtype, copy=False)
+
+    def _softmax(self, X) -> np.ndarray:
+        scores = self._linear_input(X) @ self._arrays["coef"].T + self._arrays["intercept"]
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, scores)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def _ovr_logistic(self, X) -> np.ndarray:
+        """One sigmoid per class, normalized to sum to 1 (sklearn's _predict_proba_lr)"""
+        scores = self._linear_input(X) @ self._arrays["coef"].T + self._arrays["intercept"]
+        proba = 1.0 / (1.0 + np.exp(-scores))
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def _calibrated_linear(self, X) -> np.ndarray:
+        coef, intercept = self._arrays["coef"], self._arrays["intercept"]
+        a, b = self._arrays["calib_a"], self._arrays["calib_b"]
+        X = self._linear_input(X)
+        proba = np.zeros((X.shape[0], len(self.classes_)))
+        for fold in range(coef.shape[0]):
+            decision = X @ coef[fold].T + intercept[fold]
+            fold_proba = 1.0 / (1.0 + np.exp(a[fold] * decision + b[fold]))
+            totals = fold_proba.sum(axis=1, keepdims=True)
+            uniform = (totals == 0.0).ravel()
+            fold_proba[uniform] = 1.0 / len(self.classes_)
+            totals[uniform] = 1.0
+            fold_proba /= totals
+            fold_proba[(1.0 < fold_proba) & (fold_proba <= 1.0 + 1e-5)] = 1.0
+            proba += fold_proba
+        return proba / coef.shape[0]
+
+    def _forest(self, X) -> np.ndarray:
+        arrays = self._arrays
+        feature, threshold = arrays["tree_feature"], arrays["tree_threshold"]
+        roots, children = arrays["tree_roots"], arrays["tree_children"]
+        n_trees, n_classes = len(roots), len(self.classes_)
+
+        proba = np.empty((X.shape[0], n_classes))
+        for start in range(0, X.shape[0], _TREE_BATCH):
+            # Trees compare float32 features, exactly as sklearn does
+            dense = X[start:start + _TREE_BATCH].toarray().astype(np.float32)
+            n_rows, n_features = dense.shape
+            flat = dense.ravel()
+            # One flat (row, tree) walker per pair; finished walkers drop out
+            nodes = np.tile(roots, n_rows)
+            row_offset = np.repeat(np.arange(n_rows) * n_features, n_trees)
+            active = np.arange(nodes.size)
+            while active.size:
+                current = nodes[active]
+                node_feature = feature[current]
+                internal = node_feature >= 0
+                if not internal.all():
+                    active, current, node_feature = active[internal], current[internal], node_feature[internal]
+                go_right = flat[row_offset[active] + node_feature] > threshold[current]
+                nodes[active] = children[2 * current + go_right]
+
+            leaves = (-1 - feature[nodes]).reshape(n_rows, n_trees)
+            if "tree_leaf_class" in arrays:
+                # Pure leaves: the forest's probability is each class's vote share
+                votes = arrays["tree_leaf_class"][leaves] + (np.arange(n_rows) * n_classes)[:, None]
+                counts = np.bincount(votes.ravel(), minlength=n_rows * n_classes)
+                proba[start:start + n_rows] = counts.reshape(n_rows, n_classes) / n_trees
+            else:
+                proba[start:start + n_rows] = arrays["tree_leaf_values"][leaves].mean(axis=1)
+        return proba
+
+
+@functools.lru_cache(maxsize=_HASH_CACHE_SIZE)
+def _murmurhash3_32(text: str) -> int:
+    """Signed 32-bit MurmurHash3 (x86, seed 0) of the UTF-8 text, as sklearn.utils.murmurhash3_32"""
+    data = text.encode("utf-8")
+    n_blocks = len(data) // 4
+    h = 0
+    for k in struct.unpack_from(f"<{n_blocks}I", data):
+        k = (k * 0xCC9E2D51) & 0xFFFFFFFF
+        k = ((k << 15) | (k >> 17)) & 0xFFFFFFFF
+        h ^= (k * 0x1B873593) & 0xFFFFFFFF
+        h = ((h << 13) | (h >> 19)) & 0xFFFFFFFF
+        h = (h * 5 + 0xE6546B64) & 0xFFFFFFFF
+    tail = data[n_blocks * 4:]
+    if tail:
+        k = (int.from_bytes(tail, "little") * 0xCC9E2D51) & 0xFFFFFFFF
+        k = ((k << 15) | (k >> 17)) & 0xFFFFFFFF
+        h ^= (k * 0x1B873593) & 0xFFFFFFFF
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+if __name__ == "__main__":
+    import pickle
+    import sys
+
+    if len(sys.argv) != 3:
+        print("usage: python -m services.native_scorer <pipeline.pkl> <artifact_dir>")
+        sys.exit(2)
+    with open(sys.argv[1], "rb") as f:
+        export_pipeline(pickle.load(f), sys.argv[2])
+    print(f"[SAVED] {sys.argv[2]}")
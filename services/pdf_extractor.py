@@ -0,0 +1,144 @@
+"""
+PDF Extractor Service
+Shared text extraction for uploaded / downloaded resume PDFs:
+- Pages are extracted on a process pool (pdfplumber is CPU-bound), one
+  contiguous page range per task so each worker parses the file once
+- Stops early once a page or character budget is reached
+- Returns page-ordered text plus per-page timing
+"""
+
+import io
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# ─────────────────────────────────────────────
+# Budgets (override through the environment)
+# ─────────────────────────────────────────────
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 30))
+PDF_MAX_CHARS = int(os.environ.get("PDF_MAX_CHARS", 200_000))
+PDF_WORKERS   = int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Create the page worker pool on first use (after gunicorn has forked).
+    Workers come from a forkserver (spawn where there is none), never a
+    plain fork of this multi-threaded server process: a fork could copy
+    a lock some other request thread is holding.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                            mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def _extract_pages(pdf_bytes: bytes, start: int, stop: int, max_chars: int) -> list:
+    """
+    Worker task: extract pages start..stop-1, return [(text, seconds), ...].
+    Stops once the range alone holds max_chars: the budget is hit by then.
+    """
+    import pdfplumber
+    results, chars = [], 0
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for index in range(start, stop):
+            began = time.perf_counter()
+            text = pdf.pages[index].extract_text() or ""
+            results.append((text, time.perf_counter() - began))
+            chars += len(text)
+            if chars >= max_chars:
+                break
+    return results
+
+
+def _page_entry(index: int, text: str, seconds: float) -> dict:
+    return {"page": index + 1, "chars": len(text), "ms": round(seconds * 1000, 2)}
+
+
+def extract_pdf_text(pdf_bytes: bytes, max_pages: int = None, max_chars: int = None,
+                     workers: int = None) -> dict:
+    """
+    Extract text from a PDF held in memory.
+
+    Args:
+        pdf_bytes : raw PDF file contents
+        max_pages : stop after this many pages (default PDF_MAX_PAGES)
+        max_chars : stop once this many characters are collected (default PDF_MAX_CHARS)
+        workers   : page worker processes (default PDF_WORKERS, 1 = extract inline)
+
+    Returns:
+        {
+            "text": page texts joined in page order,
+            "pages": [{"page": 1, "chars": 812, "ms": 14.2}, ...],
+            "page_count": pages in the document,
+            "truncated": True if a budget cut extraction short
+        }
+
+    Raises whatever pdfplumber raises for unreadable files; callers
+    translate that into their own error response.
+    """
+    import pdfplumber
+
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    workers   = PDF_WORKERS if workers is None else workers
+
+    texts, pages = [], []
+    total_chars = 0
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        page_count = len(pdf.pages)
+        to_read = min(page_count, max_pages)
+
+        if workers <= 1 or to_read <= 1:
+            # Not worth shipping the bytes to another process
+            for index in range(to_read):
+                start = time.perf_counter()
+                text = pdf.pages[index].extract_text() or ""
+                texts.append(text)
+                pages.append(_page_entry(index, text, time.perf_counter() - start))
+                total_chars += len(text)
+                if total_chars >= max_chars:
+                    break
+
+    if workers > 1 and to_read > 1:
+        # One contiguous range per worker, consumed in page order; a
+        # budget hit cancels the ranges that haven't started yet.
+        pool = _get_pool()
+        per_task = math.ceil(to_read / min(workers, to_read))
+        in_flight = deque(
+            (start, pool.submit(_extract_pages, pdf_bytes, start, min(start + per_task, to_read), max_chars))
+            for start in range(0, to_read, per_task)
+        )
+        try:
+            while in_flight and total_chars < max_chars:
+                start, future = in_flight.popleft()
+                for index, (text, seconds) in enumerate(future.result(), start):
+                    texts.append(text)
+                    pages.append(_page_entry(index, text, seconds))
+                    total_chars += len(text)
+                    if total_chars >= max_chars:
+                        break
+        finally:
+            for _, pending in in_flight:
+                pending.cancel()
+
+    text = "".join(texts)
+    truncated = len(pages) < page_count or len(text) > max_chars
+    return {
+        "text": text[:max_chars],
+        "pages": pages,
+        "page_count": page_count,
+        "truncated": truncated,
+    }
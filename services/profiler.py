@@ -0,0 +1,123 @@
+"""
+Request Profiler
+Opt-in cProfile capture for individual slow requests and jobs:
+- A request or job is profiled when an admin asks for it, or once every
+  PROFILE_SAMPLE_RATE calls (0 = only on demand)
+- Unsampled requests pay one counter increment
+- At most one profile runs per process at a time; a sampled request
+  arriving while another is being profiled just runs unprofiled
+- Profiles are pstats files in PROFILE_DIR, newest PROFILE_KEEP kept;
+  open one with `python -m pstats <file>` or snakeviz
+- Work done in other processes (e.g. the PDF extraction pool) does not
+  show up in the calling request's profile
+"""
+
+import cProfile
+import itertools
+import os
+import re
+import tempfile
+import threading
+import time
+
+PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_KEEP        = int(os.environ.get("PROFILE_KEEP", 50))
+PROFILE_DIR         = os.environ.get("PROFILE_DIR") or os.path.join(
+    tempfile.gettempdir(), "career_guidance_profiles"
+)
+
+# <unix ms>-<endpoint>-<pid>-<status>-<duration ms>.prof
+_NAME_RE = re.compile(r"^(\d+)-([a-z_]+)-(\d+)-(\d{3})-(\d+)\.prof$")
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the resulting dumps"""
+
+    def __init__(self, sample_rate: int = PROFILE_SAMPLE_RATE, profile_dir: str = PROFILE_DIR,
+                 keep: int = PROFILE_KEEP):
+        self.sample_rate = sample_rate
+        self.profile_dir = profile_dir
+        self.keep = keep
+        self._counter = itertools.count(1)
+        self._busy = threading.Lock()
+        self._last_ms = 0
+
+    def sampled(self) -> bool:
+        """True for one request in every sample_rate"""
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    def run(self, endpoint: str, func, *args, **kwargs) -> tuple:
+        """
+        Call func under cProfile. Returns (result, profile name), with a
+        None name if another profile was already running in this process.
+        A result with a status_code (a Flask response), or a (status, body)
+        tuple, has its status recorded in the file name.
+        """
+        if not self._busy.acquire(blocking=False):
+            return func(*args, **kwargs), None
+        try:
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profile.disable()
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            # Names sort by time and must stay unique: a profile finishing in the
+            # same millisecond as the last (whose file rotation may have removed
+            # already) takes the next one
+            created_ms = self._last_ms = max(int(time.time() * 1000), self._last_ms + 1)
+        finally:
+            self._busy.release()
+
+        status = getattr(result, "status_code", 200)
+        if isinstance(result, tuple) and result and isinstance(result[0], int):
+            status = result[0]
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = f"{created_ms}-{endpoint}-{os.getpid()}-{status}-{elapsed_ms}.prof"
+        profile.dump_stats(os.path.join(self.profile_dir, name))
+        self._rotate()
+        return result, name
+
+    def profiles(self) -> list:
+        """Saved profiles, newest first"""
+        entries = []
+        for name in self._names():
+            created_ms, endpoint, pid, status, duration_ms = _NAME_RE.match(name).groups()
+            try:
+                size = os.path.getsize(os.path.join(self.profile_dir, name))
+            except OSError:
+                continue
+            entries.append({
+                "name": name,
+                "endpoint": endpoint,
+                "created_at": int(created_ms) / 1000,
+                "pid": int(pid),
+                "status": int(status),
+                "duration_ms": int(duration_ms),
+                "bytes": size,
+            })
+        return entries
+
+    def path(self, name: str):
+        """Absolute path of a saved profile, or None if the name is unknown / invalid"""
+        if not _NAME_RE.match(name):
+            return None
+        path = os.path.join(self.profile_dir, name)
+        return path if os.path.isfile(path) else None
+
+    def _names(self) -> list:
+        if not os.path.isdir(self.profile_dir):
+            return []
+        return sorted((name for name in os.listdir(self.profile_dir) if _NAME_RE.match(name)), reverse=True)
+
+    def _rotate(self) -> None:
+        for name in self._names()[self.keep:]:
+            try:
+                os.remove(os.path.join(self.profile_dir, name))
+            except OSError:
+                pass
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,88 @@
+"""
+Resume Cache Service
+Content-addressed caching for the resume pipeline, so a student who
+resubmits the same resume while tweaking their Q&A answers skips the
+expensive steps:
+- parse_resume results, keyed by a hash of the normalized resume text
+- PDF text extraction, keyed by a hash of the PDF bytes
+
+Keys include a fingerprint of MASTER_SKILLS and of the parser's source,
+so editing the skill list or the parsing code invalidates every cached
+parse (in memory and on disk) automatically.
+"""
+
+import copy
+import hashlib
+import os
+
+from services import resume_parser, section_segmenter
+from services.cache import LRUCache
+from services.skill_keywords import MASTER_SKILLS
+from services.resume_parser import parse_resume
+from services.pdf_extractor import extract_pdf_text, PDF_MAX_PAGES, PDF_MAX_CHARS
+
+RESUME_CACHE_SIZE = int(os.environ.get("RESUME_CACHE_SIZE", 512))
+PDF_CACHE_SIZE    = int(os.environ.get("PDF_CACHE_SIZE", 128))
+RESUME_CACHE_DIR  = os.environ.get("RESUME_CACHE_DIR") or None
+RESUME_CACHE_DISK_SIZE = int(os.environ.get("RESUME_CACHE_DISK_SIZE", 10000))
+
+
+def _parser_fingerprint() -> str:
+    digest = hashlib.sha256("\n".join(MASTER_SKILLS).encode("utf-8"))
+    for module in (resume_parser, section_segmenter):
+        with open(module.__file__, "rb") as f:
+            digest.update(b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+PARSER_FINGERPRINT = _parser_fingerprint()
+
+parse_cache = LRUCache("parse", maxsize=RESUME_CACHE_SIZE, disk_dir=RESUME_CACHE_DIR,
+                       disk_maxsize=RESUME_CACHE_DISK_SIZE)
+pdf_cache   = LRUCache("pdf", maxsize=PDF_CACHE_SIZE, disk_dir=RESUME_CACHE_DIR,
+                       disk_maxsize=RESUME_CACHE_DISK_SIZE)
+
+
+def normalize_resume_text(text: str) -> str:
+    """Canonical form of the text for the cache key (the parser gets the original)"""
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def parse_resume_cached(text: str) -> dict:
+    """
+    parse_resume with a content-addressed cache in front of it. Texts
+    differing only in line endings or surrounding whitespace share an
+    entry; raw_text is always the caller's own text.
+    """
+    key = hashlib.sha256(
+        (PARSER_FINGERPRINT + "\0" + normalize_resume_text(text)).encode("utf-8")
+    ).hexdigest()
+
+    entry = parse_cache.get(key)
+    if entry is None:
+        entry = {k: v for k, v in parse_resume(text).items() if k != "raw_text"}
+        parse_cache.set(key, entry)
+
+    # Callers override fields (education_branch, has_internship) in place
+    return {**copy.deepcopy(entry), "raw_text": text}
+
+
+def extract_pdf_text_cached(pdf_bytes: bytes) -> dict:
+    """extract_pdf_text with a cache keyed by the PDF bytes and budgets"""
+    digest = hashlib.sha256(pdf_bytes)
+    digest.update(f"\0{PDF_MAX_PAGES}\0{PDF_MAX_CHARS}".encode("utf-8"))
+    key = digest.hexdigest()
+
+    result = pdf_cache.get(key)
+    if result is None:
+        result = extract_pdf_text(pdf_bytes)
+        pdf_cache.set(key, result)
+    return copy.deepcopy(result)
+
+
+def cache_stats() -> dict:
+    return {
+        "parser_fingerprint": PARSER_FINGERPRINT,
+        "parse": parse_cache.stats(),
+        "pdf": pdf_cache.stats(),
+    }
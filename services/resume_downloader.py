@@ -0,0 +1,319 @@
+"""
+Resume Downloader
+Fetches resume PDFs from resume_url (Supabase storage) for the API:
+- One pooled requests.Session per process, so repeat downloads reuse
+  the TCP/TLS connection instead of handshaking every time
+- Streams the body into a buffer capped at RESUME_MAX_BYTES
+- A total deadline for the whole download, retries included, on top of
+  the per-read socket timeout
+- Retries connection errors / 429 / 5xx with exponential backoff
+- Counters for attempts, retries, aborts and bytes downloaded
+- AsyncResumeDownloader: the same limits and counters on an httpx
+  AsyncClient, for the ASGI serving mode (asgi.py)
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    # Only needed by AsyncResumeDownloader (ASGI mode)
+    httpx = None
+
+# ─────────────────────────────────────────────
+# Limits (override through the environment)
+# ─────────────────────────────────────────────
+RESUME_MAX_BYTES       = int(os.environ.get("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+RESUME_DEADLINE        = float(os.environ.get("RESUME_DEADLINE", 30))
+RESUME_CONNECT_TIMEOUT = float(os.environ.get("RESUME_CONNECT_TIMEOUT", 5))
+RESUME_RETRIES         = int(os.environ.get("RESUME_RETRIES", 2))
+RESUME_RETRY_BACKOFF   = float(os.environ.get("RESUME_RETRY_BACKOFF", 0.25))
+RESUME_POOL_SIZE       = int(os.environ.get("RESUME_POOL_SIZE", 10))
+
+CHUNK_SIZE = 64 * 1024
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class DownloadError(ValueError):
+    """The resume could not be downloaded (reported to the client as 422)"""
+
+
+class _Retryable(Exception):
+    """Internal: a failed attempt that may succeed if tried again"""
+
+
+class ResumeDownloader:
+    """Pooled, size- and time-capped HTTP downloader with retry stats"""
+
+    def __init__(self, max_bytes: int = RESUME_MAX_BYTES, deadline: float = RESUME_DEADLINE,
+                 connect_timeout: float = RESUME_CONNECT_TIMEOUT, retries: int = RESUME_RETRIES,
+                 backoff: float = RESUME_RETRY_BACKOFF, pool_size: int = RESUME_POOL_SIZE):
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys((
+            "downloads", "succeeded", "failed", "attempts", "retries",
+            "too_large", "deadline_exceeded", "bytes",
+        ), 0)
+        self._seconds = 0.0
+
+    def download(self, url: str) -> bytes:
+        """Body of url, or DownloadError once retries / deadline / size cap run out"""
+        start = time.monotonic()
+        deadline = start + self.deadline
+        self._count("downloads")
+        try:
+            attempt = 0
+            while True:
+                self._count("attempts")
+                try:
+                    body = self._fetch(url, deadline)
+                except _Retryable as e:
+                    delay = self.backoff * 2 ** attempt
+                    if attempt >= self.retries or time.monotonic() + delay >= deadline:
+                        raise DownloadError(str(e)) from e
+                    attempt += 1
+                    self._count("retries")
+                    time.sleep(delay)
+                    continue
+                self._count("succeeded")
+                self._count("bytes", len(body))
+                return body
+        except DownloadError:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._seconds += time.monotonic() - start
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self._counts["succeeded"] + self._counts["failed"]
+            return {
+                **self._counts,
+                "avg_ms": round(self._seconds / finished * 1000, 1) if finished else 0.0,
+                "max_bytes": self.max_bytes,
+                "deadline": self.deadline,
+            }
+
+    # ── internals ────────────────────────────────────────────
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += amount
+
+    def _get_session(self) -> requests.Session:
+        """Per-process session: pooled sockets must not be shared across a fork"""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def _remaining(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._count("deadline_exceeded")
+            raise DownloadError(f"Download took longer than {self.deadline:g}s")
+        return remaining
+
+    def _fetch(self, url: str, deadline: float) -> bytes:
+        """One attempt: stream the body, enforcing the size cap and deadline"""
+        remaining = self._remaining(deadline)
+        try:
+            response = self._get_session().get(
+                url, stream=True, timeout=(min(self.connect_timeout, remaining), remaining)
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise _Retryable(f"Could not connect: {e}") from e
+        except requests.RequestException as e:
+            raise DownloadError(str(e)) from e
+
+        with response:
+            if response.status_code in RETRY_STATUSES:
+                raise _Retryable(f"Server returned HTTP {response.status_code}")
+            if response.status_code >= 400:
+                raise DownloadError(f"Server returned HTTP {response.status_code}")
+
+            declared = response.headers.get("Content-Length", "")
+            if declared.isdigit() and int(declared) > self.max_bytes:
+                self._count("too_large")
+                raise DownloadError(f"Resume is larger than {self.max_bytes} bytes")
+
+            body = bytearray()
+            try:
+                for chunk in _iter_body(response):
+                    body += chunk
+                    if len(body) > self.max_bytes:
+                        self._count("too_large")
+                        raise DownloadError(f"Resume is larger than {self.max_bytes} bytes")
+                    self._remaining(deadline)
+            except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+                if time.monotonic() >= deadline:
+                    self._count("deadline_exceeded")
+                    raise DownloadError(f"Download took longer than {self.deadline:g}s") from e
+                raise _Retryable(f"Connection dropped mid-download: {e}") from e
+            return bytes(body)
+
+
+def _iter_body(response):
+    """
+    Body chunks as they arrive. read1() returns after one socket read, so
+    a server sending a byte at a time can't hold a read open past the
+    deadline check the way filling a whole CHUNK_SIZE buffer would.
+    """
+    raw = response.raw
+    if not hasattr(raw, "read1"):
+        # Older urllib3 without read1()
+        yield from response.iter_content(CHUNK_SIZE)
+        return
+    while True:
+        chunk = raw.read1(CHUNK_SIZE, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+
+class AsyncResumeDownloader(ResumeDownloader):
+    """
+    ResumeDownloader for an asyncio event loop: the download is awaited,
+    so a slow storage server holds a socket rather than a thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client = None
+        self._client_loop = None
+
+    async def download(self, url: str) -> bytes:
+        """Body of url, or DownloadError once retries / deadline / size cap run out"""
+        start = time.monotonic()
+        self._count("downloads")
+        try:
+            body = await asyncio.wait_for(self._download(url), self.deadline)
+        except asyncio.TimeoutError:
+            self._count("deadline_exceeded")
+            self._count("failed")
+            raise DownloadError(f"Download took longer than {self.deadline:g}s")
+        except DownloadError:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._seconds += time.monotonic() - start
+        self._count("succeeded")
+        self._count("bytes", len(body))
+        return body
+
+    async def aclose(self) -> None:
+        """Close the pooled client (ASGI lifespan shutdown)"""
+        if self._client_loop is not asyncio.get_running_loop():
+            self._retire_client()
+            return
+        client, self._client, self._client_loop = self._client, None, None
+        await client.aclose()
+
+    def _get_client(self):
+        """One pooled client per event loop (and so per worker process)"""
+        if httpx is None:
+            raise DownloadError("httpx is required to download resumes in async mode")
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._retire_client()
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=self.pool_size),
+                timeout=httpx.Timeout(self.deadline, connect=self.connect_timeout),
+                follow_redirects=True,
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _retire_client(self) -> None:
+        """
+        Close the client of a previous event loop. Its connections belong
+        to that loop, so the close runs there; a closed loop has already
+        taken its transports down with it.
+        """
+        client, loop = self._client, self._client_loop
+        self._client = self._client_loop = None
+        if client is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def _download(self, url: str) -> bytes:
+        attempt = 0
+        while True:
+            self._count("attempts")
+            try:
+                return await self._fetch(url)
+            except _Retryable as e:
+                if attempt >= self.retries:
+                    raise DownloadError(str(e)) from e
+                delay = self.backoff * 2 ** attempt
+                attempt += 1
+                self._count("retries")
+                await asyncio.sleep(delay)
+
+    async def _fetch(self, url: str) -> bytes:
+        """One attempt: stream the body, enforcing the size cap"""
+        client = self._get_client()
+        try:
+            async with client.stream("GET", url) as response:
+                if response.status_code in RETRY_STATUSES:
+                    raise _Retryable(f"Server returned HTTP {response.status_code}")
+                if response.status_code >= 400:
+                    raise DownloadError(f"Server returned HTTP {response.status_code}")
+
+                declared = response.headers.get("Content-Length", "")
+                if declared.isdigit() and int(declared) > self.max_bytes:
+                    self._count("too_large")
+                    raise DownloadError(f"Resume is larger than {self.max_bytes} bytes")
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > self.max_bytes:
+                        self._count("too_large")
+                        raise DownloadError(f"Resume is larger than {self.max_bytes} bytes")
+                return bytes(body)
+        except httpx.TransportError as e:
+            raise _Retryable(f"Could not download: {e}") from e
+        except httpx.HTTPError as e:
+            raise DownloadError(str(e)) from e
+
+
+downloader = ResumeDownloader()
+async_downloader = AsyncResumeDownloader()
+
+
+def download_resume(url: str) -> bytes:
+    """Download a resume with the shared, pooled downloader"""
+    return downloader.download(url)
+
+
+def downloader_stats() -> dict:
+    """Sync downloader counters, plus the ASGI mode's under the "async" key"""
+    return {**downloader.stats(), "async": async_downloader.stats()}
+
+
+async def download_resume_async(url: str) -> bytes:
+    """Download a resume with the shared async downloader (ASGI mode)"""
+    return await async_downloader.download(url)
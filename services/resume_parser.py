@@ -5,27 +5,122 @@ Extracts structured information from raw resume text:
 - Education details
 - Experience / internship presence
 - Projects mentioned
+
+Also provides parse_resumes() for batch runs, and a CLI:
+    python -m services.resume_parser <pdf_dir | texts.jsonl> -o out.jsonl
 """
 
 import re
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from services.skill_keywords import MASTER_SKILLS
+from services.section_segmenter import segment_sections, section_span
+
+
+# ─────────────────────────────────────────────
+# Shared document
+# The resume is lowercased once and every extractor reads from the same
+# ResumeDocument instead of re-lowering / re-scanning the raw text.
+# ─────────────────────────────────────────────
+
+class ResumeDocument:
+    """Resume text normalized once, with a lazily built section index"""
+
+    __slots__ = ("text", "lower", "_sections")
+
+    def __init__(self, text: str):
+        self.text = text
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters expand when lowercased ("İ"); keep offsets aligned
+            lower = "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+        self.lower = lower
+        self._sections = None
+
+    @property
+    def sections(self) -> list:
+        """Section spans (name, heading_start, body_start, body_end), in order"""
+        if self._sections is None:
+            self._sections = segment_sections(self.lower)
+        return self._sections
+
+    def section_text(self, name: str):
+        """Body text of the first `name` section, or None"""
+        span = section_span(self.sections, name, len(self.text))
+        if span is None:
+            return None
+        return self.text[span[0]:span[1]]
+
+
+def _as_document(text) -> ResumeDocument:
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
+
+
+# ─────────────────────────────────────────────
+# Compiled skill matcher
+# All of MASTER_SKILLS is folded into one trie-shaped regex at import,
+# so a resume is scanned once instead of once per skill. The pattern
+# sits inside a lookahead so overlapping skills ("tailwind css" / "css")
+# are all reported, and keeps the same \b...\b rules as before.
+# ─────────────────────────────────────────────
 
+def _trie_regex(node: dict) -> str:
+    """Render a character trie as a regex alternation (longest first)"""
+    branches = [re.escape(ch) + _trie_regex(child)
+                for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A skill ends here but longer ones continue — try the longer ones first
+        return "(?:" + body + ")?"
+    return body
 
-def extract_skills(text: str) -> list:
-    """Match resume text against the master skill keyword list"""
-    text_lower = text.lower()
-    found = []
-    for skill in MASTER_SKILLS:
-        # Use word boundary matching to avoid partial matches
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found.append(skill)
-    return list(set(found))
 
+def _build_skill_matcher(skills) -> tuple:
+    unique = sorted(set(skills))
+    trie = {}
+    for skill in unique:
+        node = trie
+        for ch in skill:
+            node = node.setdefault(ch, {})
+        node[""] = True
 
-def extract_education(text: str) -> dict:
+    pattern = re.compile(r'(?=\b(' + _trie_regex(trie) + r')\b)')
+
+    # Skills that start at the same position as a longer skill are its
+    # prefixes ("c" / "c++", "react" / "react native"); the combined
+    # pattern only reports the longest one, so check these explicitly.
+    prefix_checks = {}
+    for skill in unique:
+        prefixes = [other for other in unique if other != skill and skill.startswith(other)]
+        if prefixes:
+            prefix_checks[skill] = [(p, re.compile(re.escape(p) + r'\b')) for p in prefixes]
+
+    return pattern, prefix_checks
+
+
+_SKILL_PATTERN, _SKILL_PREFIXES = _build_skill_matcher(MASTER_SKILLS)
+
+
+def extract_skills(text) -> list:
+    """Match resume text (str or ResumeDocument) against the master skill keyword list"""
+    text_lower = _as_document(text).lower
+    found = set()
+    for match in _SKILL_PATTERN.finditer(text_lower):
+        skill = match.group(1)
+        found.add(skill)
+        for prefix, prefix_pattern in _SKILL_PREFIXES.get(skill, ()):
+            if prefix_pattern.match(text_lower, match.start()):
+                found.add(prefix)
+    return list(found)
+
+
+def extract_education(text) -> dict:
     """Extract education branch and degree from resume text"""
-    text_lower = text.lower()
+    text_lower = _as_document(text).lower
 
     degree = "Unknown"
     if any(kw in text_lower for kw in ["b.tech", "btech", "b tech", "bachelor of technology"]):
@@ -66,23 +161,19 @@ def extract_education(text: str) -> dict:
     return {"degree": degree, "branch": branch, "cgpa": cgpa}
 
 
-def has_internship(text: str) -> bool:
+def has_internship(text) -> bool:
     """Detect internship mentions in resume"""
-    text_lower = text.lower()
+    text_lower = _as_document(text).lower
     keywords = ["intern", "internship", "trainee", "summer training", "industrial training"]
     return any(kw in text_lower for kw in keywords)
 
 
-def extract_projects(text: str) -> list:
+def extract_projects(text) -> list:
     """Extract project names/descriptions from resume"""
     projects = []
-    # Look for project sections
-    project_section = re.search(
-        r'(projects?|personal projects?|academic projects?)(.*?)(experience|education|skills|certifications|$)',
-        text, re.IGNORECASE | re.DOTALL
-    )
-    if project_section:
-        section_text = project_section.group(2)
+    # Look for the project section
+    section_text = _as_document(text).section_text("projects")
+    if section_text is not None:
         # Extract lines that look like project names (capitalized, short lines)
         lines = [l.strip() for l in section_text.split('\n') if l.strip()]
         for line in lines[:5]:  # limit to top 5
@@ -93,10 +184,11 @@ def extract_projects(text: str) -> list:
 
 def parse_resume(text: str) -> dict:
     """Main function: parse resume text into structured dict"""
-    skills = extract_skills(text)
-    education = extract_education(text)
-    internship = has_internship(text)
-    projects = extract_projects(text)
+    doc = ResumeDocument(text)
+    skills = extract_skills(doc)
+    education = extract_education(doc)
+    internship = has_internship(doc)
+    projects = extract_projects(doc)
 
     return {
         "skills": skills,
@@ -107,3 +199,168 @@ def parse_resume(text: str) -> dict:
         "projects": projects,
         "raw_text": text
     }
+
+
+# ─────────────────────────────────────────────
+# Batch parsing
+# ─────────────────────────────────────────────
+
+def _parse_item(item) -> dict:
+    """Parse one batch item: resume text, or raw PDF bytes"""
+    if isinstance(item, _UnreadableInput):
+        raise ValueError(item.message)
+    if isinstance(item, (bytes, bytearray)):
+        from services.pdf_extractor import extract_pdf_text
+        # Already inside a pool worker — don't fan out again per page
+        item = extract_pdf_text(bytes(item), workers=1)["text"]
+    return parse_resume(item)
+
+
+def _parse_chunk(chunk: list) -> list:
+    """Pool task: parse a chunk, capturing failures per item"""
+    outcomes = []
+    for item in chunk:
+        try:
+            outcomes.append((True, _parse_item(item)))
+        except Exception as e:
+            outcomes.append((False, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+def _batch_entries(start: int, outcomes: list):
+    for offset, (ok, value) in enumerate(outcomes):
+        if ok:
+            yield {"index": start + offset, "result": value}
+        else:
+            yield {"index": start + offset, "error": value}
+
+
+def parse_resumes(items, workers: int = None, chunksize: int = 16):
+    """
+    Parse many resumes through a process pool.
+
+    Args:
+        items     : iterable of resume texts (str) or PDF contents (bytes);
+                    consumed lazily, so it can be a generator over a large cohort
+        workers   : pool size (default: CPU count, 1 = parse in this process)
+        chunksize : items sent to a worker per task
+
+    Yields, in input order:
+        {"index": i, "result": <parse_resume dict>}   or
+        {"index": i, "error": "ExceptionType: message"}
+
+    A failing document only produces an error entry; the batch carries on.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = iter(items)
+    index = 0
+
+    if workers <= 1:
+        while True:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                return
+            yield from _batch_entries(index, _parse_chunk(chunk))
+            index += len(chunk)
+
+    # Bounded window of chunks in flight: results stream back in order
+    # and memory stays flat however long the input is.
+    pool = ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+    try:
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                in_flight.append(pool.submit(_parse_chunk, chunk))
+            if not in_flight:
+                return
+            outcomes = in_flight.popleft().result()
+            yield from _batch_entries(index, outcomes)
+            index += len(outcomes)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ─────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────
+
+class _UnreadableInput:
+    """Stands in for an input record that could not be read; parses to an error entry"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _read_batch_input(path: str):
+    """
+    Yield (id, item) from a directory of PDFs or a JSONL of texts. A file
+    or line that can't be read yields an _UnreadableInput item, so it is
+    reported as an error entry in its place and the run carries on.
+    """
+    import json
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(".pdf"):
+                try:
+                    with open(os.path.join(path, name), "rb") as f:
+                        yield name, f.read()
+                except OSError as e:
+                    yield name, _UnreadableInput(f"Could not read {name}: {e}")
+        return
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line.decode("utf-8"))
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as e:
+                yield line_no, _UnreadableInput(f"Line {line_no}: invalid record ({e})")
+                continue
+            text = record.get("resume_text", record.get("text", ""))
+            yield record.get("id", line_no), text
+
+
+def main(argv=None) -> None:
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Batch-parse resumes into JSONL")
+    parser.add_argument("input", help="directory of PDFs, or JSONL with resume_text/text (+ optional id)")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL path (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    ids = deque()
+
+    def items():
+        for item_id, item in _read_batch_input(args.input):
+            ids.append(item_id)
+            yield item
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    parsed = failed = 0
+    try:
+        for entry in parse_resumes(items(), workers=args.workers, chunksize=args.chunksize):
+            record = {"id": ids.popleft()}
+            if "error" in entry:
+                record["error"] = entry["error"]
+                failed += 1
+            else:
+                record.update({k: v for k, v in entry["result"].items() if k != "raw_text"})
+                parsed += 1
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"[DONE] Parsed: {parsed} | Failed: {failed}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Section Segmenter
+Splits lowercased resume text into heading sections in linear time:
+- One left-to-right pass of a literal-only heading pattern (no nested
+  quantifiers, nothing to backtrack into)
+- One pass over the heading hits to resolve each body's end
+Total work is O(len(text)) regardless of content, so adversarial
+uploads can't pin a worker the way the old lazy DOTALL regex could.
+"""
+
+import re
+from collections import namedtuple
+
+# "project" also covers "projects", "personal projects", "academic projects"
+_HEADING_PATTERN = re.compile(r'project|experience|education|skills|certifications')
+
+Section = namedtuple("Section", ["name", "heading_start", "body_start", "body_end"])
+
+
+def segment_sections(lower: str) -> list:
+    """
+    Find every heading keyword in already-lowercased text.
+
+    Returns a list of Section spans in document order. A body starts right
+    after its heading word (after the "s" of "projects") and ends where the
+    next heading begins, or at the end of the text.
+    """
+    hits = []
+    for m in _HEADING_PATTERN.finditer(lower):
+        name, body_start = m.group(0), m.end()
+        if name == "project":
+            name = "projects"
+            if lower.startswith("s", body_start):
+                body_start += 1
+        hits.append((name, m.start(), body_start))
+
+    sections = []
+    for i, (name, heading_start, body_start) in enumerate(hits):
+        # Hits never overlap, so the only heading that can start inside a
+        # body_start is one beginning on the "s" of "projects": the end is
+        # always hit i+1 or i+2, never a longer scan.
+        body_end = len(lower)
+        for following in hits[i + 1:i + 3]:
+            if following[1] >= body_start:
+                body_end = following[1]
+                break
+        sections.append(Section(name, heading_start, body_start, body_end))
+    return sections
+
+
+def section_span(sections: list, name: str, length: int):
+    """
+    (start, end) of the body of the first `name` section, or None.
+
+    Repeated mentions of the same heading (e.g. "project" inside the
+    projects section) don't end it; the next different heading does.
+    """
+    body_start = None
+    for section in sections:
+        if body_start is None:
+            if section.name == name:
+                body_start = section.body_start
+        elif section.heading_start >= body_start and section.name != name:
+            return body_start, section.heading_start
+    if body_start is None:
+        return None
+    return body_start, length
@@ -0,0 +1,116 @@
+"""
+Skill Taxonomy
+Compiles skill_data.json + course_map.json once at load time so gap
+analysis is a handful of integer operations per career:
+- Every skill gets an integer id (ids follow sorted skill names)
+- Each career's required skills become one bitmask
+- Good-to-have skills keep their listed order, each with its bit
+- Course entries are resolved per skill id up front
+"""
+
+
+class SkillTaxonomy:
+    """Bitmask-indexed view of the career skill taxonomy"""
+
+    def __init__(self, skill_data: dict, course_map: dict):
+        names = set()
+        for info in skill_data.values():
+            names.update(info.get("required_skills", []))
+            names.update(s.lower() for s in info.get("good_to_have", []))
+
+        # Sorted ids mean decoding a mask yields names already sorted
+        self.skill_names = sorted(names)
+        self.skill_ids = {name: i for i, name in enumerate(self.skill_names)}
+
+        self.careers = list(skill_data)
+        self.required_mask = {}
+        self.good_to_have = {}
+        self.improvement_areas = {}
+        for career, info in skill_data.items():
+            mask = 0
+            for skill in info.get("required_skills", []):
+                mask |= 1 << self.skill_ids[skill]
+            self.required_mask[career] = mask
+            self.good_to_have[career] = [
+                (skill, 1 << self.skill_ids[skill.lower()])
+                for skill in info.get("good_to_have", [])
+            ]
+            self.improvement_areas[career] = info.get("improvement_areas", [])
+
+        self._courses = {}
+        for name, skill_id in self.skill_ids.items():
+            if name in course_map:
+                entry = course_map[name]
+                self._courses[skill_id] = {
+                    "skill": name,
+                    "course": entry["course"],
+                    "platform": entry["platform"],
+                    "url": entry["url"],
+                }
+        # Bonus courses look good-to-have skills up by their listed spelling
+        self._bonus_courses = {}
+        for entries in self.good_to_have.values():
+            for skill, _ in entries:
+                if skill in course_map:
+                    entry = course_map[skill]
+                    self._bonus_courses[skill] = {
+                        "skill": skill,
+                        "course": entry["course"],
+                        "platform": entry["platform"],
+                        "url": entry["url"],
+                    }
+
+    def student_mask(self, student_skills) -> int:
+        """Bitmask of the student's (lowercased) skills that the taxonomy knows"""
+        mask = 0
+        for skill in student_skills:
+            skill_id = self.skill_ids.get(skill.lower())
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    def decode(self, mask: int) -> list:
+        """Skill names for the set bits of a mask, in sorted order"""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.skill_names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def courses_for(self, mask: int) -> list:
+        """Course entries for every skill in the mask that has one"""
+        courses = []
+        while mask:
+            low = mask & -mask
+            entry = self._courses.get(low.bit_length() - 1)
+            if entry is not None:
+                courses.append(dict(entry))
+            mask ^= low
+        return courses
+
+    def bonus_courses(self, skills: list) -> list:
+        """Course entries for good-to-have skills (listed spelling) that have one"""
+        return [dict(self._bonus_courses[s]) for s in skills if s in self._bonus_courses]
+
+    def analyze(self, career: str, student_mask: int) -> dict:
+        """Matches, gaps and missing good-to-have skills for one career"""
+        required = self.required_mask.get(career, 0)
+        return {
+            "skills_you_have": self.decode(required & student_mask),
+            "skill_gaps": self.decode(required & ~student_mask),
+            "gap_mask": required & ~student_mask,
+            "missing_good_to_have": [
+                skill for skill, bit in self.good_to_have.get(career, []) if not bit & student_mask
+            ],
+        }
+
+    def analyze_all(self, student_mask: int) -> dict:
+        """Matches and gaps for every career in the taxonomy"""
+        return {
+            career: {
+                "skills_you_have": self.decode(required & student_mask),
+                "skill_gaps": self.decode(required & ~student_mask),
+            }
+            for career, required in self.required_mask.items()
+        }
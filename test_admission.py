@@ -0,0 +1,177 @@
+"""
+Admission Control Tests
+services/admission limiters and the 503 path on the heavy endpoints:
+- A full wait queue and a wait that can't fit the deadline are shed at once
+- Queued callers get the slot when it frees up; callers without a deadline
+  are never shed
+- An overloaded endpoint answers 503 + Retry-After fast while /health stays up
+- A batch holds its requests slot until its stream ends, and items shed
+  from the inference queue come back as 503 lines with retry_after
+- A background job shed by a budget fails with code 503, not 500
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services import admission, metrics
+from services.admission import Limiter, Overloaded
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+STUDENT = {"resume_text": "Skills: Python, SQL, Pandas", "qa_responses": {"interests": "data science"}}
+
+
+def rejection(limiter: Limiter, deadline: float) -> str:
+    try:
+        limiter.acquire(deadline)
+    except Overloaded as e:
+        return e.reason
+    limiter.release(0.0)
+    return ""
+
+
+def hold(limiter: Limiter, release: threading.Event) -> threading.Thread:
+    """Take a slot on another thread until release is set"""
+    taken = threading.Event()
+
+    def run():
+        with limiter.slot(deadline=time.monotonic() + 5):
+            taken.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    taken.wait(5)
+    return thread
+
+
+def test_queue_bound_and_deadline_shedding():
+    limiter = Limiter("test", slots=1, queue_size=1)
+    release = threading.Event()
+    holder = hold(limiter, release)
+    try:
+        # One caller may queue; it gets the slot once the holder is done
+        waiter_result = []
+        waiter = threading.Thread(target=lambda: waiter_result.append(rejection(limiter, time.monotonic() + 5)))
+        waiter.start()
+        while limiter.waiting == 0:
+            time.sleep(0.001)
+
+        start = time.monotonic()
+        assert rejection(limiter, time.monotonic() + 5) == "queue_full"
+        assert time.monotonic() - start < 0.1
+    finally:
+        release.set()
+        holder.join()
+        waiter.join()
+    assert waiter_result == [""]
+
+    # Slots held for ~2s on average: a 1s deadline can't be met, so shed up front
+    limiter.avg_hold = 2.0
+    release = threading.Event()
+    holder = hold(limiter, release)
+    try:
+        start = time.monotonic()
+        assert rejection(limiter, time.monotonic() + 1.0) == "deadline"
+        assert time.monotonic() - start < 0.1
+
+        # With no estimate to go on, the caller waits out its deadline
+        limiter.avg_hold = 0.0
+        start = time.monotonic()
+        assert rejection(limiter, time.monotonic() + 0.2) == "timeout"
+        assert 0.15 < time.monotonic() - start < 1.0
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_callers_without_deadline_wait():
+    limiter = Limiter("test", slots=1, queue_size=0)
+    release = threading.Event()
+    holder = hold(limiter, release)
+    threading.Timer(0.2, release.set).start()
+    start = time.monotonic()
+    assert rejection(limiter, None) == ""
+    assert time.monotonic() - start >= 0.15
+    holder.join()
+
+
+def test_overloaded_endpoint_sheds_fast_and_health_stays_up():
+    from app import app
+    client = app.test_client()
+    limiter = admission.requests_limiter
+    original_slots = limiter.slots
+    limiter.slots = 1
+    release = threading.Event()
+    holder = hold(limiter, release)
+    try:
+        before = metrics.admission_rejected.snapshot().get("requests\x00queue_full", 0)
+        start = time.monotonic()
+        busy = client.post("/api/generate-guidance", json={"resume_text": "python", "qa_responses": {"a": "b"}})
+        assert time.monotonic() - start < 0.5
+        assert busy.status_code == 503 and int(busy.headers["Retry-After"]) >= 1
+        assert metrics.admission_rejected.snapshot()["requests\x00queue_full"] == before + 1
+
+        assert client.get("/health").status_code == 200
+    finally:
+        release.set()
+        holder.join()
+        limiter.slots = original_slots
+
+
+@requires_model
+def test_batch_is_admitted_and_shed_items_are_503_lines():
+    from app import app
+    client = app.test_client()
+    requests_limiter, inference_limiter = admission.requests_limiter, admission.inference_limiter
+    original = requests_limiter.slots, inference_limiter.slots, inference_limiter.avg_hold
+    requests_limiter.slots = 1
+    try:
+        # The stream holds the only requests slot until it is closed
+        response = client.post("/api/generate-guidance/batch", json=[STUDENT], buffered=False)
+        assert response.status_code == 200 and requests_limiter.in_use == 1
+        busy = client.post("/api/generate-guidance/batch", json=[STUDENT])
+        assert busy.status_code == 503 and int(busy.headers["Retry-After"]) >= 1
+        assert json.loads(response.get_data())["status"] == "success"
+        response.close()
+        assert requests_limiter.in_use == 0
+
+        # Inference slots held for ~10s on average: the chunk can't be served in time
+        inference_limiter.slots, inference_limiter.avg_hold = 1, 10.0
+        release = threading.Event()
+        holder = hold(inference_limiter, release)
+        try:
+            response = client.post("/api/generate-guidance/batch", json=[STUDENT, STUDENT])
+        finally:
+            release.set()
+            holder.join()
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [(line["index"], line["code"]) for line in lines] == [(0, 503), (1, 503)]
+        assert all(line["retry_after"] >= 1 for line in lines)
+    finally:
+        requests_limiter.slots, inference_limiter.slots, inference_limiter.avg_hold = original
+
+
+def test_shed_job_fails_with_503():
+    from routes import web
+
+    def shed(pdf_bytes, form):
+        raise Overloaded("pdf", "timeout", 4)
+
+    original = web.run_analysis
+    web.run_analysis = shed
+    try:
+        code, body = web._analysis_job({"pdf_bytes": b"", "form": {}})
+    finally:
+        web.run_analysis = original
+    assert code == 503 and body["retry_after"] == 4
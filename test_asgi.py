@@ -0,0 +1,259 @@
+"""
+ASGI Mode Tests
+asgi.py against the WSGI Flask app it wraps, through httpx's ASGI transport:
+- /api/generate-guidance with resume_text or resume_url returns the same
+  JSON as the WSGI app, failed downloads the same 422; an invalid top_k (400)
+  is rejected without downloading
+- /api/analyze, /health and the streamed batch endpoint pass through
+- Concurrent slow downloads overlap instead of queueing behind threads
+- Bodies over MAX_CONTENT_LENGTH get 413, chunked or not, in both modes
+- The lifespan handshake completes and WebSocket connections are closed
+
+Needs httpx and a trained model.
+"""
+
+import sys
+import os
+import asyncio
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from test_job_queue import make_pdf
+
+httpx = pytest.importorskip("httpx")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESUME_LINES = ["Skills: Python, Pandas, SQL, Machine Learning", "Projects", "Movie recommendation system"]
+PDF_BYTES = make_pdf(RESUME_LINES)
+QA = {"interests": "data science", "known_skills": "python, numpy"}
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+
+class SlowStorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(SlowStorageHandler.delay)
+        status, body = (200, PDF_BYTES) if self.path.startswith("/resume.pdf") else (404, b"missing")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_storage() -> tuple:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowStorageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def asgi_client():
+    import asgi
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi.app), base_url="http://testserver")
+
+
+def test_generate_guidance_matches_wsgi():
+    from app import app
+    wsgi = app.test_client()
+    server, base = start_storage()
+    requests_ = [
+        {"resume_text": "\n".join(RESUME_LINES), "qa_responses": QA},
+        {"resume_url": base + "/resume.pdf", "qa_responses": QA, "top_k": 2},
+        {"resume_url": base + "/missing.pdf", "qa_responses": QA},
+        # Invalid top_k: the 400 names top_k, not the missing file, so nothing was downloaded
+        {"resume_url": base + "/missing.pdf", "qa_responses": QA, "top_k": 0},
+        {"resume_url": base + "/resume.pdf"},
+        {},
+    ]
+
+    async def run():
+        async with asgi_client() as client:
+            return [await client.post("/api/generate-guidance", json=body) for body in requests_]
+
+    try:
+        SlowStorageHandler.delay = 0.0
+        responses = asyncio.run(run())
+        for body, response in zip(requests_, responses):
+            expected = wsgi.post("/api/generate-guidance", json=body)
+            assert response.status_code == expected.status_code, (body, response.text)
+            assert response.json() == expected.get_json(), body
+    finally:
+        server.shutdown()
+    assert [r.status_code for r in responses] == [200, 200, 422, 400, 400, 400]
+    assert "top_k" in responses[3].json()["error"]
+
+
+def test_other_routes_pass_through():
+    from app import app
+    wsgi = app.test_client()
+    form = {"interests": "data science", "known_skills": "python", "career_goal": "data scientist"}
+    batch = "".join(json.dumps({"resume_text": "python sql", "qa_responses": QA, "top_k": k}) + "\n" for k in (1, 2, 3))
+
+    async def run():
+        async with asgi_client() as client:
+            health = await client.get("/health")
+            analyze = await client.post("/api/analyze", data=form, files={"resume": ("r.pdf", PDF_BYTES, "application/pdf")})
+            streamed = await client.post(
+                "/api/generate-guidance/batch", content=batch, headers={"Content-Type": "application/x-ndjson"}
+            )
+            return health, analyze, streamed
+
+    health, analyze, streamed = asyncio.run(run())
+    assert health.status_code == 200 and health.json()["status"] == "ok"
+    expected = wsgi.post("/api/analyze", data=dict(form, resume=(io.BytesIO(PDF_BYTES), "r.pdf")))
+    assert analyze.status_code == 200 and analyze.json() == expected.get_json()
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [len(line["guidance"]["top_career_recommendations"]) for line in lines] == [1, 2, 3]
+
+
+def test_chunked_bodies_are_read():
+    """No Content-Length: the body arrives in chunks and must still reach the view"""
+    from app import app
+    wsgi = app.test_client()
+    server, base = start_storage()
+    batch = "".join(json.dumps({"resume_text": "python sql", "qa_responses": QA, "top_k": k}) + "\n" for k in (1, 2))
+    single = {"resume_text": "\n".join(RESUME_LINES), "qa_responses": QA}
+    downloaded = {"resume_url": base + "/resume.pdf", "qa_responses": QA}
+
+    def chunked(text: str):
+        async def chunks():
+            data = text.encode()
+            for i in range(0, len(data), 7):
+                yield data[i:i + 7]
+        return chunks()
+
+    async def run():
+        async with asgi_client() as client:
+            return [
+                await client.post("/api/generate-guidance/batch", content=chunked(batch),
+                                  headers={"Content-Type": "application/x-ndjson"}),
+                await client.post("/api/generate-guidance", content=chunked(json.dumps(single)),
+                                  headers={"Content-Type": "application/json"}),
+                await client.post("/api/generate-guidance", content=chunked(json.dumps(downloaded)),
+                                  headers={"Content-Type": "application/json"}),
+            ]
+
+    try:
+        streamed, posted, fetched = asyncio.run(run())
+    finally:
+        server.shutdown()
+    for response in (streamed, posted, fetched):
+        assert "content-length" not in response.request.headers
+        assert response.status_code == 200, response.text
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [line["status"] for line in lines] == ["success", "success"]
+    assert posted.json() == wsgi.post("/api/generate-guidance", json=single).get_json()
+    assert fetched.json() == posted.json()
+
+
+def test_large_bodies_are_rejected(monkeypatch):
+    from app import app
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 64)
+    body = json.dumps({"resume_text": "python sql " * 20, "qa_responses": QA})
+
+    async def chunks():
+        yield body.encode()
+
+    async def run():
+        async with asgi_client() as client:
+            return [
+                await client.post("/api/generate-guidance", content=body, headers={"Content-Type": "application/json"}),
+                await client.post("/api/generate-guidance", content=chunks(), headers={"Content-Type": "application/json"}),
+                await client.post("/api/generate-guidance/batch", content=body,
+                                  headers={"Content-Type": "application/x-ndjson"}),
+            ]
+
+    for response in asyncio.run(run()):
+        assert response.status_code == 413 and "64 bytes" in response.json()["error"]
+    assert app.test_client().post("/api/generate-guidance", data=body, content_type="application/json").status_code == 413
+
+
+def test_lifespan_and_websocket_scopes():
+    import asgi
+    sent = []
+
+    def messages(*incoming):
+        queue = list(incoming)
+
+        async def receive():
+            return queue.pop(0)
+        return receive
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await asgi.app({"type": "lifespan"}, messages({"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}), send)
+        await asgi.app({"type": "websocket", "path": "/ws"}, messages({"type": "websocket.connect"}), send)
+
+    asyncio.run(run())
+    assert [m["type"] for m in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete", "websocket.close"]
+
+
+def test_failure_after_headers_drops_the_connection():
+    """A stream that breaks halfway must not end like a complete response"""
+    import asgi
+
+    def broken_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "application/x-ndjson")])
+        yield b'{"index": 0}\n'
+        raise OSError("backend went away")
+
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/stream", "query_string": b"", "headers": []}
+    original = asgi.flask_app
+    asgi.flask_app = broken_app
+    try:
+        with pytest.raises(RuntimeError) as raised:
+            asyncio.run(asgi.app(scope, receive, send))
+    finally:
+        asgi.flask_app = original
+    assert isinstance(raised.value.__cause__, OSError)
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.body"]
+    assert sent[1]["more_body"] is True
+
+
+def test_slow_downloads_overlap():
+    import asgi
+    server, base = start_storage()
+    n, delay = 32, 0.5
+
+    async def run():
+        async with asgi_client() as client:
+            start = time.monotonic()
+            responses = await asyncio.gather(*(
+                client.post("/api/generate-guidance", json={"resume_url": f"{base}/resume.pdf?{i}", "qa_responses": QA})
+                for i in range(n)
+            ))
+            return time.monotonic() - start, responses
+
+    try:
+        SlowStorageHandler.delay = delay
+        elapsed, responses = asyncio.run(run())
+    finally:
+        SlowStorageHandler.delay = 0.0
+        server.shutdown()
+    assert all(r.status_code == 200 for r in responses)
+    # Held threads would need n * delay / ASYNC_PDF_THREADS seconds at best
+    assert elapsed < n * delay / asgi.ASYNC_PDF_THREADS, elapsed
@@ -0,0 +1,117 @@
+"""
+Batch Guidance Tests
+POST /api/generate-guidance/batch through the Flask test client:
+- Results stream back in input order, each identical to the single endpoint
+- Bad items become per-item error lines without failing the batch
+- An invalid top_k is a 400, returned before the resume is downloaded, in the
+  single and batch endpoints alike
+- A body that isn't one well-formed array ends the batch with an error
+  line (the decoder itself is covered by test_json_stream.py)
+- Memory stays flat as the batch grows
+
+Needs a trained model.
+"""
+
+import sys
+import os
+import io
+import json
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import app
+from routes import guidance as guidance_routes
+from services import guidance_engine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+client = app.test_client()
+
+STUDENT = {
+    "resume_text": "Skills: Python, Pandas, SQL, Machine Learning\nProjects\nMovie recommendation system",
+    "qa_responses": {"interests": "data science", "known_skills": "python, numpy"},
+}
+
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+
+def post_batch(body: bytes, content_type: str) -> list:
+    response = client.post("/api/generate-guidance/batch", data=body, content_type=content_type)
+    assert response.status_code == 200 and response.mimetype == "application/x-ndjson"
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+@requires_model
+def test_results_match_single_requests_in_order():
+    items = [
+        STUDENT,
+        {"qa_responses": {}},
+        dict(STUDENT, top_k=1),
+        dict(STUDENT, top_k=0),
+        dict(STUDENT, resume_text="React, JavaScript, HTML, CSS frontend developer", top_k="all"),
+    ]
+    lines = post_batch(json.dumps(items).encode(), "application/json")
+    assert [line["index"] for line in lines] == list(range(len(items)))
+    assert [line.get("code") for line in lines] == [None, 400, None, 400, None]
+
+    for item, line in zip(items, lines):
+        single = client.post("/api/generate-guidance", json=item)
+        line.pop("index")
+        if single.status_code == 200:
+            assert line == single.get_json()
+        else:
+            assert line["status"] == "error" and line["error"] == single.get_json()["error"]
+
+
+@requires_model
+def test_ndjson_upload_reports_bad_lines():
+    body = json.dumps(STUDENT) + "\n\n{not json\n" + json.dumps(dict(STUDENT, top_k=2)) + "\n"
+    lines = post_batch(body.encode(), "application/x-ndjson")
+    assert [(line["index"], line["status"]) for line in lines] == [(0, "success"), (1, "error"), (2, "success")]
+    assert lines[1]["code"] == 400
+    assert len(lines[2]["guidance"]["top_career_recommendations"]) == 2
+
+
+@requires_model
+def test_malformed_array_ends_with_an_error_line():
+    lines = post_batch(b"[" + json.dumps(STUDENT).encode() + b",]", "application/json")
+    assert [(line["index"], line.get("code")) for line in lines] == [(0, None), (1, 400)]
+    assert lines[1]["error"].startswith("Invalid JSON array")
+
+
+def test_invalid_top_k_is_rejected_before_download(monkeypatch):
+    downloads = []
+    monkeypatch.setattr(guidance_routes, "download_resume", lambda url: downloads.append(url) or b"")
+    student = {"resume_url": "https://storage.example/resume.pdf", "qa_responses": STUDENT["qa_responses"]}
+    for top_k in (0, -3, "three", 2.5, True):
+        response = client.post("/api/generate-guidance", json=dict(student, top_k=top_k))
+        assert response.status_code == 400 and "top_k" in response.get_json()["error"]
+        entry = guidance_routes._prepare_batch_item(dict(student, top_k=top_k))
+        assert entry["code"] == 400 and "top_k" in entry["error"]
+    assert downloads == []
+
+
+@requires_model
+def test_memory_stays_flat_as_the_batch_grows():
+    original = guidance_engine.PREDICTION_CACHE_SIZE
+    guidance_engine.PREDICTION_CACHE_SIZE = 0  # a filling cache would look like growth
+    try:
+        peaks = []
+        for n in (250, 1000):
+            body = "".join(json.dumps(STUDENT) + "\n" for _ in range(n)).encode()
+            tracemalloc.start()
+            response = client.post(
+                "/api/generate-guidance/batch", input_stream=io.BytesIO(body),
+                content_type="application/x-ndjson", buffered=False,
+            )
+            assert sum(chunk.count(b"\n") for chunk in response.response) == n
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    finally:
+        guidance_engine.PREDICTION_CACHE_SIZE = original
+    # 4x the items, roughly the same peak
+    assert peaks[1] < peaks[0] * 1.5, peaks
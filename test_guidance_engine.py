@@ -0,0 +1,223 @@
+"""
+Guidance Engine Tests
+services/guidance_engine ranking and result assembly:
+- Top-k selection matches a stable proba.argsort()[-k:][::-1], tied
+  probabilities included (ties: higher label index first), on both the
+  sort and the partial-selection path; one row costs about what the
+  original per-row argsort did
+- Prediction cache keys fold away case, whitespace and skill order, but
+  not the model version or top_k
+- A reload to a new version never serves the old version's cached results
+- top_k accepts 1.. (clamped to the label count) and "all", and nothing else
+- The bitmask skill-gap analysis gives the same guidance as the original
+  set-based code, mixed-case and unknown student skills included
+"""
+
+import sys
+import os
+import json
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from services import guidance_engine
+from services.cache import LRUCache
+from services.skill_taxonomy import SkillTaxonomy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+N_LABELS = 15
+
+with open(os.path.join(BASE_DIR, "ml/skill_data.json"), encoding="utf-8") as f:
+    SKILL_DATA = json.load(f)
+with open(os.path.join(BASE_DIR, "ml/course_map.json"), encoding="utf-8") as f:
+    COURSE_MAP = json.load(f)
+
+
+class FixedModel:
+    """Stand-in classifier that always ranks one career first"""
+
+    def __init__(self, favourite: str):
+        self.classes_ = np.array(sorted(SKILL_DATA))
+        self.proba = np.full(len(self.classes_), 0.01)
+        self.proba[list(self.classes_).index(favourite)] = 0.9
+
+    def predict_proba(self, texts):
+        return np.tile(self.proba, (len(texts), 1))
+
+
+def fixed_artifacts(favourite: str, version: str) -> guidance_engine.ModelArtifacts:
+    return guidance_engine.ModelArtifacts(FixedModel(favourite), SKILL_DATA, COURSE_MAP, version)
+
+
+@pytest.fixture
+def stand_in_engine(monkeypatch):
+    """A ModelHolder serving whatever the test puts in loaded[0], with a fresh prediction cache"""
+    loaded = []
+    holder = guidance_engine.ModelHolder(loader=lambda base_dir: loaded[0])
+    monkeypatch.setattr(guidance_engine, "_holder", holder)
+    monkeypatch.setattr(guidance_engine, "prediction_cache", LRUCache("prediction", maxsize=64))
+    return holder, loaded
+
+
+def baseline_top_k(row: np.ndarray, k: int) -> list:
+    """
+    The original per-row ranking. Its default quicksort was a stable
+    insertion sort for 15 labels; numpy >= 1.25 may dispatch to a SIMD
+    sort with arbitrary tie order, so the stable kind pins what it did.
+    """
+    return list(row.argsort(kind="stable")[-k:][::-1])
+
+
+def test_top_k_matches_baseline_with_ties():
+    rng = np.random.default_rng(7)
+    # Few distinct values, so most rows tie at and around the k-th place
+    proba = rng.integers(0, 4, size=(2000, N_LABELS)).astype(float) / 4
+    proba[:5] = 0.0
+    proba[5:10] = 1 / N_LABELS
+    for k in (1, 2, 3, 5, N_LABELS - 1, N_LABELS):
+        selected = guidance_engine._top_k_indices(proba, k)
+        assert selected.shape == (len(proba), k)
+        for row in range(len(proba)):
+            assert list(selected[row]) == baseline_top_k(proba[row], k), (k, proba[row])
+
+
+def test_top_k_matches_baseline_without_ties():
+    proba = np.random.default_rng(3).dirichlet(np.ones(N_LABELS), size=500)
+    for k in (1, 3, N_LABELS):
+        selected = guidance_engine._top_k_indices(proba, k)
+        assert [list(row) for row in selected] == [baseline_top_k(row, k) for row in proba]
+
+
+def test_top_k_partition_path_matches_baseline():
+    rng = np.random.default_rng(5)
+    n_labels = guidance_engine._SORT_MAX_LABELS * 3
+    proba = rng.integers(0, 6, size=(300, n_labels)).astype(float) / 6
+    for k in (1, 3, 40, n_labels - 1):
+        selected = guidance_engine._top_k_indices(proba, k)
+        assert [list(row) for row in selected] == [baseline_top_k(row, k) for row in proba], k
+
+
+def test_top_k_single_row_cost():
+    proba = np.random.default_rng(1).dirichlet(np.ones(N_LABELS), size=1)
+    n = 20000
+    ours = min(timeit.repeat(lambda: guidance_engine._top_k_indices(proba, 3), number=n, repeat=3)) / n
+    original = min(timeit.repeat(lambda: proba[0].argsort()[-3:][::-1], number=n, repeat=3)) / n
+    assert ours < max(original * 2.5, 5e-6), f"{ours * 1e6:.2f} µs vs {original * 1e6:.2f} µs"
+
+
+def test_prediction_key_canonicalisation():
+    key = guidance_engine._prediction_key
+    base = key("v1", "Python  SQL\nData", ["SQL", "python"], 3)
+    assert key("v1", "python sql data", ["python", "sql", "Python"], 3) == base
+    assert key("v1", " PYTHON\tsql   data ", ["sql", "PYTHON"], 3) == base
+    assert key("v2", "python sql data", ["python", "sql"], 3) != base
+    assert key("v1", "python sql data", ["python", "sql"], 4) != base
+    assert key("v1", "python sql data", ["python"], 3) != base
+    assert key("v1", "python sqldata", ["python", "sql"], 3) != base
+
+
+def test_reload_never_serves_previous_versions_cache(stand_in_engine):
+    holder, loaded = stand_in_engine
+    careers = sorted(SKILL_DATA)
+    loaded.append(fixed_artifacts(careers[0], "v1"))
+
+    first = guidance_engine.get_guidance("python sql", ["python"])
+    again = guidance_engine.get_guidance("Python  SQL", ["PYTHON"])
+    assert again == first and guidance_engine.prediction_cache.stats()["hits"] == 1
+    assert first["model_version"] == "v1"
+    assert first["top_career_recommendations"][0]["career"] == careers[0]
+
+    loaded[0] = fixed_artifacts(careers[1], "v2")
+    assert holder.reload()["status"] == "reloaded"
+    assert guidance_engine.prediction_cache_stats()["model_version"] == "v2"
+    after = guidance_engine.get_guidance("python sql", ["python"])
+    assert after["model_version"] == "v2"
+    assert after["top_career_recommendations"][0]["career"] == careers[1]
+
+    # A request that took the old artifacts before the swap caches under the old key
+    key = guidance_engine._prediction_key
+    guidance_engine.prediction_cache.set(key("v1", "python sql", ["python"], 3), first)
+    assert guidance_engine.get_guidance("python sql", ["python"])["model_version"] == "v2"
+
+
+def test_top_k_bounds():
+    resolve, validate = guidance_engine.resolve_top_k, guidance_engine.validate_top_k
+    assert [resolve(k, N_LABELS) for k in (1, 3, "2", " 4 ", N_LABELS, N_LABELS + 5, 10 ** 9)] == \
+        [1, 3, 2, 4, N_LABELS, N_LABELS, N_LABELS]
+    assert resolve("all", N_LABELS) == resolve(None, N_LABELS) == N_LABELS
+    assert validate("all") is None and validate(7) == 7
+    for bad in (0, -1, "0", "-2", "ALL", "three", 2.0, "2.5", True, [3], {}):
+        with pytest.raises(ValueError):
+            validate(bad)
+
+
+def course(skill: str) -> dict:
+    entry = COURSE_MAP[skill]
+    return {"skill": skill, "course": entry["course"], "platform": entry["platform"], "url": entry["url"]}
+
+
+def baseline_skill_analysis(top_careers: list, student_skills: list) -> dict:
+    """The original set-based skill analysis, kept here as the reference"""
+    primary_career = top_careers[0]
+    career_info = SKILL_DATA.get(primary_career, {})
+    required_skills = set(career_info.get("required_skills", []))
+    good_to_have = career_info.get("good_to_have", [])
+    student_skill_set = set(s.lower() for s in student_skills)
+
+    skill_gaps = sorted(list(required_skills - student_skill_set))
+    missing_good_to_have = [s for s in good_to_have if s.lower() not in student_skill_set]
+    return {
+        "skills_you_have": sorted(list(required_skills & student_skill_set)),
+        "skill_gaps": skill_gaps,
+        "good_to_have_skills": missing_good_to_have,
+        "improvement_areas": career_info.get("improvement_areas", []),
+        "recommended_courses": [course(gap) for gap in skill_gaps if gap in COURSE_MAP],
+        "bonus_courses_for_growth": [course(s) for s in missing_good_to_have[:2] if s in COURSE_MAP],
+        "alternatives": [
+            (c, sorted(list(set(SKILL_DATA[c]["required_skills"]) & student_skill_set)),
+             sorted(list(set(SKILL_DATA[c]["required_skills"]) - student_skill_set)))
+            for c in top_careers[1:]
+        ],
+    }
+
+
+def test_skill_analysis_matches_set_based_baseline():
+    taxonomy = SkillTaxonomy(SKILL_DATA, COURSE_MAP)
+    careers = sorted(SKILL_DATA)
+    every_skill = sorted({s for info in SKILL_DATA.values()
+                          for s in info["required_skills"] + info.get("good_to_have", [])})
+    rng = np.random.default_rng(11)
+    profiles = [
+        [],
+        ["Python", "SQL", "Machine Learning", "PANDAS", "git"],
+        ["python", "Python", "PYTHON", "Docker", "Kubernetes", "underwater basket weaving"],
+        [s.upper() for s in SKILL_DATA[careers[0]]["required_skills"]],
+        [s.title() for s in SKILL_DATA[careers[-1]].get("good_to_have", [])],
+        every_skill,
+    ] + [[s.swapcase() if rng.random() < 0.5 else s for s in rng.choice(every_skill, size=n)]
+         for n in (3, 8, 15, 30)]
+
+    for skills in profiles:
+        for first in range(len(careers)):
+            proba = rng.dirichlet(np.ones(len(careers)))
+            proba[first] = 1.0
+            top = guidance_engine._top_k_indices(proba[None, :], 3)[0]
+            result = guidance_engine._build_guidance(taxonomy, proba, top, careers, list(skills))
+
+            expected = baseline_skill_analysis([careers[i] for i in top], list(skills))
+            alternatives = expected.pop("alternatives")
+            primary = result["primary_career"]
+            assert primary["name"] == careers[first]
+            assert {key: primary[key] for key in expected} == expected, (skills, careers[first])
+            assert [(alt["career"], alt["skills_you_have"], alt["skill_gaps"])
+                    for alt in result["alternative_careers"]] == alternatives
+            assert result["summary"] == guidance_engine._build_summary(
+                careers[first], expected["skills_you_have"], expected["skill_gaps"], expected["improvement_areas"])
+
+    gaps_all = taxonomy.analyze_all(taxonomy.student_mask(profiles[1]))
+    for career in careers:
+        expected = baseline_skill_analysis([career], profiles[1])
+        assert gaps_all[career] == {"skills_you_have": expected["skills_you_have"],
+                                    "skill_gaps": expected["skill_gaps"]}
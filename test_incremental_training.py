@@ -0,0 +1,182 @@
+"""
+Incremental Training Tests
+ml/train_incremental.py feeds, checkpoints and published artifacts:
+- Malformed lines and unknown careers are skipped; an unterminated last
+  line waits for the next run
+- Updating from a checkpoint learns each row once and ends with the same
+  weights as one uninterrupted pass
+- The published artifacts load and pass validation in the guidance
+  engine, native scorer and pickle alike
+- Publishing refuses a model less accurate than the deployed one unless
+  forced, writes the model metadata with the model, and servers never
+  load a pickle / scorer pair the release marker doesn't name
+"""
+
+import sys
+import os
+import hashlib
+import json
+import pickle
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from ml import train_incremental as inc
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+df = pd.read_csv(os.path.join(BASE_DIR, "data/student_profiles.csv")).sample(800, random_state=0)
+CLASSES = inc.career_labels()
+
+
+def write_feed(path: str, rows, mode: str = "w") -> None:
+    with open(path, mode, encoding="utf-8") as f:
+        for row in rows.itertuples():
+            f.write(json.dumps({"id": row.Index, "combined_text": row.combined_text,
+                                "career_label": row.career_label}) + "\n")
+
+
+def test_feed_skips_bad_lines_and_waits_for_partial_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, "feed.jsonl")
+        write_feed(feed, df.head(5))
+        with open(feed, "a", encoding="utf-8") as f:
+            f.write("not json\n\n[1, 2]\n")
+            f.write(json.dumps({"combined_text": "python", "career_label": "Astronaut"}) + "\n")
+            f.write(json.dumps({"combined_text": "   ", "career_label": CLASSES[0]}) + "\n")
+            f.write(json.dumps({"combined_text": "python sql", "career_label": CLASSES[0]}))
+
+        batches = list(inc.read_feed(feed, 0, CLASSES, batch_size=3))
+        assert [len(texts) for texts, _, _, _ in batches] == [3, 2]
+        assert sum(skipped for _, _, _, skipped in batches) == 4
+        end = batches[-1][2]
+        with open(feed, "rb") as f:
+            assert f.read()[end:].startswith(b'{"combined_text": "python sql"')
+
+        with open(feed, "a", encoding="utf-8") as f:
+            f.write("\n")
+        texts, labels, _, _ = next(inc.read_feed(feed, end, CLASSES))
+        assert texts == ["python sql"] and labels == [CLASSES[0]]
+
+
+def test_resume_learns_each_row_once():
+    first, second = df.iloc[:300], df.iloc[300:600]
+    with tempfile.TemporaryDirectory() as tmp:
+        feed, checkpoint = os.path.join(tmp, "feed.jsonl"), os.path.join(tmp, "checkpoint.pkl")
+        write_feed(feed, first)
+        state = inc.new_state(CLASSES)
+        assert inc.update_from_feed(state, feed, checkpoint, batch_size=100)["learned"] == 300
+
+        # A later run: the feed has grown, and the state comes from disk
+        write_feed(feed, second, mode="a")
+        state = inc.load_checkpoint(checkpoint)
+        assert inc.update_from_feed(state, feed, checkpoint, batch_size=100)["learned"] == 300
+        assert inc.update_from_feed(state, feed, checkpoint, batch_size=100)["learned"] == 0
+        assert state["rows"] == 600 and state["batches"] == 6
+
+        single = inc.new_state(CLASSES)
+        inc.fit_batches(single, pd.concat([first, second])["combined_text"],
+                        pd.concat([first, second])["career_label"], batch_size=100)
+        assert np.array_equal(state["model"].named_steps["clf"].coef_, single["model"].named_steps["clf"].coef_)
+
+
+def test_published_artifacts_serve():
+    from services import guidance_engine
+
+    state = inc.new_state(CLASSES)
+    inc.fit_batches(state, df["combined_text"], df["career_label"])
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "ml"))
+        for name in ("skill_data.json", "course_map.json"):
+            shutil.copy(os.path.join(BASE_DIR, "ml", name), os.path.join(tmp, "ml", name))
+        inc.publish(state, tmp)
+
+        probe = list(df["combined_text"].head(50))
+        expected = state["model"].predict_proba(probe)
+        for scorer in ("native", "sklearn"):
+            guidance_engine.CAREER_SCORER = scorer
+            try:
+                artifacts = guidance_engine.load_artifacts(tmp)
+            finally:
+                guidance_engine.CAREER_SCORER = "auto"
+            guidance_engine._validate(artifacts)
+            assert list(artifacts.career_model.classes_) == CLASSES
+            # The native scorer's float32 weights move probabilities by ~1e-7
+            assert np.abs(artifacts.career_model.predict_proba(probe) - expected).max() < 1e-6
+
+
+def test_publish_refuses_untrained_model():
+    with pytest.raises(ValueError):
+        inc.publish(inc.new_state(CLASSES), tempfile.gettempdir())
+
+
+def model_dir(tmp: str) -> str:
+    os.makedirs(os.path.join(tmp, "ml"))
+    for name in ("skill_data.json", "course_map.json"):
+        shutil.copy(os.path.join(BASE_DIR, "ml", name), os.path.join(tmp, "ml", name))
+    return tmp
+
+
+def test_publish_refuses_a_less_accurate_model():
+    evaluation = df.iloc[600:]
+    good, weak = inc.new_state(CLASSES), inc.new_state(CLASSES)
+    inc.fit_batches(good, df["combined_text"].iloc[:600], df["career_label"].iloc[:600])
+    inc.fit_batches(weak, df["combined_text"].iloc[:8], df["career_label"].iloc[:8])
+    with tempfile.TemporaryDirectory() as tmp:
+        base = model_dir(tmp)
+        first = inc.publish(good, base, evaluation["combined_text"], evaluation["career_label"])
+        assert first["previous_test_accuracy"] is None and first["test_accuracy"] > 0.5
+
+        with pytest.raises(ValueError, match="below the deployed model"):
+            inc.publish(weak, base, evaluation["combined_text"], evaluation["career_label"])
+        deployed = inc.deployed_accuracy(evaluation["combined_text"], evaluation["career_label"], base)
+        assert deployed == pytest.approx(first["test_accuracy"], abs=1e-4)
+        with open(os.path.join(base, "ml", "release.json")) as f:
+            assert json.load(f)["release"] == first["release"]
+        with open(os.path.join(base, "ml", "model_metadata.json")) as f:
+            assert json.load(f)["test_accuracy"] == first["test_accuracy"]
+
+        forced = inc.publish(weak, base, evaluation["combined_text"], evaluation["career_label"], force=True)
+        assert forced["test_accuracy"] < forced["previous_test_accuracy"] == first["test_accuracy"]
+        with open(os.path.join(base, "ml", "model_metadata.json"), "rb") as f:
+            metadata_bytes = f.read()
+        metadata = json.loads(metadata_bytes)
+        assert metadata["test_accuracy"] == forced["test_accuracy"] and metadata["total_training_samples"] == 8
+        assert metadata["career_labels"] == CLASSES
+        assert forced["model_metadata.json"] == hashlib.sha256(metadata_bytes).hexdigest()
+
+
+def test_half_published_release_is_not_loaded():
+    from services import guidance_engine
+
+    first, second = inc.new_state(CLASSES), inc.new_state(CLASSES)
+    inc.fit_batches(first, df["combined_text"].iloc[:400], df["career_label"].iloc[:400])
+    inc.fit_batches(second, df["combined_text"].iloc[400:], df["career_label"].iloc[400:])
+    with tempfile.TemporaryDirectory() as tmp:
+        base = model_dir(tmp)
+        inc.publish(first, base, df["combined_text"], df["career_label"])
+        published = guidance_engine.load_artifacts(base).version
+
+        # A publish that got as far as the pickle: the pickle no longer matches,
+        # the scorer (served under auto) still does
+        inc._replace_file(os.path.join(base, "ml", "career_classifier.pkl"),
+                          lambda f: pickle.dump(second["model"], f))
+        assert guidance_engine.load_artifacts(base).version == published
+        guidance_engine.CAREER_SCORER = "sklearn"
+        try:
+            with pytest.raises(ValueError, match="release.json"):
+                guidance_engine.load_artifacts(base)
+        finally:
+            guidance_engine.CAREER_SCORER = "auto"
+
+        # ... and the scorer: nothing loads until the marker names the new pair
+        inc.export_pipeline(second["model"], os.path.join(base, "ml", "career_scorer"))
+        with pytest.raises(ValueError, match="release.json"):
+            guidance_engine.load_artifacts(base)
+        inc.write_release(base)
+        assert guidance_engine.load_artifacts(base).version != published
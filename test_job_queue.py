@@ -0,0 +1,182 @@
+"""
+Job Queue Tests
+JobRunner + LocalQueueBackend, and the /api/analyze/jobs endpoints:
+- Jobs finish with queue wait / processing times recorded
+- A full queue rejects new jobs instead of growing
+- Handler errors and non-200 results mark the job failed
+- Records are visible to another worker sharing the state directory
+- Jobs left queued / running by a worker that has exited come back as
+  failed with 503, at startup or when polled
+- A polled PDF job returns the same body as the inline endpoint
+"""
+
+import sys
+import os
+import io
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services.job_queue import JobRunner, LocalQueueBackend, QueueFullError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+
+def wait_for(runner: JobRunner, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = runner.get(job_id)
+        if record and record["status"] in ("done", "failed"):
+            return record
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def make_pdf(lines: list) -> bytes:
+    """Smallest valid one-page PDF showing the given lines in Helvetica"""
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    stream = "BT /F1 11 Tf 50 750 Td 14 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+def test_jobs_complete_with_timings():
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(lambda n: (200, {"square": n * n}), LocalQueueBackend(state_dir=tmp), workers=2)
+        jobs = [runner.submit(n) for n in range(10)]
+        for n, job in enumerate(jobs):
+            record = wait_for(runner, job["id"])
+            assert record["status"] == "done" and record["result"] == {"square": n * n}
+            assert record["queue_wait_ms"] >= 0 and record["processing_ms"] >= 0
+
+        # Another worker process on the host sees the same records
+        other = LocalQueueBackend(state_dir=tmp)
+        assert other.load(jobs[3]["id"])["result"] == {"square": 9}
+
+
+def test_full_queue_rejects_new_jobs():
+    release = threading.Event()
+
+    def blocked(payload):
+        release.wait(10)
+        return 200, {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(blocked, LocalQueueBackend(maxsize=2, state_dir=tmp), workers=1)
+        first = runner.submit("running")
+        while runner.get(first["id"])["status"] != "running":
+            time.sleep(0.01)
+        queued = [runner.submit("queued 1"), runner.submit("queued 2")]
+        try:
+            runner.submit("one too many")
+            raise AssertionError("queue accepted a job past its bound")
+        except QueueFullError:
+            pass
+        finally:
+            release.set()
+        for job in [first] + queued:
+            assert wait_for(runner, job["id"])["status"] == "done"
+
+
+def test_failures_are_recorded():
+    def handler(payload):
+        if payload == "crash":
+            raise RuntimeError("boom")
+        if payload == "busy":
+            return 503, {"error": "Server is busy", "retry_after": 3}
+        return 422, {"error": "unreadable"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(handler, LocalQueueBackend(state_dir=tmp), workers=1)
+        crashed = wait_for(runner, runner.submit("crash")["id"])
+        rejected = wait_for(runner, runner.submit("bad pdf")["id"])
+        assert (crashed["status"], crashed["code"]) == ("failed", 500)
+        assert (rejected["status"], rejected["code"], rejected["error"]) == ("failed", 422, "unreadable")
+        busy = wait_for(runner, runner.submit("busy")["id"])
+        assert (busy["status"], busy["code"], busy["retry_after"]) == ("failed", 503, 3)
+        assert "retry_after" not in rejected
+        assert runner.get("not-a-job") is None and runner.get("../etc") is None
+
+
+def exited_pid() -> int:
+    process = multiprocessing.get_context("fork").Process(target=int)
+    process.start()
+    process.join()
+    return process.pid
+
+
+def test_jobs_of_exited_workers_fail_with_503():
+    with tempfile.TemporaryDirectory() as tmp:
+        dead, live = exited_pid(), os.getppid()
+        writer = LocalQueueBackend(state_dir=tmp)
+        records = {
+            "lostqueued": {"status": "queued", "worker_pid": dead},
+            "lostrunning": {"status": "running", "worker_pid": dead},
+            "elsewhere": {"status": "running", "worker_pid": live},
+            "finished": {"status": "done", "worker_pid": dead, "code": 200},
+        }
+        for job_id, record in records.items():
+            writer._write(dict(record, id=job_id, submitted_at=time.time()))
+
+        # A worker starting up fails the lost jobs on disk
+        LocalQueueBackend(state_dir=tmp)
+        with open(os.path.join(tmp, "lostqueued.json"), encoding="utf-8") as f:
+            assert json.load(f)["status"] == "failed"
+
+        backend = LocalQueueBackend(state_dir=tmp)
+        for job_id in ("lostqueued", "lostrunning"):
+            record = backend.load(job_id)
+            assert (record["status"], record["code"], record["retry_after"]) == ("failed", 503, 0)
+            assert "resubmit" in record["error"]
+        assert backend.load("elsewhere")["status"] == "running"
+        assert backend.load("finished")["status"] == "done"
+
+        # ... and a poll notices a worker that exits later
+        writer._write(dict(records["elsewhere"], id="elsewhere", worker_pid=exited_pid(), submitted_at=time.time()))
+        assert backend.load("elsewhere")["code"] == 503
+
+
+@requires_model
+def test_polled_job_matches_inline_analysis():
+    from app import app
+    client = app.test_client()
+    pdf = make_pdf(["Skills: Python, Pandas, SQL, Machine Learning", "Projects", "Movie recommendation system"])
+    form = {"interests": "data science", "known_skills": "python", "career_goal": "data scientist"}
+
+    inline = client.post("/api/analyze", data=dict(form, resume=(io.BytesIO(pdf), "resume.pdf")))
+    submitted = client.post("/api/analyze/jobs", data=dict(form, resume=(io.BytesIO(pdf), "resume.pdf")))
+    assert inline.status_code == 200 and submitted.status_code == 202
+
+    deadline = time.monotonic() + 30
+    while True:
+        job = client.get(submitted.get_json()["poll_url"]).get_json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert job["status"] == "done"
+    assert job["result"] == inline.get_json()
+    assert client.get("/api/analyze/jobs/0123abcd").status_code == 404
@@ -0,0 +1,74 @@
+"""
+JSON Stream Tests
+services/json_stream decoding of batch request bodies:
+- JSON arrays are decoded incrementally, even across tiny reads
+- Anything but exactly one well-formed array ends with an error item
+  where the syntax breaks; nothing is silently dropped
+- A large element is decoded once rather than once per read
+- NDJSON bad lines become error items in place
+"""
+
+import sys
+import os
+import io
+import json
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services import json_stream
+
+
+def decode_array(body: str, read_size: int = json_stream.READ_SIZE) -> list:
+    """iter_json_array output, with MalformedItem shown as ("error", message)"""
+    return [
+        ("error", item.message) if isinstance(item, json_stream.MalformedItem) else item
+        for item in json_stream.iter_json_array(io.BytesIO(body.encode()), read_size)
+    ]
+
+
+def test_json_array_decodes_across_tiny_reads():
+    items = [{"text": "é" * 7, "n": 1234567}, 89012, [1, [2, 3]], "s", None, {"q": "\\\"]}"}]
+    for read_size in (1, 3, 64 * 1024):
+        assert decode_array(json.dumps(items), read_size) == items
+        assert decode_array(json.dumps(items, indent=2), read_size) == items
+    assert decode_array(" [ ] ") == []
+
+
+def test_json_array_rejects_invalid_syntax():
+    """Nothing is silently dropped: the batch ends with an error where the syntax breaks"""
+    cases = {
+        '[{"a":1} {"b":2}]': [{"a": 1}],         # missing comma
+        '[,,{"a":1},,]': [],                     # leading / doubled commas
+        '[{"a":1},,{"b":2}]': [{"a": 1}],
+        '[{"a":1},]': [{"a": 1}],                # trailing comma
+        '[1 2 3': [1],
+        '[1, 2, 3': [1, 2, 3],                   # truncated upload
+        '[{"a": [1, 2': [],
+        '[{"a":1}]garbage': [{"a": 1}],          # data after the array
+        '{"a": 1}': [],
+    }
+    for body, valid in cases.items():
+        for read_size in (1, 64 * 1024):
+            decoded = decode_array(body, read_size)
+            assert decoded[:-1] == valid and decoded[-1][0] == "error", (body, read_size, decoded)
+
+
+def test_large_element_is_decoded_once(monkeypatch):
+    calls = []
+
+    class CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            calls.append(len(s) - idx)
+            return super().raw_decode(s, idx)
+
+    items = [{"resume_text": "python " * 200_000}, {"n": 1}]
+    monkeypatch.setattr(json_stream, "_decoder", CountingDecoder())
+    assert decode_array(json.dumps(items), read_size=4096) == items
+    # One failed try on the first read, one decode of the whole element, one small item
+    assert len(calls) <= 4, len(calls)
+
+
+def test_ndjson_reports_bad_lines_in_place():
+    body = b'{"a": 1}\n\n  \n{not json\n[1, 2]\n'
+    items = list(json_stream.iter_ndjson(io.BytesIO(body)))
+    assert items[0] == {"a": 1} and items[2] == [1, 2]
+    assert isinstance(items[1], json_stream.MalformedItem) and items[1].message.startswith("Invalid JSON line")
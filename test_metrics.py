@@ -0,0 +1,193 @@
+"""
+Metrics Tests
+services/metrics + GET /metrics:
+- Requests record per-stage histograms, status counts and payload sizes
+- Exposition follows the Prometheus text format (cumulative buckets)
+- Values flushed by other worker processes are summed in; gauges of
+  exited workers are not
+- An exited worker's file is folded into the retired totals and removed,
+  without the sums changing
+- A process's first request clears what a stopped server left behind,
+  but not the files of live siblings
+- With METRICS_TOKEN set, /metrics needs it as a bearer token
+- A timed stage costs microseconds
+"""
+
+import sys
+import os
+import json
+import multiprocessing
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services import metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+
+def sample(text: str, name: str) -> float:
+    """Value of the exposition line starting with name (full series incl. labels)"""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not in exposition")
+
+
+@requires_model
+def test_requests_record_stage_metrics():
+    from app import app
+    from services.guidance_engine import flush_prediction_cache
+    client = app.test_client()
+    # A cached prediction from an earlier test would skip predict_proba
+    flush_prediction_cache()
+    with tempfile.TemporaryDirectory() as tmp:
+        original = metrics.METRICS_DIR
+        metrics.METRICS_DIR = tmp
+        metrics.reset()
+        try:
+            body = {"resume_text": "Skills: Python, SQL, Pandas", "qa_responses": {"interests": "data"}}
+            # buffered: the app iterable is closed, as a real server does after sending
+            assert client.post("/api/generate-guidance", json=body, buffered=True).status_code == 200
+            assert client.post("/api/generate-guidance", json={}, buffered=True).status_code == 400
+            text = client.get("/metrics").get_data(as_text=True)
+        finally:
+            metrics.METRICS_DIR = original
+
+    for name in ("parse_resume", "build_features", "predict_proba", "assemble_guidance"):
+        assert sample(text, f'guidance_stage_seconds_count{{stage="{name}"}}') >= 1, name
+    assert sample(text, 'guidance_requests_total{endpoint="generate_guidance",code="200"}') == 1
+    assert sample(text, 'guidance_requests_total{endpoint="generate_guidance",code="400"}') == 1
+    assert sample(text, 'guidance_requests_in_flight{endpoint="generate_guidance"}') == 0
+    assert sample(text, 'guidance_payload_bytes_count{endpoint="generate_guidance",direction="response"}') == 2
+    assert "# TYPE guidance_stage_seconds histogram" in text
+
+
+def test_histogram_exposition_is_cumulative():
+    histogram = metrics.Histogram("test_seconds", "test", ("kind",), buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, 'a"b')
+        text = metrics.render_prometheus(tempfile.gettempdir() + "/no-such-metrics-dir")
+    finally:
+        metrics._registry.remove(histogram)
+    assert sample(text, 'test_seconds_bucket{kind="a\\"b",le="0.1"}') == 1
+    assert sample(text, 'test_seconds_bucket{kind="a\\"b",le="1"}') == 3
+    assert sample(text, 'test_seconds_bucket{kind="a\\"b",le="+Inf"}') == 4
+    assert sample(text, 'test_seconds_count{kind="a\\"b"}') == 4
+    assert sample(text, 'test_seconds_sum{kind="a\\"b"}') == 6.05
+
+
+def _other_worker(state_dir: str) -> None:
+    metrics.reset(state_dir)
+    metrics.requests_total.inc("analyze", "200", amount=5)
+    metrics.requests_in_flight.inc("analyze")
+    metrics.flush(state_dir)
+
+
+def test_other_workers_are_summed():
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.reset(tmp)
+        worker = multiprocessing.get_context("fork").Process(target=_other_worker, args=(tmp,))
+        worker.start()
+        worker.join()
+        metrics.requests_total.inc("analyze", "200", amount=2)
+        merged, live = metrics.collect(tmp)
+        metrics.reset(tmp)
+    # The exited worker's counts stay; its in-flight gauge does not
+    assert merged["guidance_requests_total"]["analyze\x00200"] == 7
+    assert merged["guidance_requests_in_flight"].get("analyze", 0) == 0
+    assert live == 1
+
+
+def _exiting_worker(state_dir: str) -> None:
+    for metric in metrics._registry:
+        metric.reset()
+    metrics.requests_total.inc("analyze", "200", amount=5)
+    metrics.requests_in_flight.inc("analyze")
+    metrics.flush(state_dir)
+
+
+def test_exited_workers_are_retired():
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.reset(tmp)
+        pids = []
+        for _ in range(2):
+            worker = context.Process(target=_exiting_worker, args=(tmp,))
+            worker.start()
+            worker.join()
+            pids.append(worker.pid)
+        before, _ = metrics.collect(tmp)
+        with open(os.path.join(tmp, f"{pids[0]}.json"), encoding="utf-8") as f:
+            first_snapshot = f.read()
+
+        metrics.mark_process_dead(pids[0], tmp)
+        assert sorted(os.listdir(tmp)) == sorted([f"{pids[1]}.json", metrics.RETIRED_FILE])
+        assert metrics.collect(tmp)[0] == before
+
+        # Retired but not yet removed (or read just before): counted once
+        with open(os.path.join(tmp, f"{pids[0]}.json"), "w", encoding="utf-8") as f:
+            f.write(first_snapshot)
+        assert metrics.collect(tmp)[0] == before
+
+        metrics.mark_process_dead(pids[0], tmp)
+        metrics.mark_process_dead(pids[1], tmp)
+        metrics.mark_process_dead(pids[1], tmp)
+        assert os.listdir(tmp) == [metrics.RETIRED_FILE]
+        # Only pids whose file might still be read stay listed
+        with open(os.path.join(tmp, metrics.RETIRED_FILE), encoding="utf-8") as f:
+            assert json.load(f)["pids"] == [pids[1]]
+        after, live = metrics.collect(tmp)
+        metrics.reset(tmp)
+
+    assert after == before and live == 1
+    assert after["guidance_requests_total"]["analyze\x00200"] == 10
+    assert after["guidance_requests_in_flight"].get("analyze", 0) == 0
+
+
+def test_first_request_clears_a_stopped_run():
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.reset(tmp)
+        worker = context.Process(target=_exiting_worker, args=(tmp,))
+        worker.start()
+        worker.join()
+        metrics.mark_process_dead(worker.pid, tmp)
+        # Every writer has exited (python app.py restarted): start over
+        metrics._join_run(tmp)
+        assert os.listdir(tmp) == [f"{os.getpid()}.json"]
+
+        # A live sibling (here the test runner's parent) keeps the run going
+        metrics.flush(tmp)
+        os.replace(os.path.join(tmp, f"{os.getpid()}.json"), os.path.join(tmp, f"{os.getppid()}.json"))
+        metrics._join_run(tmp)
+        assert sorted(os.listdir(tmp)) == sorted([f"{os.getppid()}.json", f"{os.getpid()}.json"])
+        metrics.reset(tmp)
+
+
+def test_metrics_token(monkeypatch):
+    from app import app
+    client = app.test_client()
+    assert client.get("/metrics").status_code == 200
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+def test_stage_overhead_is_small():
+    n = 20000
+    start = time.perf_counter()
+    for _ in range(n):
+        with metrics.stage("overhead_probe"):
+            pass
+    per_call = (time.perf_counter() - start) / n
+    metrics.stage_seconds.reset()
+    assert per_call < 50e-6, f"{per_call * 1e6:.1f} µs per stage"
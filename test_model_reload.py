@@ -0,0 +1,198 @@
+"""
+Model Reload Tests
+services/guidance_engine ModelHolder hot reload, against a temporary
+model directory (ml/ is never touched):
+- A replaced model is validated and swapped in; a request holding the
+  old artifacts keeps them
+- A corrupt pickle or a model predicting unknown careers is rejected and
+  the old version keeps serving; every outcome is counted in metrics
+- Loading the model starts no watcher; start_watcher() picks replaced
+  files up on its own
+- Nothing loads until first use; concurrent first calls and warmups load
+  and predict once, and a reload during a slow first load wins
+- Without a model the guidance endpoints and /health/ready answer 503
+"""
+
+import sys
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from services import guidance_engine, metrics
+from services.guidance_engine import ModelHolder, ModelUnavailableError, load_artifacts
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+df = pd.read_csv(os.path.join(BASE_DIR, "data/student_profiles.csv")).groupby("career_label").head(20)
+
+
+def train(C: float, labels=None):
+    model = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression(C=C, max_iter=500))])
+    return model.fit(df["combined_text"], df["career_label"] if labels is None else labels)
+
+
+def write_model(model_dir: str, payload: bytes) -> None:
+    """Replace the pickle the way a deploy does: write aside, then rename"""
+    path = os.path.join(model_dir, "ml", "career_classifier.pkl")
+    with open(path + ".tmp", "wb") as f:
+        f.write(payload)
+    os.replace(path + ".tmp", path)
+
+
+@pytest.fixture
+def model_dir(monkeypatch):
+    monkeypatch.setattr("services.guidance_engine.CAREER_SCORER", "sklearn")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "ml"))
+        for name in ("skill_data.json", "course_map.json"):
+            shutil.copy(os.path.join(BASE_DIR, "ml", name), os.path.join(tmp, "ml", name))
+        write_model(tmp, pickle.dumps(train(1.0)))
+        yield tmp
+
+
+def test_replaced_model_is_swapped_in(model_dir):
+    holder = ModelHolder(base_dir=model_dir)
+    before = holder.get()
+    assert holder.reload() == {"status": "unchanged", "version": before.version}
+
+    write_model(model_dir, pickle.dumps(train(10.0)))
+    result = holder.reload()
+    assert result["status"] == "reloaded" and result["previous_version"] == before.version
+    after = holder.get()
+    assert after.version == result["version"] != before.version
+    # A request that took the old artifacts still has a working model
+    assert before.career_model.predict_proba(["python sql"]).shape == (1, len(before.career_model.classes_))
+
+
+def test_bad_models_are_rejected_and_the_old_one_keeps_serving(model_dir):
+    holder = ModelHolder(base_dir=model_dir)
+    serving = holder.get()
+    failed_before = metrics.model_reloads.snapshot().get("failed", 0)
+
+    write_model(model_dir, b"not a pickle")
+    result = holder.reload()
+    assert result["status"] == "failed" and result["version"] == serving.version
+    assert holder.get() is serving
+
+    unknown_career = df["career_label"].where(df["career_label"] != df["career_label"].iloc[0], "Astronaut")
+    write_model(model_dir, pickle.dumps(train(1.0, unknown_career)))
+    result = holder.reload()
+    assert result["status"] == "failed" and "Astronaut" in result["error"]
+    assert holder.get() is serving and holder.status()["last_reload"] == result
+    assert metrics.model_reloads.snapshot()["failed"] == failed_before + 2
+
+
+def test_missing_model_is_unavailable(model_dir):
+    os.remove(os.path.join(model_dir, "ml", "career_classifier.pkl"))
+    holder = ModelHolder(base_dir=model_dir)
+    with pytest.raises(ModelUnavailableError):
+        holder.get()
+    assert holder.status()["loaded"] is False and holder.status()["error"]
+
+
+def test_watcher_starts_only_when_asked_and_picks_up_changes(model_dir):
+    def watchers() -> int:
+        return sum(thread.name == "model-watcher" for thread in threading.enumerate())
+
+    running = watchers()
+    holder = ModelHolder(base_dir=model_dir)
+    serving = holder.get()
+    assert watchers() == running
+
+    assert holder.start_watcher(interval=0.05) and holder.start_watcher(interval=0.05)
+    assert watchers() == running + 1
+    write_model(model_dir, pickle.dumps(train(10.0)))
+    deadline = time.monotonic() + 5
+    while holder.get() is serving and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert holder.get().version != serving.version
+
+
+class CountingLoader:
+    """load_artifacts that counts its calls and predictions, optionally held at the first call"""
+
+    def __init__(self):
+        self.loads = self.predictions = 0
+        self.entered, self.release = threading.Event(), threading.Event()
+        self.release.set()
+
+    def __call__(self, base_dir):
+        self.loads += 1
+        artifacts = load_artifacts(base_dir)
+        if self.loads == 1:
+            self.entered.set()
+            self.release.wait(5)
+        predict_proba = artifacts.career_model.predict_proba
+
+        def counted(texts):
+            self.predictions += 1
+            return predict_proba(texts)
+        artifacts.career_model.predict_proba = counted
+        return artifacts
+
+
+def run_threads(target, n: int = 8) -> None:
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_model_loads_once_on_first_use(model_dir):
+    loader = CountingLoader()
+    holder = ModelHolder(loader=loader, base_dir=model_dir)
+    assert loader.loads == 0 and holder.status()["loaded"] is False and not holder.ready
+
+    run_threads(holder.get)
+    assert loader.loads == 1 and loader.predictions == 0 and not holder.ready
+    run_threads(holder.warmup)
+    assert loader.loads == 1 and loader.predictions == 1 and holder.ready
+
+
+def test_reload_during_first_load_is_not_overwritten(model_dir):
+    loader = CountingLoader()
+    loader.release.clear()
+    holder = ModelHolder(loader=loader, base_dir=model_dir)
+    first = threading.Thread(target=holder.warmup)
+    first.start()
+    assert loader.entered.wait(5)
+
+    # The files change while the first load is still in progress
+    write_model(model_dir, pickle.dumps(train(10.0)))
+    reloaded = []
+    second = threading.Thread(target=lambda: reloaded.append(holder.reload()))
+    second.start()
+    time.sleep(0.1)
+    loader.release.set()
+    first.join()
+    second.join()
+
+    assert reloaded[0]["status"] == "reloaded"
+    assert holder.get().version == reloaded[0]["version"] == load_artifacts(model_dir).version
+
+
+def test_missing_model_answers_503(model_dir, monkeypatch):
+    from app import app
+
+    os.remove(os.path.join(model_dir, "ml", "career_classifier.pkl"))
+    monkeypatch.setattr(guidance_engine, "_holder", ModelHolder(base_dir=model_dir))
+    client = app.test_client()
+    student = {"resume_text": "Skills: Python, SQL", "qa_responses": {"interests": "data"}}
+
+    single = client.post("/api/generate-guidance", json=student)
+    assert single.status_code == 503 and single.get_json()["error"] == "Model not available"
+    assert client.post("/api/generate-guidance/batch", json=[student]).status_code == 503
+    ready = client.get("/health/ready")
+    assert ready.status_code == 503 and ready.get_json()["loaded"] is False
+    assert client.get("/health").status_code == 200
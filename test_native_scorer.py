@@ -0,0 +1,127 @@
+"""
+Native Scorer Tests
+Parity between the exported NumPy scorer and the sklearn pipeline it
+was exported from, for every classifier type ml/train.py can select and
+the hashed SGD model of ml/train_incremental.py. Linear weights are
+stored as float32, so linear models match to LINEAR_TOLERANCE.
+"""
+
+import sys
+import os
+import pickle
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.svm import LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
+
+from services.native_scorer import NativeScorer, export_pipeline, _murmurhash3_32
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TOLERANCE = 1e-9
+LINEAR_TOLERANCE = 1e-6
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+df = pd.read_csv(os.path.join(BASE_DIR, "data/student_profiles.csv"))
+train = df.sample(1500, random_state=0)
+probe = list(df.drop(train.index).sample(300, random_state=1)["combined_text"]) + [
+    "", "!!!", "Python, C++ & C# — ÉCOLE data-science", "python " * 200,
+]
+
+
+def make_pipeline(clf) -> Pipeline:
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), max_features=8000, sublinear_tf=True, min_df=2)),
+        ("clf", clf),
+    ])
+
+
+def assert_parity(pipeline) -> None:
+    expected = pipeline.predict_proba(probe)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scorer")
+        export_pipeline(pipeline, path)
+        for mmap in (True, False):
+            scorer = NativeScorer.load(path, mmap=mmap)
+            assert list(scorer.classes_) == list(pipeline.classes_)
+            linear = "coef" in scorer._arrays
+            if linear:
+                assert scorer._arrays["coef"].dtype == np.float32
+            tolerance = LINEAR_TOLERANCE if linear else TOLERANCE
+            assert np.abs(expected - scorer.predict_proba(probe)).max() < tolerance
+
+
+def test_random_forest_parity():
+    pipe = make_pipeline(RandomForestClassifier(n_estimators=25, random_state=42))
+    assert_parity(pipe.fit(train["combined_text"], train["career_label"]))
+
+
+def test_shallow_random_forest_parity():
+    """Depth-limited trees have impure leaves, stored as probability rows"""
+    pipe = make_pipeline(RandomForestClassifier(n_estimators=25, max_depth=4, random_state=42))
+    assert_parity(pipe.fit(train["combined_text"], train["career_label"]))
+
+
+def test_logistic_regression_parity():
+    pipe = make_pipeline(LogisticRegression(max_iter=1000, C=5.0, random_state=42))
+    assert_parity(pipe.fit(train["combined_text"], train["career_label"]))
+
+
+def test_calibrated_linear_svc_parity():
+    pipe = make_pipeline(CalibratedClassifierCV(LinearSVC(max_iter=2000, C=1.0, random_state=42)))
+    assert_parity(pipe.fit(train["combined_text"], train["career_label"]))
+
+
+def test_hashed_sgd_parity():
+    """Both sign modes; only the hashed columns with weights are exported"""
+    for alternate_sign in (False, True):
+        pipe = Pipeline([
+            ("hashing", HashingVectorizer(n_features=2 ** 18, ngram_range=(1, 2), alternate_sign=alternate_sign)),
+            ("clf", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)),
+        ])
+        assert_parity(pipe.fit(train["combined_text"], train["career_label"]))
+        with tempfile.TemporaryDirectory() as tmp:
+            export_pipeline(pipe, tmp)
+            assert NativeScorer.load(tmp)._arrays["coef"].shape[1] < 2 ** 18 // 10
+
+
+def test_murmurhash_matches_sklearn():
+    from sklearn.utils import murmurhash3_32
+    for text in ["", "a", "ab", "abc", "abcd", "abcde", "machine learning", "ÉCOLE data-science", "日本語", "c++ c#"]:
+        assert _murmurhash3_32(text) == murmurhash3_32(text, seed=0)
+
+
+def test_reexport_leaves_loaded_scorer_intact():
+    """Exporting over a live artifact must not disturb a scorer mapping the old files"""
+    forest = make_pipeline(RandomForestClassifier(n_estimators=10, random_state=1))
+    forest.fit(train["combined_text"], train["career_label"])
+    linear = make_pipeline(LogisticRegression(max_iter=1000, random_state=1))
+    linear.fit(train["combined_text"], train["career_label"])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scorer")
+        export_pipeline(forest, path)
+        old = NativeScorer.load(path)
+        export_pipeline(linear, path)
+        new = NativeScorer.load(path)
+        assert old.digest != new.digest
+        assert sorted(os.listdir(path)) == ["coef.npy", "config.json", "idf.npy", "intercept.npy"]
+        assert np.abs(forest.predict_proba(probe) - old.predict_proba(probe)).max() < TOLERANCE
+        assert np.abs(linear.predict_proba(probe) - new.predict_proba(probe)).max() < LINEAR_TOLERANCE
+
+
+@requires_model
+def test_trained_model_parity():
+    """The real ml/career_classifier.pkl, when it has been trained locally"""
+    with open(os.path.join(BASE_DIR, "ml/career_classifier.pkl"), "rb") as f:
+        assert_parity(pickle.load(f))
@@ -0,0 +1,73 @@
+"""
+PDF Extractor Tests
+services/pdf_extractor on a generated multi-page PDF:
+- The worker pool returns the same text, pages and truncation as
+  extracting inline, with and without the page / character budgets
+- Concurrent first calls share one pool
+"""
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from services import pdf_extractor
+from services.pdf_extractor import extract_pdf_text
+
+
+def make_pdf(pages: list) -> bytes:
+    """Smallest valid PDF with one page per list of lines, in Helvetica"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 11 Tf 50 750 Td 14 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+                       "/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+PDF = make_pdf([[f"Page {n} line {line} python sql" for line in range(n % 4 + 1)] for n in range(1, 12)])
+
+
+def without_timings(result: dict) -> dict:
+    return dict(result, pages=[(page["page"], page["chars"]) for page in result["pages"]])
+
+
+def test_parallel_extraction_matches_serial():
+    for budgets in ({}, {"max_pages": 7}, {"max_chars": 150}, {"max_chars": 1}, {"max_pages": 1}):
+        serial = extract_pdf_text(PDF, workers=1, **budgets)
+        for workers in (2, 3, 16):
+            parallel = extract_pdf_text(PDF, workers=workers, **budgets)
+            assert without_timings(parallel) == without_timings(serial), (budgets, workers)
+    full = extract_pdf_text(PDF, workers=1, max_pages=100, max_chars=10 ** 6)
+    assert full["page_count"] == 11 and not full["truncated"] and "Page 11 line" in full["text"]
+
+
+def test_concurrent_first_calls_share_one_pool(monkeypatch):
+    monkeypatch.setattr(pdf_extractor, "_pool", None)
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(pdf_extractor._get_pool())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len(pools) == 8 and all(pool is pools[0] for pool in pools)
+    finally:
+        pools[0].shutdown()
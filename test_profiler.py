@@ -0,0 +1,132 @@
+"""
+Profiler Tests
+services/profiler + the profiling hook on the guidance endpoints:
+- Admins can ask for a profile of one request; others cannot
+- 1-in-N sampling picks exactly every Nth request
+- Old profiles are rotated out; the admin endpoints list / download them
+- metrics.profile_request profiles plain handlers too, naming the dump
+  after a (status, body) result; an admin can ask for a job's profile
+"""
+
+import sys
+import os
+import io
+import pstats
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services import metrics
+from services.profiler import RequestProfiler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+requires_model = pytest.mark.skipif(
+    not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")), reason="ml/career_classifier.pkl not found"
+)
+
+STUDENT = {"resume_text": "Skills: Python, SQL, Pandas", "qa_responses": {"interests": "data"}}
+
+
+def test_sampling_and_rotation():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(sample_rate=3, profile_dir=tmp, keep=2)
+        assert [profiler.sampled() for _ in range(6)] == [False, False, True, False, False, True]
+
+        names = [profiler.run("analyze", sum, range(1000 * n))[1] for n in range(1, 5)]
+        assert len(set(names)) == 4
+        kept = [entry["name"] for entry in profiler.profiles()]
+        assert len(kept) == 2 and set(kept) <= set(names)
+        assert profiler.path(kept[0]) and profiler.path("../" + kept[0]) is None
+
+        stats = pstats.Stats(profiler.path(kept[0]))
+        assert any(func[2] == "<built-in method builtins.sum>" for func in stats.stats)
+
+        # Unsampled-by-default profiler never triggers
+        assert not any(RequestProfiler(sample_rate=0, profile_dir=tmp).sampled() for _ in range(100))
+
+
+@requires_model
+def test_admin_requested_profile_roundtrip():
+    from app import app
+    from services import profiler as profiler_module
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original_dir, original_token = profiler_module.profiler.profile_dir, os.environ.get("ADMIN_TOKEN")
+        profiler_module.profiler.profile_dir = tmp
+        os.environ["ADMIN_TOKEN"] = "secret"
+        try:
+            client = app.test_client()
+            # Without the token the flag is ignored
+            plain = client.post("/api/generate-guidance?profile=1", json=STUDENT)
+            assert plain.status_code == 200 and "X-Profile-Id" not in plain.headers
+
+            admin = {"X-Admin-Token": "secret"}
+            profiled = client.post("/api/generate-guidance", json=STUDENT, headers=dict(admin, **{"X-Profile": "1"}))
+            assert profiled.status_code == 200
+            assert profiled.get_json() == plain.get_json()
+            name = profiled.headers["X-Profile-Id"]
+
+            listing = client.get("/admin/profiles", headers=admin).get_json()["profiles"]
+            assert [(e["name"], e["endpoint"], e["status"]) for e in listing] == [(name, "generate_guidance", 200)]
+
+            download = client.get(f"/admin/profiles/{name}", headers=admin)
+            assert download.status_code == 200 and len(download.data) == listing[0]["bytes"]
+            assert client.get("/admin/profiles/nope.prof", headers=admin).status_code == 404
+            assert client.get(f"/admin/profiles/{name}").status_code == 401
+        finally:
+            profiler_module.profiler.profile_dir = original_dir
+            if original_token is None:
+                os.environ.pop("ADMIN_TOKEN", None)
+            else:
+                os.environ["ADMIN_TOKEN"] = original_token
+
+
+class Headed:
+    def __init__(self):
+        self.headers = {}
+
+
+def test_profile_request_wraps_plain_handlers(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(sample_rate=0, profile_dir=tmp)
+        monkeypatch.setattr(metrics, "profiler", profiler)
+
+        @metrics.profile_request("some_job", requested=lambda payload: payload.get("profile"))
+        def handler(payload):
+            return 503, {"busy": True}
+
+        assert handler({}) == (503, {"busy": True}) and profiler.profiles() == []
+        assert handler({"profile": True}) == (503, {"busy": True})
+        assert [(e["endpoint"], e["status"]) for e in profiler.profiles()] == [("some_job", 503)]
+
+        profiled_view = metrics.profile_request("view", requested=lambda: True, respond=lambda result: result)
+        response = profiled_view(Headed)()
+        assert response.headers["X-Profile-Id"] in [e["name"] for e in profiler.profiles()]
+
+
+def test_admin_can_profile_a_job(monkeypatch):
+    from app import app
+    from routes import web
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(sample_rate=0, profile_dir=tmp)
+        monkeypatch.setattr(metrics, "profiler", profiler)
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        client = app.test_client()
+
+        def submit(headers):
+            response = client.post("/api/analyze/jobs", headers=headers,
+                                   data={"resume": (io.BytesIO(b"not a pdf"), "resume.pdf")})
+            job_id = response.get_json()["job_id"]
+            deadline = time.monotonic() + 10
+            while web.analysis_jobs.get(job_id)["status"] in ("queued", "running"):
+                assert time.monotonic() < deadline
+                time.sleep(0.02)
+            return web.analysis_jobs.get(job_id)
+
+        assert submit({"X-Profile": "1"})["code"] == 422 and profiler.profiles() == []
+        assert submit({"X-Profile": "1", "X-Admin-Token": "secret"})["code"] == 422
+        assert [(e["endpoint"], e["status"]) for e in profiler.profiles()] == [("analyze_job", 422)]
@@ -0,0 +1,83 @@
+"""
+Resume Cache Tests
+services/cache LRUCache and the resume cache keys built on it:
+- An entry written by one worker is served from disk to another
+- Changing MASTER_SKILLS or the parser (their fingerprint) misses every
+  cached parse; a hit still returns the caller's own raw_text
+- The disk tier is pruned to its size and TTL, and clear() empties it
+- A failed disk write leaves no temp file behind
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services import resume_cache
+from services.cache import LRUCache
+
+RESUME = "Skills: Python, SQL, Pandas\nProjects\nMovie recommendation system"
+
+
+def test_disk_round_trip_between_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = LRUCache("parse", maxsize=4, disk_dir=tmp)
+        writer.set("ab12", {"skills": ["python"], "cgpa": 8.2})
+
+        # A fresh instance stands in for another gunicorn worker
+        reader = LRUCache("parse", maxsize=4, disk_dir=tmp)
+        assert reader.get("ab12") == {"skills": ["python"], "cgpa": 8.2}
+        assert reader.get("ab12") == {"skills": ["python"], "cgpa": 8.2}
+        assert reader.get("cd34") is None
+        stats = reader.stats()
+        assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_skill_list_change_invalidates_cached_parses(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LRUCache("parse", maxsize=4, disk_dir=tmp)
+        monkeypatch.setattr(resume_cache, "parse_cache", cache)
+        first = resume_cache.parse_resume_cached(RESUME)
+        again = resume_cache.parse_resume_cached(RESUME + "\r\n")
+        assert cache.stats()["hits"] == 1
+        assert again == {**first, "raw_text": RESUME + "\r\n"}
+
+        monkeypatch.setattr(resume_cache, "PARSER_FINGERPRINT", "0" * 16)
+        resume_cache.parse_resume_cached(RESUME)
+        assert cache.stats()["misses"] == 2
+        assert len(os.listdir(cache.disk_dir)) == 2
+
+
+def test_disk_tier_is_pruned_and_cleared():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LRUCache("pdf", maxsize=100, disk_dir=tmp, disk_maxsize=3)
+        for n in range(6):
+            cache.set(f"{n:04x}", {"n": n})
+            os.utime(cache._disk_path(f"{n:04x}"), (1000 + n, 1000 + n))
+        orphan = os.path.join(cache.disk_dir, "orphan.tmp")
+        open(orphan, "w").close()
+        os.utime(orphan, (0, 0))
+
+        assert cache.prune_disk() == 3
+        assert sorted(os.listdir(cache.disk_dir)) == ["0003.json", "0004.json", "0005.json"]
+
+        cache.ttl = 60
+        os.utime(cache._disk_path("0005"), None)
+        assert cache.prune_disk() == 2
+        assert os.listdir(cache.disk_dir) == ["0005.json"]
+
+        assert cache.clear() == 6 + 1
+        assert os.listdir(cache.disk_dir) == []
+        assert cache.get("0005") is None
+
+
+def test_failed_disk_write_leaves_no_temp_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LRUCache("parse", maxsize=4, disk_dir=tmp)
+        with pytest.raises(TypeError):
+            cache.set("ab12", {"not json": object()})
+        assert os.listdir(cache.disk_dir) == []
+        cache.set("ab12", {"ok": True})
+        assert os.listdir(cache.disk_dir) == ["ab12.json"]
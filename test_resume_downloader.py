@@ -0,0 +1,185 @@
+"""
+Resume Downloader Tests
+Runs the pooled downloader against a local HTTP server standing in for
+Supabase storage:
+- Connections are reused across downloads
+- Bodies past the byte cap are rejected, declared or streamed
+- The total deadline holds against a server that drips bytes slowly
+- 5xx responses are retried with backoff, 4xx are not
+- The async client of a previous event loop is closed when replaced
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from services.resume_downloader import AsyncResumeDownloader, ResumeDownloader, DownloadError, downloader_stats
+
+PDF_BYTES = b"%PDF-1.4\n" + b"x" * 200_000
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    flaky_hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        StandInHandler.connections.add(self.client_address)
+        if self.path == "/resume.pdf":
+            self._send(200, PDF_BYTES)
+        elif self.path == "/declared-huge.pdf":
+            self.send_response(200)
+            self.send_header("Content-Length", str(50 * 1024 * 1024))
+            self.end_headers()
+            self.wfile.write(b"x" * 1024)
+        elif self.path == "/streamed-huge.pdf":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"x" * 65536
+            for _ in range(32):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/drip.pdf":
+            self.send_response(200)
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            try:
+                for _ in range(1000):
+                    self.wfile.write(b"x")
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+        elif self.path == "/flaky.pdf":
+            StandInHandler.flaky_hits += 1
+            if StandInHandler.flaky_hits <= 2:
+                self._send(503, b"busy")
+            else:
+                self._send(200, PDF_BYTES)
+        else:
+            self._send(404, b"not found")
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # the client hanging up on an aborted download is expected
+
+
+def start_server() -> tuple:
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_downloads_reuse_one_pooled_connection():
+    server, base = start_server()
+    try:
+        StandInHandler.connections.clear()
+        downloader = ResumeDownloader()
+        for _ in range(5):
+            assert downloader.download(base + "/resume.pdf") == PDF_BYTES
+        assert len(StandInHandler.connections) == 1
+        stats = downloader.stats()
+        assert stats["succeeded"] == 5 and stats["bytes"] == 5 * len(PDF_BYTES)
+    finally:
+        server.shutdown()
+
+
+def test_bodies_over_the_byte_cap_are_rejected():
+    server, base = start_server()
+    try:
+        downloader = ResumeDownloader(max_bytes=1024 * 1024)
+        for path in ("/declared-huge.pdf", "/streamed-huge.pdf"):
+            try:
+                downloader.download(base + path)
+                raise AssertionError(f"{path} was not rejected")
+            except DownloadError as e:
+                assert "larger than" in str(e)
+        assert downloader.stats()["too_large"] == 2
+    finally:
+        server.shutdown()
+
+
+def test_total_deadline_stops_a_dripping_server():
+    server, base = start_server()
+    try:
+        # Every byte arrives well within the read timeout; only the deadline can stop it
+        downloader = ResumeDownloader(deadline=0.5)
+        start = time.monotonic()
+        try:
+            downloader.download(base + "/drip.pdf")
+            raise AssertionError("slow download was not aborted")
+        except DownloadError as e:
+            assert "longer than" in str(e)
+        assert time.monotonic() - start < 1.5
+        assert downloader.stats()["deadline_exceeded"] == 1
+    finally:
+        server.shutdown()
+
+
+def test_server_errors_are_retried_with_backoff():
+    server, base = start_server()
+    try:
+        StandInHandler.flaky_hits = 0
+        downloader = ResumeDownloader(retries=2, backoff=0.05)
+        start = time.monotonic()
+        assert downloader.download(base + "/flaky.pdf") == PDF_BYTES
+        assert time.monotonic() - start >= 0.05 + 0.1
+        stats = downloader.stats()
+        assert stats["attempts"] == 3 and stats["retries"] == 2 and stats["failed"] == 0
+
+        try:
+            downloader.download(base + "/missing.pdf")
+            raise AssertionError("404 did not raise")
+        except DownloadError as e:
+            assert "404" in str(e)
+        assert downloader.stats()["retries"] == 2
+    finally:
+        server.shutdown()
+
+
+def test_async_client_of_an_old_loop_is_closed():
+    pytest.importorskip("httpx")
+    downloader = AsyncResumeDownloader()
+
+    async def client():
+        return downloader._get_client()
+
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        old = asyncio.run_coroutine_threadsafe(client(), other).result()
+        new = asyncio.run(client())
+        deadline = time.monotonic() + 2
+        while not old.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert new is not old and old.is_closed and not new.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+
+    async def shutdown():
+        downloader._get_client()
+        await downloader.aclose()
+    asyncio.run(shutdown())
+    assert downloader._client is None
+    assert "async" in downloader_stats()
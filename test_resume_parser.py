@@ -0,0 +1,177 @@
+"""
+Resume Parser Tests
+Fuzz and timing checks for the section segmenter behind extract_projects:
+- Randomized inputs must give the same projects as the old regex
+- Pathological inputs must stay linear-time
+- The batch CLI reports an unreadable JSONL line in its place and parses
+  the rest
+- parse_resume builds one ResumeDocument and segments it once; every
+  extractor gives the same answer fed the document or the raw string,
+  and the same as lowering the raw text itself
+"""
+
+import sys
+import os
+import io
+import json
+import re
+import random
+import tempfile
+import time
+from contextlib import redirect_stderr
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services import resume_parser
+from services.resume_parser import (
+    ResumeDocument, extract_education, extract_projects, extract_skills, has_internship, parse_resume,
+)
+from services.section_segmenter import segment_sections
+
+
+def legacy_extract_projects(text: str) -> list:
+    """The old backtracking-regex implementation, used as the reference"""
+    projects = []
+    project_section = re.search(
+        r'(projects?|personal projects?|academic projects?)(.*?)(experience|education|skills|certifications|$)',
+        text, re.IGNORECASE | re.DOTALL
+    )
+    if project_section:
+        lines = [l.strip() for l in project_section.group(2).split('\n') if l.strip()]
+        for line in lines[:5]:
+            if 5 < len(line) < 100:
+                projects.append(line)
+    return projects
+
+
+FUZZ_WORDS = [
+    "Projects", "PROJECT", "project:", "Personal Projects", "Academic Project",
+    "Experience", "EDUCATION", "skills:", "Certifications", "projectskills",
+    "certificationskills", "\n", "\n\n", "\r\n", "- built a chat app with react",
+    "Movie recommendation system", "x", "  ", "s", "proj", "educat",
+]
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def test_projects_match_legacy_regex_on_fuzzed_input():
+    rng = random.Random(1234)
+    for _ in range(3000):
+        text = " ".join(rng.choice(FUZZ_WORDS) for _ in range(rng.randint(0, 40)))
+        assert extract_projects(text) == legacy_extract_projects(text), repr(text)
+
+
+def test_sections_are_ordered_and_in_bounds():
+    rng = random.Random(99)
+    for _ in range(1000):
+        lower = " ".join(rng.choice(FUZZ_WORDS) for _ in range(rng.randint(0, 40))).lower()
+        sections = segment_sections(lower)
+        previous_start = -1
+        for section in sections:
+            assert section.heading_start > previous_start
+            assert section.heading_start < section.body_start <= section.body_end <= len(lower)
+            previous_start = section.heading_start
+
+
+PATHOLOGICAL = {
+    "no terminator": lambda n: "Projects\n" + ("a" * 79 + "\n") * (n // 80),
+    "heading flood": lambda n: "projects" * (n // 8),
+    "overlapping headings": lambda n: "projectskills" * (n // 13),
+    "near-miss headings": lambda n: "projec educatio experienc skill certification " * (n // 47),
+    "single line": lambda n: "project " + "x" * n,
+}
+
+
+def test_pathological_inputs_run_in_linear_time():
+    for name, make in PATHOLOGICAL.items():
+        small, large = make(200_000), make(800_000)
+        parse_resume(small)  # warm up
+        # Best of 5: a GC pause or a busy machine mustn't decide the ratio
+        t_small = min(timed(extract_projects, small) for _ in range(5))
+        t_large = min(timed(extract_projects, large) for _ in range(5))
+        # 4x the input may cost ~4x the time, never quadratic (16x)
+        assert t_large < 1.0, f"{name}: {t_large:.3f}s for 800 KB"
+        assert t_large < max(t_small, 0.002) * 8, f"{name}: {t_small:.4f}s -> {t_large:.4f}s"
+
+
+def test_batch_cli_reports_bad_lines_and_carries_on():
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, "in.jsonl"), os.path.join(tmp, "out.jsonl")
+        with open(source, "wb") as f:
+            f.write(json.dumps({"id": "a", "resume_text": "Skills: Python, SQL"}).encode() + b"\n")
+            f.write(b'{"id": "b", "resume_text": \n')
+            f.write(b"\xff\xfe not utf-8\n\n")
+            f.write(b"[1, 2]\n")
+            f.write(json.dumps({"resume_text": "React developer"}).encode() + b"\n")
+        with redirect_stderr(io.StringIO()) as stderr:
+            resume_parser.main([source, "-o", output, "-w", "1"])
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+    assert [record["id"] for record in records] == ["a", 2, 3, 5, 6]
+    assert [("error" in record) for record in records] == [False, True, True, True, False]
+    assert records[1]["error"].startswith("ValueError: Line 2")
+    assert "python" in records[0]["skills"] and "react" in records[4]["skills"]
+    assert "Parsed: 2 | Failed: 3" in stderr.getvalue()
+
+
+DOC_WORDS = FUZZ_WORDS + [
+    "Python", "SQL", "Tailwind CSS", "C++", "React Native", "B.Tech", "Computer Science",
+    "CGPA 8.45", "Summer Internship", "Trainee", "MCA", "Mechanical", "İstanbul", "KUBERNETES",
+]
+
+
+def test_document_keeps_offsets_and_original_case():
+    doc = ResumeDocument("İstanbul SKILLS\nProjects\nMovie Recommender\nEducation\nB.Tech")
+    assert len(doc.lower) == len(doc.text)
+    assert doc.lower.startswith("İstanbul skills\nprojects")
+    assert doc.section_text("projects") == "\nMovie Recommender\n"
+    assert doc.section_text("certifications") is None
+    assert doc.sections is doc.sections
+    assert resume_parser._as_document(doc) is doc
+    assert resume_parser._as_document("Python").lower == "python"
+
+
+def test_single_pass_document_matches_per_extractor_parsing(monkeypatch):
+    documents, segmentations = [], []
+
+    class CountingDocument(ResumeDocument):
+        __slots__ = ()
+
+        def __init__(self, text):
+            super().__init__(text)
+            documents.append(self)
+
+    def counting_segment(lower):
+        segmentations.append(lower)
+        return segment_sections(lower)
+
+    monkeypatch.setattr(resume_parser, "ResumeDocument", CountingDocument)
+    monkeypatch.setattr(resume_parser, "segment_sections", counting_segment)
+
+    rng = random.Random(5)
+    for _ in range(300):
+        text = " ".join(rng.choice(DOC_WORDS) for _ in range(rng.randint(0, 40)))
+        del documents[:], segmentations[:]
+        parsed = parse_resume(text)
+        assert len(documents) == 1 and len(segmentations) == 1
+
+        lower = text.lower() if len(text.lower()) == len(text) else None
+        doc = resume_parser.ResumeDocument(text)
+        for extract in (extract_skills, extract_education, has_internship, extract_projects):
+            by_doc, by_text = extract(doc), extract(text)
+            if extract is extract_skills:
+                by_doc, by_text = sorted(by_doc), sorted(by_text)
+            assert by_doc == by_text, (extract.__name__, text)
+            if lower is not None and extract is not extract_projects:
+                by_lower = extract(lower)
+                assert (sorted(by_lower) if extract is extract_skills else by_lower) == by_doc
+
+        assert sorted(parsed["skills"]) == sorted(extract_skills(text))
+        assert parsed["projects"] == legacy_extract_projects(text)
+        education = extract_education(text)
+        assert (parsed["education_degree"], parsed["education_branch"], parsed["cgpa"]) == \
+            (education["degree"], education["branch"], education["cgpa"])
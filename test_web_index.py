@@ -0,0 +1,56 @@
+"""
+Showcase Page Tests
+GET / through the Flask test client:
+- Every encoding decompresses to the same page, each with its own ETag
+- A matching If-None-Match gets an empty 304
+- The template is not read from disk per request
+"""
+
+import sys
+import os
+import builtins
+import gzip
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+
+client = app.test_client()
+
+
+def test_encodings_serve_the_same_page():
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert plain.status_code == zipped.status_code == 200
+    assert "Content-Encoding" not in plain.headers and zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.data) == plain.data and b"<html" in plain.data.lower()
+    assert plain.headers["ETag"] != zipped.headers["ETag"]
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert "max-age" in zipped.headers["Cache-Control"]
+
+    # Refusing gzip falls back to identity
+    refused = client.get("/", headers={"Accept-Encoding": "gzip;q=0"})
+    assert refused.data == plain.data
+
+
+def test_revalidation_returns_304():
+    etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    fresh = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert fresh.status_code == 304 and fresh.data == b"" and fresh.headers["ETag"] == etag
+
+    # The gzip ETag does not validate the identity variant
+    stale = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert stale.status_code == 200
+
+
+def test_template_is_not_read_per_request():
+    original = builtins.open
+
+    def no_template(path, *args, **kwargs):
+        assert not str(path).endswith("index.html"), "template read during a request"
+        return original(path, *args, **kwargs)
+
+    builtins.open = no_template
+    try:
+        assert client.get("/").status_code == 200
+    finally:
+        builtins.open = original
@@ -0,0 +1,119 @@
+"""
+Worker Memory Test
+Starts gunicorn (gunicorn.conf.py) with and without preloading, warms
+every worker, then reads each worker's /proc/<pid>/smaps_rollup:
+- Shared pages: inherited from the master or mapped from the scorer
+  artifact, paid for once per host
+- Private pages: what each additional worker really costs
+
+Needs gunicorn, Linux /proc and a trained model. Takes ~30 s, so it is
+marked slow and left out of the default run: python -m pytest -m slow
+"""
+
+import sys
+import os
+import importlib.util
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+import urllib.error
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKERS = 4
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get_status(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def smaps_mb(pid: int) -> dict:
+    """Rss / Pss and the shared / private split of one process, in MB"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[key] = int(value.split()[0]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def worker_memory(preload: bool) -> list:
+    """Run gunicorn until every worker reports ready; smaps of each worker"""
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(WORKERS),
+        GUNICORN_THREADS="1",
+        GUNICORN_PRELOAD="1" if preload else "0",
+        MODEL_WATCH_INTERVAL="0",
+    )
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:app"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/health/ready"
+        deadline = time.monotonic() + 120
+        consecutive = 0
+        # Without preload every worker warms on its own first request
+        while consecutive < 10 * WORKERS:
+            assert time.monotonic() < deadline, "workers never became ready"
+            consecutive = consecutive + 1 if get_status(url) == 200 else 0
+            if not consecutive:
+                time.sleep(0.2)
+
+        # The master may still be forking the last workers
+        while True:
+            with open(f"/proc/{master.pid}/task/{master.pid}/children") as f:
+                pids = [int(pid) for pid in f.read().split()]
+            if len(pids) == WORKERS:
+                return [smaps_mb(pid) for pid in pids]
+            assert time.monotonic() < deadline, f"expected {WORKERS} workers, found {len(pids)}"
+            time.sleep(0.2)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def summarize(label: str, workers: list) -> dict:
+    mean = {key: sum(w[key] for w in workers) / len(workers) for key in workers[0]}
+    print(f"  {label:<12s} | rss {mean['rss']:6.1f} | pss {mean['pss']:6.1f} | "
+          f"shared {mean['shared']:6.1f} | private {mean['private']:6.1f}  (MB per worker)")
+    return mean
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(importlib.util.find_spec("gunicorn") is None, reason="gunicorn not installed")
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="needs Linux /proc/<pid>/smaps_rollup")
+@pytest.mark.skipif(not os.path.exists(os.path.join(BASE_DIR, "ml/career_classifier.pkl")),
+                    reason="ml/career_classifier.pkl not found")
+def test_preloaded_workers_share_the_model():
+    separate = summarize("no preload", worker_memory(preload=False))
+    shared = summarize("preload", worker_memory(preload=True))
+
+    # Most of a preloaded worker is inherited; its own cost must shrink a lot
+    assert shared["shared"] > shared["private"]
+    assert shared["private"] < separate["private"] / 2